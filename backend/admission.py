@@ -0,0 +1,139 @@
+"""
+Admission control for the contact submission path
+Token buckets per client IP and globally, plus a cap on submissions in flight.
+Requests over a limit are rejected straight away with a Retry-After hint
+instead of queueing behind the event loop and the database pool.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional
+
+
+class Rejection(NamedTuple):
+    status: int
+    reason: str  # metrics label
+    detail: str
+    retry_after: int  # seconds
+
+
+class TokenBucket:
+    """``rate`` tokens per second, holding at most ``burst``"""
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, now: float) -> bool:
+        self.refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil((1 - self.tokens) / self.rate))
+
+    def full_at(self) -> float:
+        return self.updated + (self.burst - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """Decides whether a submission may proceed; every admitted request must be released"""
+
+    def __init__(
+        self,
+        ip_rate: float,
+        ip_burst: float,
+        global_rate: float,
+        global_burst: float,
+        max_in_flight: int,
+        max_clients: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+        shed=None,
+    ):
+        self.ip_rate = ip_rate
+        self.ip_burst = ip_burst
+        self.max_in_flight = max_in_flight
+        self.max_clients = max_clients
+        self._clock = clock
+        self._global = TokenBucket(global_rate, global_burst, clock())
+        # Least recently seen first; a client whose bucket has refilled is the same as a new one
+        self._clients: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {}
+        self.shed = shed  # optional metrics Counter labelled by reason
+
+    def _client_bucket(self, client: str, now: float) -> TokenBucket:
+        self._expire(now)
+        bucket = self._clients.get(client)
+        if bucket is None:
+            if len(self._clients) >= self.max_clients:
+                self._clients.popitem(last=False)
+            bucket = self._clients[client] = TokenBucket(self.ip_rate, self.ip_burst, now)
+        else:
+            self._clients.move_to_end(client)
+        return bucket
+
+    def _expire(self, now: float) -> None:
+        while self._clients:
+            oldest = next(iter(self._clients.values()))
+            if len(self._clients) <= self.max_clients and oldest.full_at() > now:
+                break
+            self._clients.popitem(last=False)
+
+    def _reject(self, status: int, reason: str, detail: str, retry_after: int) -> Rejection:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        if self.shed is not None:
+            self.shed.inc(reason)
+        return Rejection(status, reason, detail, retry_after)
+
+    def acquire(self, client: str) -> Optional[Rejection]:
+        """Admit the request (returns None) or say why not"""
+        if self.in_flight >= self.max_in_flight:
+            return self._reject(503, "concurrency", "Too many submissions in progress, please retry shortly", 1)
+        now = self._clock()
+        bucket = self._client_bucket(client, now)
+        if not bucket.take(now):
+            return self._reject(429, "client_rate", "Too many submissions, please try again later", bucket.retry_after())
+        if not self._global.take(now):
+            # Give the client its token back; the rejection was not its fault
+            bucket.tokens += 1
+            return self._reject(503, "global_rate", "Submissions are temporarily throttled", self._global.retry_after())
+        self.in_flight += 1
+        self.admitted += 1
+        return None
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "inFlight": self.in_flight,
+            "maxInFlight": self.max_in_flight,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "trackedClients": len(self._clients),
+        }
+
+
+def admission_from_env(environ: Mapping[str, str], shed=None) -> AdmissionController:
+    """CONTACT_IP_RATE / CONTACT_IP_BURST, CONTACT_GLOBAL_RATE / CONTACT_GLOBAL_BURST (tokens per second
+    and bucket size), CONTACT_MAX_IN_FLIGHT and CONTACT_ADMISSION_MAX_CLIENTS"""
+    return AdmissionController(
+        ip_rate=float(environ.get('CONTACT_IP_RATE', 0.1)),
+        ip_burst=float(environ.get('CONTACT_IP_BURST', 5)),
+        global_rate=float(environ.get('CONTACT_GLOBAL_RATE', 50)),
+        global_burst=float(environ.get('CONTACT_GLOBAL_BURST', 100)),
+        max_in_flight=int(environ.get('CONTACT_MAX_IN_FLIGHT', 64)),
+        max_clients=int(environ.get('CONTACT_ADMISSION_MAX_CLIENTS', 10000)),
+        shed=shed,
+    )
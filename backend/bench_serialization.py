@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for the read endpoints
+Compares per-request CPU of the validated response_model path against the
+trusted-read path (model_construct + pre-rendered JSON bytes) for
+/api/experience and /api/contacts. No database is needed.
+
+Usage: python bench_serialization.py [--iterations 2000] [--contacts 100]
+"""
+
+import argparse
+import asyncio
+import copy
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'portfolio_bench')
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+
+import server  # noqa: E402
+from seed_data import PORTFOLIO_DATA  # noqa: E402
+
+
+def experience_documents():
+    now = datetime.utcnow()
+    return [{**copy.deepcopy(exp), "_id": uuid.uuid4().hex, "createdAt": now} for exp in PORTFOLIO_DATA["experiences"]]
+
+def contact_documents(count):
+    now = datetime.utcnow()
+    return [
+        {
+            "_id": uuid.uuid4().hex,
+            "name": f"Visitor {i}",
+            "email": f"visitor{i}@example.com",
+            "company": "Example Corp" if i % 2 else None,
+            "subject": "Project enquiry",
+            "message": "Hello, I would like to discuss an enterprise CRM engagement. " * 4,
+            "status": "new",
+            "createdAt": now - timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+def response_field(path):
+    for route in server.app.routes:
+        if getattr(route, "path", None) == path:
+            return route.response_field
+    raise LookupError(path)
+
+async def validated_request(model, documents, field):
+    """Previous path: Model(**doc) in the endpoint, then response_model validation + JSONResponse"""
+    result = [model(**server.normalize_id(dict(doc))) for doc in documents]
+    content = await serialize_response(field=field, response_content=result)
+    return JSONResponse(content).body
+
+async def trusted_request(model, documents, field):
+    """Trusted-read path: model_construct + one pydantic-core JSON render"""
+    result = [server.build_model(model, dict(doc)) for doc in documents]
+    return server.render_json(result)
+
+async def measure(handler, model, documents, field, iterations):
+    await handler(model, documents, field)
+    start = time.process_time()
+    for _ in range(iterations):
+        await handler(model, documents, field)
+    return (time.process_time() - start) / iterations * 1e6
+
+async def main(iterations, contacts):
+    server.TRUSTED_READS = True
+    cases = [
+        ("/api/experience", server.Experience, experience_documents()),
+        ("/api/contacts", server.ContactEntry, contact_documents(contacts)),
+    ]
+    print(f"{'endpoint':<18}{'docs':>6}{'validated µs':>15}{'trusted µs':>13}{'speedup':>10}")
+    for path, model, documents in cases:
+        field = response_field(path)
+        before = await measure(validated_request, model, documents, field, iterations)
+        after = await measure(trusted_request, model, documents, field, iterations)
+        print(f"{path:<18}{len(documents):>6}{before:>15.1f}{after:>13.1f}{before / after:>9.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--contacts", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.contacts))
@@ -0,0 +1,128 @@
+"""
+In-process read-through cache for portfolio content
+Content only changes when seed_data.py runs, so reads are served from memory
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class ContentCache:
+    """Bounded LRU cache with per-namespace TTLs and hit/miss counters.
+
+    Keys are tuples whose first element is the namespace (normally the
+    collection name), e.g. ``("experiences",)``. Invalidating a namespace
+    drops every key under it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        default_ttl: float = 300.0,
+        ttls: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttls: Dict[str, float] = dict(ttls or {})
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[float, Any]]" = OrderedDict()
+        self._locks: Dict[Tuple[Hashable, ...], asyncio.Lock] = {}
+        # Loads holding or waiting on each key's lock; the lock goes when this drops to zero
+        self._loading: Dict[Tuple[Hashable, ...], int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def ttl_for(self, namespace: str) -> float:
+        return self.ttls.get(namespace, self.default_ttl)
+
+    def get(self, key: Tuple[Hashable, ...]) -> Tuple[bool, Any]:
+        """Return ``(found, value)`` and refresh the key's LRU position"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        expires_at = self._clock() + self.ttl_for(key[0])
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(self, key: Tuple[Hashable, ...], loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for ``key`` or await ``loader`` to fill it.
+
+        Concurrent misses on the same key share a single load so a cold
+        cache never stampedes the database.
+        """
+        found, value = self.get(key)
+        if found:
+            self.hits += 1
+            return value
+
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        self._loading[key] = self._loading.get(key, 0) + 1
+        try:
+            async with lock:
+                found, value = self.get(key)
+                if found:
+                    self.hits += 1
+                    return value
+                self.misses += 1
+                value = await loader()
+                self.set(key, value)
+                return value
+        finally:
+            # Runs on errors and cancellation too, so no lock outlives its last load
+            self._loading[key] -= 1
+            if not self._loading[key]:
+                del self._loading[key], self._locks[key]
+
+    def invalidate(self, namespace: Optional[str] = None) -> int:
+        """Drop every entry in ``namespace`` (or all entries)"""
+        if namespace is None:
+            removed = len(self._entries)
+            self._entries.clear()
+        else:
+            stale = [key for key in self._entries if key[0] == namespace]
+            for key in stale:
+                del self._entries[key]
+            removed = len(stale)
+        self.invalidations += 1
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "ttls": {**self.ttls, "default": self.default_ttl},
+        }
+
+
+def ttls_from_env(environ: Dict[str, str], namespaces: List[str]) -> Dict[str, float]:
+    """Read ``CACHE_TTL_<NAMESPACE>`` overrides, e.g. ``CACHE_TTL_PROFILES=600``"""
+    ttls = {}
+    for namespace in namespaces:
+        value = environ.get(f"CACHE_TTL_{namespace.upper()}")
+        if value:
+            ttls[namespace] = float(value)
+    return ttls
@@ -0,0 +1,141 @@
+"""
+Contact analytics for the admin dashboard
+Per-day counts and sender-domain counts for whole UTC days never change once
+the day is over, so they are aggregated once and kept; a refresh only asks the
+backend for the current day (plus any days that closed since the last
+refresh). Weekly and monthly series are rolled up from the days in Python.
+Status counts and backlog ages can change for any row, so they are re-read on
+every refresh, but each is a count on the status/createdAt index.
+"""
+
+import asyncio
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from contact_status import STATUSES
+from pagination import ContactQuery
+
+# Open submissions (status "new") by age: label -> (minimum age, maximum age)
+BACKLOG_AGES = {
+    "<1d": (timedelta(0), timedelta(days=1)),
+    "1-7d": (timedelta(days=1), timedelta(days=7)),
+    "7-30d": (timedelta(days=7), timedelta(days=30)),
+    ">30d": (timedelta(days=30), None),
+}
+
+
+def start_of_day(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def week_of(day: str) -> str:
+    year, week, _ = date.fromisoformat(day).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def series(counts: Dict[str, int], limit: int) -> List[Dict[str, Any]]:
+    """The latest ``limit`` periods, oldest first; periods without submissions are omitted"""
+    return [{"period": period, "count": counts[period]} for period in sorted(counts)[-limit:]]
+
+
+class ContactStats:
+    """Incrementally maintained contact analytics, recomputed at most every ``ttl`` seconds"""
+
+    def __init__(self, ttl: float = 15, full_refresh: float = 6 * 3600, top_domains: int = 10,
+                 clock: Callable[[], datetime] = datetime.utcnow):
+        self.ttl = ttl
+        self.full_refresh = full_refresh  # also re-aggregate closed days (catches back-dated writes)
+        self.top_domains = top_domains
+        self._clock = clock
+        self._lock = asyncio.Lock()
+        self._watermark: Optional[datetime] = None  # days before this are closed
+        self._closed_days: Dict[str, int] = {}
+        self._closed_domains: Counter = Counter()
+        self._rebuilt_at = 0.0
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._computed_at = 0.0
+        self.refreshes = 0
+
+    async def get(self, repository, force: bool = False) -> Dict[str, Any]:
+        if not force and self._snapshot is not None and time.monotonic() - self._computed_at < self.ttl:
+            return self._snapshot
+        async with self._lock:
+            # Another request may have refreshed while this one waited
+            if force or self._snapshot is None or time.monotonic() - self._computed_at >= self.ttl:
+                self._snapshot = await self._refresh(repository, rebuild=force)
+                self._computed_at = time.monotonic()
+            return self._snapshot
+
+    async def _close_days(self, repository, today: datetime, rebuild: bool) -> None:
+        if rebuild or self._watermark is None or time.monotonic() - self._rebuilt_at >= self.full_refresh:
+            closed = await repository.summarize(None, today)
+            self._closed_days = dict(closed["days"])
+            self._closed_domains = Counter(closed["domains"])
+            self._rebuilt_at = time.monotonic()
+        elif self._watermark < today:
+            closed = await repository.summarize(self._watermark, today)
+            for day, count in closed["days"].items():
+                self._closed_days[day] = self._closed_days.get(day, 0) + count
+            self._closed_domains.update(closed["domains"])
+        self._watermark = today
+
+    async def _refresh(self, repository, rebuild: bool = False) -> Dict[str, Any]:
+        started = time.perf_counter()
+        now = self._clock()
+        today = start_of_day(now)
+        await self._close_days(repository, today, rebuild)
+
+        open_new = ContactQuery(status="new")
+        age_queries = [
+            ContactQuery(status="new", created_after=now - oldest if oldest else None, created_before=now - youngest)
+            for youngest, oldest in BACKLOG_AGES.values()
+        ]
+        current, statuses, oldest_open, ages = await asyncio.gather(
+            repository.summarize(today, None),
+            asyncio.gather(*(repository.count(ContactQuery(status=status)) for status in STATUSES)),
+            repository.oldest(open_new),
+            asyncio.gather(*(repository.count(query) for query in age_queries)),
+        )
+
+        days = dict(self._closed_days)
+        for day, count in current["days"].items():
+            days[day] = days.get(day, 0) + count
+        # Every contact falls on exactly one day, so no unfiltered count (a collection scan) is needed
+        total = sum(days.values())
+        weeks: Dict[str, int] = {}
+        months: Dict[str, int] = {}
+        for day, count in days.items():
+            weeks[week_of(day)] = weeks.get(week_of(day), 0) + count
+            months[day[:7]] = months.get(day[:7], 0) + count
+        domains = self._closed_domains + Counter(current["domains"])
+
+        by_status = dict(zip(STATUSES, statuses))
+        other = total - sum(statuses)
+        if other:
+            by_status["other"] = other
+        self.refreshes += 1
+        return {
+            "total": total,
+            "byStatus": by_status,
+            "days": days,
+            "weeks": weeks,
+            "months": months,
+            "topDomains": [{"domain": domain, "count": count} for domain, count in domains.most_common(self.top_domains)],
+            "backlog": {
+                "open": by_status["new"],
+                "oldestCreatedAt": oldest_open,
+                "oldestAgeSeconds": round((now - oldest_open).total_seconds()) if oldest_open else None,
+                "ages": dict(zip(BACKLOG_AGES, ages)),
+            },
+            "computedAt": now,
+            "computeMs": round((time.perf_counter() - started) * 1000, 3),
+        }
+
+    def invalidate(self) -> None:
+        """Recompute on the next request (closed days are kept; status changes do not move them)"""
+        self._computed_at = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"refreshes": self.refreshes, "closedDays": len(self._closed_days), "watermark": self._watermark}
@@ -0,0 +1,47 @@
+"""
+Contact status workflow: new -> read -> replied
+Statuses only move forward (a message can be marked replied straight from new).
+plan_transition() turns the statuses read for a batch of ids into per-id
+outcomes and the set of ids the single bulk write should touch.
+"""
+
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+STATUSES = ("new", "read", "replied")
+# Target status -> statuses it may be reached from
+TRANSITIONS: Dict[str, Tuple[str, ...]] = {
+    "new": (),
+    "read": ("new",),
+    "replied": ("new", "read"),
+}
+
+UPDATED = "updated"
+UNCHANGED = "unchanged"  # already in the target status
+INVALID = "invalid_transition"
+NOT_FOUND = "not_found"
+CONFLICT = "conflict"  # changed by someone else between the read and the write
+
+
+class TransitionPlan(NamedTuple):
+    to_update: List[str]
+    outcomes: Dict[str, Dict[str, str]]  # id -> {"outcome", "previousStatus"}
+
+
+def plan_transition(ids: Sequence[str], current: Dict[str, str], target: str) -> TransitionPlan:
+    """``current`` maps the ids that exist to their status"""
+    to_update = []
+    outcomes: Dict[str, Dict[str, str]] = {}
+    for contact_id in dict.fromkeys(ids):
+        status = current.get(contact_id)
+        if status is None:
+            outcomes[contact_id] = {"outcome": NOT_FOUND}
+            continue
+        if status == target:
+            outcome = UNCHANGED
+        elif status in TRANSITIONS[target]:
+            outcome = UPDATED
+            to_update.append(contact_id)
+        else:
+            outcome = INVALID
+        outcomes[contact_id] = {"outcome": outcome, "previousStatus": status}
+    return TransitionPlan(to_update, outcomes)
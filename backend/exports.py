@@ -0,0 +1,241 @@
+"""
+Background bulk exports of contacts to compressed Parquet or CSV
+A job pulls contacts in large batches from ContactRepository.stream(), turns
+every ``chunk_rows`` rows into a pandas frame and appends it to the output
+file (a Parquet row group, or a block of gzipped CSV), so only one chunk is
+ever in memory. Files are written as ``<id>.<ext>.part`` and renamed when
+complete. Progress and throughput are kept on the job for the status endpoint.
+"""
+
+import asyncio
+import gzip
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+try:
+    import pandas as pd
+except ImportError:  # pandas is optional; exports are unavailable without it
+    pd = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; CSV exports still work
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = {"parquet": "parquet", "csv": "csv.gz"}
+DATETIME_COLUMNS = {"createdAt", "statusUpdatedAt"}
+
+
+class ExportUnavailable(Exception):
+    """The format's libraries are not installed"""
+
+
+class ExportQueueFull(Exception):
+    """Too many jobs are already waiting for a slot"""
+
+
+def available_formats() -> List[str]:
+    if pd is None:
+        return []
+    return [name for name in EXTENSIONS if name != "parquet" or pq is not None]
+
+
+def contact_frame(documents: List[Dict[str, Any]], columns: Sequence[str]) -> "pd.DataFrame":
+    """Columnar frame for a chunk; columns are fixed so every chunk has the same schema"""
+    data = {name: [document.get(name) for document in documents] for name in columns}
+    frame = pd.DataFrame(data, columns=list(columns))
+    for name in DATETIME_COLUMNS.intersection(columns):
+        frame[name] = pd.to_datetime(frame[name]).astype("datetime64[ms]")
+    return frame
+
+
+class ChunkWriter:
+    """Appends frames to one output file"""
+
+    def __init__(self, path: Path, file_format: str, columns: Sequence[str]):
+        self.path = path
+        self.format = file_format
+        self.columns = list(columns)
+        if file_format == "parquet":
+            schema = pa.schema([
+                (name, pa.timestamp("ms") if name in DATETIME_COLUMNS else pa.string()) for name in self.columns
+            ])
+            self._writer = pq.ParquetWriter(path, schema, compression="zstd")
+            self._schema = schema
+        else:
+            self._handle = gzip.open(path, "wt", newline="", compresslevel=6)
+            self._header = True
+
+    def write(self, documents: List[Dict[str, Any]]) -> None:
+        frame = contact_frame(documents, self.columns)
+        if self.format == "parquet":
+            self._writer.write_table(pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False))
+        else:
+            frame.to_csv(self._handle, header=self._header, index=False, date_format="%Y-%m-%dT%H:%M:%S.%f")
+            self._header = False
+
+    def close(self) -> None:
+        if self.format == "parquet":
+            self._writer.close()
+        else:
+            self._handle.close()
+
+
+class ExportJob:
+    def __init__(self, job_id: str, file_format: str, columns: Sequence[str], filters: Dict[str, Any], path: Path):
+        self.id = job_id
+        self.format = file_format
+        self.columns = list(columns)
+        self.filters = filters
+        self.path = path
+        self.status = "queued"
+        self.rows = 0
+        self.chunks = 0
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def part_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".part")
+
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = self.elapsed()
+        written = self.path if self.status == "completed" else self.part_path
+        return {
+            "id": self.id,
+            "format": self.format,
+            "status": self.status,
+            "filters": self.filters,
+            "columns": self.columns,
+            "rows": self.rows,
+            "chunks": self.chunks,
+            "bytes": written.stat().st_size if written.exists() else 0,
+            "elapsedSeconds": round(elapsed, 3),
+            "rowsPerSecond": round(self.rows / elapsed) if elapsed else 0,
+            "createdAt": self.created_at.isoformat(),
+            "file": self.path.name if self.status == "completed" else None,
+            "error": self.error,
+        }
+
+
+class ExportManager:
+    """Runs export jobs in the background, at most ``max_running`` at a time, and remembers the last ``max_jobs``.
+
+    At most ``max_queued`` jobs wait for a slot; further starts raise ExportQueueFull.
+    """
+
+    def __init__(self, directory: Path, batch_size: int = 5000, chunk_rows: int = 50000,
+                 max_running: int = 1, max_jobs: int = 50, max_queued: int = 5):
+        self.directory = Path(directory)
+        self.batch_size = batch_size
+        self.chunk_rows = chunk_rows
+        self.max_jobs = max_jobs
+        self.max_queued = max_queued
+        self._slots = asyncio.Semaphore(max_running)
+        self._jobs: "OrderedDict[str, ExportJob]" = OrderedDict()
+
+    def start(
+        self,
+        source: Callable[[int], AsyncIterator[List[Dict[str, Any]]]],
+        file_format: str,
+        columns: Sequence[str],
+        filters: Dict[str, Any],
+    ) -> ExportJob:
+        """Queue an export of the batches ``source(batch_size)`` yields"""
+        if file_format not in available_formats():
+            raise ExportUnavailable(f"{file_format} exports need pandas{' and pyarrow' if file_format == 'parquet' else ''}")
+        if sum(1 for job in self._jobs.values() if job.status == "queued") >= self.max_queued:
+            raise ExportQueueFull(f"The export queue is full ({self.max_queued} waiting); try again later")
+        job_id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        path = self.directory / f"contacts-{job_id}.{EXTENSIONS[file_format]}"
+        job = ExportJob(job_id, file_format, columns, filters, path)
+        self._jobs[job_id] = job
+        self._prune()
+        job.task = asyncio.create_task(self._run(job, source))
+        job.task.add_done_callback(lambda task: self._cancelled(job, task))
+        return job
+
+    @staticmethod
+    def _cancelled(job: ExportJob, task: asyncio.Task) -> None:
+        # Also covers a job cancelled before its task first ran, which never enters _run
+        if task.cancelled():
+            job.status = "cancelled"
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.status not in ("queued", "running")]
+        for job_id in finished[:max(0, len(self._jobs) - self.max_jobs)]:
+            job = self._jobs.pop(job_id)
+            # A forgotten job's file could no longer be downloaded or cleaned up
+            job.path.unlink(missing_ok=True)
+
+    async def _run(self, job: ExportJob, source: Callable[[int], AsyncIterator[List[Dict[str, Any]]]]) -> None:
+        async with self._slots:
+            await self._export(job, source)
+        if job.status == "completed":
+            logger.info(f"Export {job.id}: {job.rows} rows to {job.path.name} in {job.elapsed():.2f}s")
+
+    async def _export(self, job: ExportJob, source: Callable[[int], AsyncIterator[List[Dict[str, Any]]]]) -> None:
+        job.status = "running"
+        job.started = time.perf_counter()
+        writer = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            writer = await asyncio.to_thread(ChunkWriter, job.part_path, job.format, job.columns)
+            chunk: List[Dict[str, Any]] = []
+            async for batch in source(self.batch_size):
+                chunk.extend(batch)
+                if len(chunk) >= self.chunk_rows:
+                    await self._write(job, writer, chunk)
+                    chunk = []
+            if chunk:
+                await self._write(job, writer, chunk)
+            await asyncio.to_thread(writer.close)
+            writer = None
+            job.part_path.replace(job.path)
+            job.status = "completed"
+        except Exception as e:
+            logger.error(f"Export {job.id} failed after {job.rows} rows: {e}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished = time.perf_counter()
+            if writer is not None:
+                writer.close()
+            # Cancellation can land while the writer is being created, before it is assigned
+            if job.status != "completed":
+                job.part_path.unlink(missing_ok=True)
+
+    async def _write(self, job: ExportJob, writer: ChunkWriter, chunk: List[Dict[str, Any]]) -> None:
+        # Frame building, encoding and compression all run off the event loop
+        await asyncio.to_thread(writer.write, chunk)
+        job.rows += len(chunk)
+        job.chunks += 1
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        return [job.to_dict() for job in reversed(self._jobs.values())]
+
+    async def stop(self) -> None:
+        """Cancel unfinished jobs (their partial files are removed)"""
+        tasks = [job.task for job in self._jobs.values() if job.task is not None and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
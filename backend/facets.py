@@ -0,0 +1,140 @@
+"""
+Technology facets over skills and experiences
+Maps every technology named in ``Skills.technical`` or an ``Experience.technologies``
+list to the experiences that used it, with counts and years of use. Built once
+per content version (server.py keys it by the section ETags) and pre-rendered,
+so a lookup is a dict access and never aggregates per request.
+"""
+
+import re
+from datetime import date
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from http_cache import ContentVersion
+
+# "May 2019 - Present", "Jan 2018 - May 2019", "2015 - 2018"
+PERIOD = re.compile(
+    r"^\s*(?:([a-z]{3})[a-z]*\.?\s+)?(\d{4})\s*[-–—]+\s*(?:(?:([a-z]{3})[a-z]*\.?\s+)?(\d{4})|present|current|now)\s*$",
+    re.IGNORECASE,
+)
+MONTHS = {name: number for number, name in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"))}
+
+
+def technology_key(name: str) -> str:
+    """Lookup key: case and whitespace insensitive"""
+    return " ".join(name.split()).casefold()
+
+
+def month_index(year: str, month: Optional[str]) -> int:
+    return int(year) * 12 + MONTHS.get((month or "jan").lower(), 0)
+
+
+def period_months(period: str, today: date) -> Optional[Tuple[int, int]]:
+    """[start, end) in months since year 0, or None when the period cannot be read"""
+    match = PERIOD.match(period or "")
+    if match is None:
+        return None
+    start_month, start_year, end_month, end_year = match.groups()
+    start = month_index(start_year, start_month)
+    end = month_index(end_year, end_month) if end_year else today.year * 12 + today.month - 1
+    return (start, end) if end >= start else None
+
+
+def merged_months(spans: List[Tuple[int, int]]) -> int:
+    """Months covered by the spans, counting overlapping roles once"""
+    total = 0
+    current_start = current_end = None
+    for start, end in sorted(spans):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+class Technology(NamedTuple):
+    key: str
+    name: str
+    categories: List[str]
+    experiences: List[Any]  # Experience models, in section order
+    years: float
+    first_used: Optional[int]
+    last_used: Optional[int]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "key": self.key,
+            "categories": self.categories,
+            "experienceCount": len(self.experiences),
+            "experienceIds": [experience.id for experience in self.experiences],
+            "years": self.years,
+            "firstUsed": self.first_used,
+            "lastUsed": self.last_used,
+        }
+
+
+class TechnologyFacets:
+    """Technology -> experiences, counts and pre-rendered responses.
+
+    Construction renders and compresses every response, so build it off the event loop.
+    """
+
+    def __init__(self, skills, experiences, today: Optional[date] = None):
+        today = today or date.today()
+        names: Dict[str, str] = {}
+        categories: Dict[str, List[str]] = {}
+        used_in: Dict[str, List[Any]] = {}
+        # Skills spell the canonical name; experiences add technologies skills do not list
+        technical = skills.technical if skills is not None else {}
+        for category, technologies in technical.items():
+            for name in technologies:
+                key = technology_key(name)
+                names.setdefault(key, name.strip())
+                categories.setdefault(key, [])
+                if category not in categories[key]:
+                    categories[key].append(category)
+        for experience in experiences or []:
+            for name in dict.fromkeys(experience.technologies):
+                key = technology_key(name)
+                names.setdefault(key, name.strip())
+                used = used_in.setdefault(key, [])
+                if not used or used[-1] is not experience:
+                    used.append(experience)
+
+        self.technologies: Dict[str, Technology] = {}
+        for key, name in names.items():
+            used = used_in.get(key, [])
+            spans = [span for span in (period_months(e.period, today) for e in used) if span is not None]
+            self.technologies[key] = Technology(
+                key=key,
+                name=name,
+                categories=categories.get(key, []),
+                experiences=used,
+                years=round(merged_months(spans) / 12, 1),
+                first_used=min(start for start, _ in spans) // 12 if spans else None,
+                last_used=max(end - 1 for _, end in spans) // 12 if spans else None,
+            )
+
+        ranked = sorted(self.technologies.values(), key=lambda t: (-len(t.experiences), -t.years, t.key))
+        category_counts: Dict[str, int] = {}
+        for technology in ranked:
+            for category in technology.categories:
+                category_counts[category] = category_counts.get(category, 0) + 1
+        self.listing = ContentVersion.render({
+            "total": len(ranked),
+            "categories": category_counts,
+            "technologies": [technology.summary() for technology in ranked],
+        })
+        self.experience_versions: Dict[str, ContentVersion] = {
+            key: ContentVersion.render(technology.experiences) for key, technology in self.technologies.items()
+        }
+
+    def experiences(self, name: str) -> Optional[ContentVersion]:
+        """Pre-rendered experiences that used ``name``, or None for an unknown technology"""
+        return self.experience_versions.get(technology_key(name))
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Synthetic large-dataset generator for capacity testing
+Bulk-loads reproducible profiles, experiences, achievements and contact
+submissions shaped like PORTFOLIO_DATA and validated by the server.py models.
+Uses the configured STORAGE_BACKEND (mongo or sqlite).
+
+Usage: python generate_data.py [--contacts 5000000] [--seed 42]
+       python generate_data.py --replace-content [--experiences 10000] [--achievements 1000]
+
+Contacts are appended. Profiles, experiences and achievements replace the
+stored content, so they are only generated with --replace-content.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Union
+
+from repositories import DuplicateContact, Repositories
+from seed_data import PORTFOLIO_DATA
+from server import Achievement, ContactEntry, Experience, Profile, repositories
+
+# Fixed so the same seed produces identical documents on every run
+ANCHOR = datetime(2026, 1, 1)
+
+FIRST_NAMES = ["Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Meera", "Arjun", "Sara", "Kabir", "Isha",
+               "James", "Emma", "Lucas", "Olivia", "Noah", "Mia", "Ethan", "Zoe", "Liam", "Ava"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Kulkarni", "Deshmukh", "Rao", "Smith", "Garcia", "Chen", "Müller",
+              "Johnson", "Brown", "Nguyen", "Silva", "Khan", "Fernandes", "Joshi", "Mehta", "Nair", "Wilson"]
+EMAIL_DOMAINS = ["gmail.com", "outlook.com", "yahoo.com", "proton.me", "acme-corp.com", "fintech.io",
+                 "globalbank.com", "startup.dev", "consulting.co", "university.edu"]
+COMPANY_SUFFIXES = ["Technologies", "Systems", "Labs", "Consulting", "Solutions", "Digital", "Analytics"]
+ROLES = ["Software Engineer", "Senior Software Engineer", "Technical Lead", "Engineering Manager",
+         "Principal Consultant", "Solutions Architect", "Data Engineer", "Lead Technology"]
+CITIES = ["Pune, India", "Mumbai, India", "Bengaluru, India", "Hyderabad, India", "London, UK",
+          "Singapore", "New York, USA", "Berlin, Germany"]
+EMPLOYMENT_TYPES = ["Full-time", "Contract", "Part-time"]
+ACHIEVEMENT_CATEGORIES = ["Professional", "Academic", "Competition", "Sports", "Community"]
+SUBJECTS = ["Project collaboration", "Job opportunity", "Consulting enquiry", "Speaking invitation",
+            "Quick question", "Partnership proposal", "Feedback on your work"]
+SENTENCES = [
+    "Led the migration of a legacy platform to a cloud-native architecture.",
+    "Reduced deployment lead time by automating the release pipeline.",
+    "Mentored a team of engineers across three time zones.",
+    "Designed APIs consumed by more than forty internal services.",
+    "Improved query latency by reworking indexes and caching.",
+    "Worked closely with product owners to shape the roadmap.",
+    "Introduced contract testing between microservices.",
+    "Ran capacity planning for peak trading periods.",
+]
+# Contact status mix seen in practice: most submissions are still unread
+STATUS_WEIGHTS = {"new": 60, "read": 25, "replied": 15}
+
+
+def technology_pool() -> List[str]:
+    technologies = {tech for exp in PORTFOLIO_DATA["experiences"] for tech in exp["technologies"]}
+    for names in PORTFOLIO_DATA["skills"]["technical"].values():
+        technologies.update(names)
+    return sorted(technologies)
+
+
+class DataGenerator:
+    """Deterministic document factory; every value comes from one seeded RNG"""
+
+    def __init__(self, seed: Union[int, str], days: int):
+        self.rng = random.Random(seed)
+        self.days = days
+        self.technologies = technology_pool()
+
+    def uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def timestamp(self) -> datetime:
+        # Millisecond precision, matching what BSON stores
+        offset = self.rng.randrange(self.days * 86_400_000)
+        return ANCHOR - timedelta(milliseconds=offset)
+
+    def person(self):
+        first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+        return f"{first} {last}", first.lower(), last.lower()
+
+    def company(self) -> str:
+        return f"{self.rng.choice(LAST_NAMES)} {self.rng.choice(COMPANY_SUFFIXES)}"
+
+    def paragraph(self, sentences: int) -> str:
+        return " ".join(self.rng.sample(SENTENCES, sentences))
+
+    def profile(self, index: int) -> Dict[str, Any]:
+        template = PORTFOLIO_DATA["profile"]
+        name, first, last = self.person()
+        return Profile(**{
+            **template,
+            "id": self.uuid(),
+            "name": name,
+            "email": f"{first}.{last}{index}@{self.rng.choice(EMAIL_DOMAINS)}",
+            "location": self.rng.choice(CITIES),
+            "createdAt": self.timestamp(),
+            "updatedAt": ANCHOR,
+        }).model_dump()
+
+    def experience(self, order: int) -> Dict[str, Any]:
+        start = 2000 + self.rng.randrange(24)
+        return Experience(
+            id=self.uuid(),
+            period=f"{start} - {start + 1 + self.rng.randrange(5)}",
+            company=self.company(),
+            role=self.rng.choice(ROLES),
+            location=self.rng.choice(CITIES),
+            type=self.rng.choice(EMPLOYMENT_TYPES),
+            description=self.paragraph(2),
+            achievements=self.rng.sample(SENTENCES, 3),
+            technologies=self.rng.sample(self.technologies, min(6, len(self.technologies))),
+            order=order,
+            createdAt=self.timestamp(),
+        ).model_dump()
+
+    def achievement(self, index: int) -> Dict[str, Any]:
+        category = self.rng.choice(ACHIEVEMENT_CATEGORIES)
+        return Achievement(
+            id=self.uuid(),
+            title=f"{category} Award #{index + 1}",
+            description=self.paragraph(1),
+            year=str(2000 + self.rng.randrange(26)),
+            category=category,
+            createdAt=self.timestamp(),
+        ).model_dump()
+
+    def contact(self, index: int) -> Dict[str, Any]:
+        name, first, last = self.person()
+        return ContactEntry(
+            id=self.uuid(),
+            name=name,
+            email=f"{first}.{last}{index}@{self.rng.choice(EMAIL_DOMAINS)}",
+            company=self.company() if self.rng.random() < 0.6 else None,
+            subject=self.rng.choice(SUBJECTS),
+            message=self.paragraph(self.rng.randint(1, 3)),
+            status=self.rng.choices(list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()))[0],
+            createdAt=self.timestamp(),
+        ).model_dump()
+
+    def batches(self, factory, count: int, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        for start in range(0, count, batch_size):
+            yield [factory(index) for index in range(start, min(start + batch_size, count))]
+
+
+async def load_content(repositories: Repositories, collection: str, documents: List[Dict[str, Any]]):
+    started = time.perf_counter()
+    await repositories.content[collection].replace_all(documents)
+    print(f"{collection:<13} {len(documents):>10,} documents in {time.perf_counter() - started:.1f}s")
+
+
+async def load_contacts(repositories: Repositories, generator: DataGenerator, count: int, batch_size: int):
+    started = time.perf_counter()
+    loaded = skipped = 0
+    for batch in generator.batches(generator.contact, count, batch_size):
+        # The same seed yields the same ids, so a re-run skips what an earlier run stored
+        try:
+            await repositories.contacts.insert_many(batch)
+        except DuplicateContact as e:
+            skipped += len(e.documents)
+        loaded += len(batch)
+        elapsed = time.perf_counter() - started
+        print(f"\rcontacts      {loaded:>10,} / {count:,}  ({loaded / elapsed:,.0f} docs/s)", end="", flush=True)
+    print(f"\rcontacts      {loaded - skipped:>10,} documents in {time.perf_counter() - started:.1f}s" + " " * 20)
+    if skipped:
+        print(f"contacts      {skipped:>10,} already stored, skipped")
+
+
+async def main(args):
+    if repositories.backend == "memory":
+        raise SystemExit("The memory backend does not persist; set STORAGE_BACKEND to mongo or sqlite")
+    # Contacts draw from their own RNG so they are the same with or without --replace-content
+    generator = DataGenerator(args.seed, args.days)
+    contact_generator = DataGenerator(f"{args.seed}/contacts", args.days)
+    await repositories.connect()
+    try:
+        if args.replace_content:
+            # In a fixed order, so the RNG stream (and so the data) is reproducible
+            if args.profiles:
+                await load_content(repositories, "profiles", [generator.profile(i) for i in range(args.profiles)])
+            if args.experiences:
+                await load_content(repositories, "experiences", [generator.experience(i + 1) for i in range(args.experiences)])
+            if args.achievements:
+                await load_content(repositories, "achievements", [generator.achievement(i) for i in range(args.achievements)])
+        if args.contacts:
+            await load_contacts(repositories, contact_generator, args.contacts, args.batch_size)
+    finally:
+        await repositories.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--replace-content", action="store_true",
+                        help="replace the stored profiles, experiences and achievements with generated ones")
+    parser.add_argument("--profiles", type=int, default=1)
+    parser.add_argument("--experiences", type=int, default=10_000)
+    parser.add_argument("--achievements", type=int, default=1_000)
+    parser.add_argument("--contacts", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=5_000, help="contacts per insert")
+    parser.add_argument("--days", type=int, default=730, help="spread createdAt over this many days before the anchor")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(main(args))
@@ -0,0 +1,178 @@
+"""
+Pre-rendered content versions and conditional GET helpers (ETag / Last-Modified)
+Bodies, compressed variants and validators are computed once per content
+version, never per request
+"""
+
+import gzip
+import hashlib
+import logging
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from pydantic_core import to_json
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Bodies smaller than this are not worth the Content-Encoding overhead
+COMPRESS_MIN_BYTES = 512
+# Content codings a variant can be served with (also the ETag suffixes)
+CODINGS = ("br", "gzip")
+
+
+class ContentVersion:
+    """One version of a response: models, rendered JSON body, compressed variants and ETag.
+
+    Building a version compresses the body, so callers should construct it off
+    the event loop (``await asyncio.to_thread(ContentVersion.render, value)``).
+    """
+
+    __slots__ = ("value", "body", "etag", "encoded")
+
+    def __init__(
+        self,
+        body: bytes,
+        value: Any = None,
+        etag: Optional[str] = None,
+        encoded: Optional[Dict[str, bytes]] = None,
+    ):
+        self.value = value
+        self.body = body
+        self.etag = etag or compute_etag(body)
+        # Variants read back from a snapshot are reused as-is
+        self.encoded: Dict[str, bytes] = compress_variants(body) if encoded is None else encoded
+
+    @classmethod
+    def render(cls, value: Any) -> "ContentVersion":
+        return cls(render_json(value), value=value)
+
+    def select(self, accept_encoding: Optional[str]) -> Dict[str, Any]:
+        """Pick the best precompressed variant the client accepts"""
+        for encoding in negotiate_encodings(accept_encoding):
+            if encoding in self.encoded:
+                return {"content": self.encoded[encoding], "encoding": encoding}
+        return {"content": self.body, "encoding": None}
+
+    def ratios(self) -> Dict[str, float]:
+        return {encoding: round(len(self.body) / len(data), 2) for encoding, data in self.encoded.items()}
+
+
+def compress_variants(body: bytes) -> Dict[str, bytes]:
+    if len(body) < COMPRESS_MIN_BYTES:
+        return {}
+    variants = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=11)
+    return {encoding: data for encoding, data in variants.items() if len(data) < len(body)}
+
+
+def negotiate_encodings(accept_encoding: Optional[str]) -> List[str]:
+    """Accepted codings ordered by q-value, preferring br over gzip on ties.
+
+    A coding named explicitly overrides ``*`` (so ``gzip;q=0, *`` excludes gzip).
+    """
+    if not accept_encoding:
+        return []
+    qualities: Dict[str, float] = {}
+    wildcard = 0.0
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        coding = coding.strip().lower()
+        if coding == "*":
+            wildcard = quality
+        elif coding in CODINGS:
+            qualities[coding] = quality
+    weighted = [(qualities.get(coding, wildcard), 1 if coding == "br" else 0, coding) for coding in CODINGS]
+    return [coding for quality, _, coding in sorted(weighted, reverse=True) if quality > 0]
+
+
+def log_version(name: str, version: ContentVersion) -> None:
+    ratios = ", ".join(f"{encoding} {ratio}x" for encoding, ratio in version.ratios().items()) or "uncompressed"
+    logger.info(f"Rendered {name} {version.etag}: {len(version.body)} bytes ({ratios})")
+
+
+def render_json(value: Any) -> bytes:
+    """Serialize models (or lists of models) straight to JSON bytes in pydantic-core"""
+    return to_json(value)
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag over a rendered response body"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def combine_etags(etags: Iterable[str]) -> str:
+    """ETag for a composite response built from already-versioned parts"""
+    digest = hashlib.sha256("|".join(etags).encode("utf-8")).hexdigest()[:32]
+    return '"' + digest + '"'
+
+
+def http_date(moment: datetime) -> str:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return format_datetime(moment.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def coded_etag(etag: str, encoding: Optional[str]) -> str:
+    """Per-representation ETag: a strong validator must differ between content codings"""
+    if not encoding:
+        return etag
+    return etag[:-1] + "-" + encoding + '"'
+
+
+def strip_coding(etag: str) -> str:
+    """The content version's ETag behind a (possibly coded, possibly weak) entity tag"""
+    etag = etag.removeprefix("W/")
+    for encoding in CODINGS:
+        suffix = "-" + encoding + '"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def validator_headers(
+    etag: str, last_modified: Optional[datetime] = None, encoding: Optional[str] = None
+) -> Dict[str, str]:
+    headers = {"ETag": coded_etag(etag, encoding), "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def is_not_modified(
+    request_headers: Any, etag: str, last_modified: Optional[datetime] = None
+) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against a version"""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        if "*" in candidates:
+            return True
+        # GET uses weak comparison (RFC 9110 13.1.2); any coding of the version matches
+        return any(strip_coding(tag) == etag for tag in candidates)
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
@@ -0,0 +1,146 @@
+"""
+Duplicate protection for contact submissions
+- Idempotency-Key: the response to a key is remembered for a TTL, so a client
+  retry gets the original ``id`` back without another write.
+- Content hash: the same (email, subject, message) within the dedup window maps
+  to the first submission. Recent hashes are answered from memory; the
+  ``dedupKey`` stored on each contact (hash plus window bucket) is unique in
+  the database. A miss in memory (after a restart, or on another replica) is
+  queued like any new submission, so storage is never awaited before the
+  acknowledgement; the unique index makes the flusher drop it, and the flusher
+  then points the hash at the stored original for later repeats.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+
+class IdempotencyConflict(Exception):
+    """The key was already used for a different request body"""
+
+
+class ExpiringMap:
+    """Bounded insertion-ordered map whose entries expire ``ttl`` seconds after being set"""
+
+    def __init__(self, ttl: float, max_entries: int, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def _expire(self, now: float) -> None:
+        while self._entries:
+            expires_at, _ = next(iter(self._entries.values()))
+            if expires_at > now and len(self._entries) <= self.max_entries:
+                break
+            self._entries.popitem(last=False)
+
+    def get(self, key: Hashable) -> Any:
+        now = self._clock()
+        self._expire(now)
+        entry = self._entries.get(key)
+        return entry[1] if entry is not None else None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries.pop(key, None)
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._expire(self._clock())
+
+    def pop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _Attempt(NamedTuple):
+    fingerprint: str
+    result: "asyncio.Future[Dict[str, Any]]"
+
+
+class IdempotencyStore:
+    """Idempotency-Key -> response of the first request that used it"""
+
+    def __init__(self, ttl: float = 86400, max_entries: int = 10000, clock: Callable[[], float] = time.monotonic):
+        self._attempts = ExpiringMap(ttl, max_entries, clock)
+        self.replays = 0
+
+    async def run(
+        self, key: str, fingerprint: str, handler: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Return ``(response, replayed)``; concurrent requests with one key share the first attempt"""
+        attempt: Optional[_Attempt] = self._attempts.get(key)
+        if attempt is not None:
+            if attempt.fingerprint != fingerprint:
+                raise IdempotencyConflict(f"Idempotency-Key {key!r} was used with a different request")
+            self.replays += 1
+            return await asyncio.shield(attempt.result), True
+
+        attempt = _Attempt(fingerprint, asyncio.get_running_loop().create_future())
+        self._attempts.set(key, attempt)
+        try:
+            response = await handler()
+        except BaseException as e:
+            # Failures are not remembered: the client's retry gets a fresh attempt
+            self._attempts.pop(key)
+            if isinstance(e, asyncio.CancelledError):
+                attempt.result.cancel()
+            else:
+                attempt.result.set_exception(e)
+                attempt.result.exception()  # mark retrieved when nobody is waiting
+            raise
+        attempt.result.set_result(response)
+        return response, False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"keys": len(self._attempts), "replays": self.replays}
+
+
+def fingerprint(*parts: Optional[str]) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update((part or "").encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def content_hash(email: str, subject: str, message: str) -> str:
+    """Hash of what makes two submissions the same, ignoring case in the email and outer whitespace"""
+    return fingerprint(email.strip().lower(), subject.strip(), message.strip())
+
+
+def dedup_key(digest: str, created_at_epoch: float, window: float) -> str:
+    """Stored, uniquely indexed key: identical content in the same window bucket collides"""
+    return f"{digest}:{int(created_at_epoch // window)}"
+
+
+def dedup_digest(key: str) -> str:
+    """The content hash a ``dedup_key`` was built from"""
+    return key.rpartition(":")[0]
+
+
+class RecentSubmissions:
+    """Content hash -> id of the first submission, for the length of the dedup window"""
+
+    def __init__(self, window: float = 600, max_entries: int = 10000, clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self._ids = ExpiringMap(window, max_entries, clock)
+        self.duplicates = 0
+
+    def original(self, digest: str) -> Optional[str]:
+        original = self._ids.get(digest)
+        if original is not None:
+            self.duplicates += 1
+        return original
+
+    def remember(self, digest: str, contact_id: str) -> None:
+        self._ids.set(digest, contact_id)
+
+    def forget(self, digest: str) -> None:
+        self._ids.pop(digest)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hashes": len(self._ids), "windowSeconds": self.window, "duplicates": self.duplicates}
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Declarative index registry for the portfolio collections
+Reconciled at application startup, or from the command line:
+
+    python indexes.py            # report drift only
+    python indexes.py --apply    # create missing indexes
+    python indexes.py --explain  # flag API query shapes that use a collection scan
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from pagination import CONTACT_SORT
+
+logger = logging.getLogger(__name__)
+
+
+class IndexSpec(NamedTuple):
+    name: str
+    keys: List[Tuple[str, int]]
+    unique: bool = False
+    partial: Optional[Dict[str, Any]] = None  # partialFilterExpression
+
+
+class QueryShape(NamedTuple):
+    """A query the API issues; ``allow_collscan`` marks intentional full reads of tiny collections"""
+    endpoint: str
+    collection: str
+    filter: Dict[str, Any]
+    sort: Optional[List[Tuple[str, int]]] = None
+    allow_collscan: bool = False
+
+
+INDEX_REGISTRY: Dict[str, List[IndexSpec]] = {
+    "experiences": [
+        IndexSpec("order", [("order", 1)]),
+    ],
+    "contacts": [
+        IndexSpec("id_unique", [("id", 1)], unique=True),
+        IndexSpec("createdAt_id", CONTACT_SORT),
+        IndexSpec("status_createdAt_id", [("status", 1)] + CONTACT_SORT),
+        # Content-hash dedup (see idempotency.py); older submissions have no dedupKey
+        IndexSpec("dedupKey_unique", [("dedupKey", 1)], unique=True, partial={"dedupKey": {"$exists": True}}),
+    ],
+}
+
+QUERY_SHAPES: List[QueryShape] = [
+    QueryShape("GET /api/profile", "profiles", {}, allow_collscan=True),
+    QueryShape("GET /api/skills", "skills", {}, allow_collscan=True),
+    QueryShape("GET /api/education", "education", {}, allow_collscan=True),
+    QueryShape("GET /api/achievements", "achievements", {}, allow_collscan=True),
+    QueryShape("GET /api/experience", "experiences", {}, [("order", 1)]),
+    QueryShape("GET /api/contacts", "contacts", {}, CONTACT_SORT),
+    QueryShape("GET /api/contacts?status=", "contacts", {"status": "new"}, CONTACT_SORT),
+    QueryShape("GET /api/contacts/stats", "contacts", {"createdAt": {"$gte": datetime(2000, 1, 1)}}),
+    QueryShape("GET /api/contacts/stats backlog", "contacts", {"status": "new", "createdAt": {"$lt": datetime(2000, 1, 1)}}),
+    QueryShape("PATCH /api/contacts", "contacts", {"id": {"$in": [""]}, "status": {"$in": ["new"]}}),
+    QueryShape("contact journal replay", "contacts", {"id": ""}),
+    QueryShape("POST /api/contact dedup", "contacts", {"dedupKey": ""}),
+]
+
+
+def _describe(info: Dict[str, Any]) -> Tuple[List[Tuple[str, int]], bool, Optional[Dict[str, Any]]]:
+    keys = [(field, int(direction)) for field, direction in info["key"]]
+    return keys, bool(info.get("unique", False)), info.get("partialFilterExpression")
+
+
+async def reconcile_indexes(db, apply: bool = True) -> Dict[str, List[str]]:
+    """Compare live indexes with INDEX_REGISTRY and (optionally) create missing ones.
+
+    Indexes whose definition drifted are reported but never dropped automatically.
+    """
+    report: Dict[str, List[str]] = {"created": [], "missing": [], "drifted": [], "unmanaged": []}
+    for collection_name, specs in INDEX_REGISTRY.items():
+        existing = await db[collection_name].index_information()
+        for spec in specs:
+            qualified = f"{collection_name}.{spec.name}"
+            if spec.name not in existing:
+                if apply:
+                    options = {"partialFilterExpression": spec.partial} if spec.partial else {}
+                    await db[collection_name].create_index(
+                        spec.keys, name=spec.name, unique=spec.unique, background=True, **options
+                    )
+                    report["created"].append(qualified)
+                else:
+                    report["missing"].append(qualified)
+            elif _describe(existing[spec.name]) != (list(spec.keys), spec.unique, spec.partial):
+                report["drifted"].append(qualified)
+        managed = {spec.name for spec in specs} | {"_id_"}
+        report["unmanaged"].extend(f"{collection_name}.{name}" for name in existing if name not in managed)
+
+    for kind in ("missing", "drifted", "unmanaged"):
+        if report[kind]:
+            logger.warning(f"Indexes {kind}: {', '.join(report[kind])}")
+    if report["created"]:
+        logger.info(f"Indexes created: {', '.join(report['created'])}")
+    return report
+
+
+def _stages(plan: Dict[str, Any]):
+    yield plan.get("stage")
+    for child in ("inputStage", "queryPlan"):
+        if child in plan:
+            yield from _stages(plan[child])
+    for child in plan.get("inputStages", []):
+        yield from _stages(child)
+
+
+async def find_collection_scans(db) -> List[str]:
+    """Explain every registered query shape and list those whose winning plan is a COLLSCAN"""
+    flagged = []
+    for shape in QUERY_SHAPES:
+        cursor = db[shape.collection].find(shape.filter)
+        if shape.sort:
+            cursor = cursor.sort(shape.sort)
+        plan = await cursor.explain()
+        winning = plan.get("queryPlanner", {}).get("winningPlan", {})
+        if "COLLSCAN" in set(_stages(winning)) and not shape.allow_collscan:
+            flagged.append(f"{shape.endpoint} ({shape.collection})")
+    for entry in flagged:
+        logger.warning(f"Collection scan: {entry}")
+    return flagged
+
+
+async def main(apply: bool, explain: bool):
+    load_dotenv(Path(__file__).parent / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+    try:
+        report = await reconcile_indexes(db, apply=apply)
+        for kind, names in report.items():
+            print(f"{kind:<10} {', '.join(names) or '-'}")
+        if explain:
+            scans = await find_collection_scans(db)
+            print(f"{'collscans':<10} {', '.join(scans) or '-'}")
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile MongoDB indexes with the registry")
+    parser.add_argument("--apply", action="store_true", help="create missing indexes")
+    parser.add_argument("--explain", action="store_true", help="flag query shapes using collection scans")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    asyncio.run(main(args.apply, args.explain))
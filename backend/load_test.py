@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Concurrent load generator for the portfolio API
+Drives the app in-process through ASGI (default) or a running server (--url)
+with a weighted request mix, and reports throughput and p50/p95/p99/max
+latency per endpoint. backend_test.py stays the functional check; this is
+for capacity and regression runs.
+
+Usage:
+    STORAGE_BACKEND=memory python load_test.py --mix read --concurrency 32 --duration 30
+    python load_test.py --url http://localhost:8001 --mix "GET /api/portfolio=3,POST /api/contact=1"
+    python load_test.py --report results/run.json
+
+POST /api/contact is rate limited per client (admission.py); raise CONTACT_IP_RATE,
+CONTACT_IP_BURST and CONTACT_GLOBAL_RATE for write-heavy mixes or expect 429/503s.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+# Named mixes: "METHOD path" -> relative weight
+MIXES: Dict[str, Dict[str, int]] = {
+    "read": {
+        "GET /api/profile": 4,
+        "GET /api/experience": 3,
+        "GET /api/skills": 2,
+        "GET /api/achievements": 2,
+        "GET /api/education": 1,
+        "GET /api/portfolio": 4,
+    },
+    "bundle": {"GET /api/portfolio": 1},
+    "mixed": {
+        "GET /api/portfolio": 6,
+        "GET /api/profile": 2,
+        "GET /api/experience": 2,
+        "GET /api/contacts?limit=50": 1,
+        "POST /api/contact": 1,
+    },
+    "write": {"POST /api/contact": 1},
+}
+
+
+def parse_mix(spec: str) -> Dict[str, int]:
+    """A named mix or "METHOD path=weight,..." (method defaults to GET)"""
+    if spec in MIXES:
+        return MIXES[spec]
+    mix = {}
+    for item in spec.split(","):
+        endpoint, _, weight = item.strip().rpartition("=")
+        if not endpoint:
+            endpoint, weight = weight, "1"
+        if " " not in endpoint:
+            endpoint = f"GET {endpoint}"
+        mix[endpoint] = int(weight)
+    return mix
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+        self.errors = 0
+
+    def record(self, seconds: float, status: Optional[int]):
+        self.latencies.append(seconds)
+        if status is None:
+            self.errors += 1
+        else:
+            self.statuses[status] += 1
+            if status >= 400:
+                self.errors += 1
+
+    def summary(self, elapsed: float) -> Dict:
+        ordered = sorted(self.latencies)
+
+        def ms(seconds: float) -> float:
+            return round(seconds * 1000, 3)
+
+        return {
+            "requests": len(ordered),
+            "errors": self.errors,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "throughput": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+            "latencyMs": {
+                "mean": ms(sum(ordered) / len(ordered)) if ordered else 0.0,
+                "p50": ms(percentile(ordered, 50)),
+                "p95": ms(percentile(ordered, 95)),
+                "p99": ms(percentile(ordered, 99)),
+                "max": ms(ordered[-1]) if ordered else 0.0,
+            },
+        }
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, mix: Dict[str, int], concurrency: int,
+                 duration: float, warmup: float, seed: int):
+        self.client = client
+        self.endpoints = list(mix)
+        self.weights = list(mix.values())
+        self.concurrency = concurrency
+        self.duration = duration
+        self.warmup = warmup
+        self.rng = random.Random(seed)
+        self.stats: Dict[str, EndpointStats] = {endpoint: EndpointStats() for endpoint in self.endpoints}
+        self.sequence = 0
+        self.started_at = datetime.utcnow()
+
+    def contact_body(self) -> Dict[str, str]:
+        self.sequence += 1
+        return {
+            "name": f"Load Test {self.sequence}",
+            "email": f"load{self.sequence}@loadtest.dev",
+            "subject": "Load test",
+            "message": "Generated by load_test.py",
+        }
+
+    async def send(self, endpoint: str) -> Tuple[float, Optional[int]]:
+        method, path = endpoint.split(" ", 1)
+        body = self.contact_body() if method == "POST" else None
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, json=body)
+            # Read the full body so transfer time is part of the latency
+            await response.aread()
+            status = response.status_code
+        except httpx.HTTPError:
+            status = None
+        return time.perf_counter() - started, status
+
+    async def worker(self, measure_from: float, deadline: float):
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                return
+            endpoint = self.rng.choices(self.endpoints, weights=self.weights)[0]
+            seconds, status = await self.send(endpoint)
+            if now >= measure_from:
+                self.stats[endpoint].record(seconds, status)
+
+    async def run(self) -> float:
+        self.started_at = datetime.utcnow()
+        started = time.perf_counter()
+        measure_from = started + self.warmup
+        deadline = measure_from + self.duration
+        await asyncio.gather(*(self.worker(measure_from, deadline) for _ in range(self.concurrency)))
+        return time.perf_counter() - measure_from
+
+    def report(self, elapsed: float, target: str, mix_spec: str) -> Dict:
+        endpoints = {endpoint: stats.summary(elapsed) for endpoint, stats in self.stats.items()}
+        total = EndpointStats()
+        for stats in self.stats.values():
+            total.latencies.extend(stats.latencies)
+            total.statuses.update(stats.statuses)
+            total.errors += stats.errors
+        return {
+            "startedAt": self.started_at.isoformat(),
+            "target": target,
+            "mix": mix_spec,
+            "concurrency": self.concurrency,
+            "durationSeconds": round(elapsed, 3),
+            "warmupSeconds": self.warmup,
+            "total": total.summary(elapsed),
+            "endpoints": endpoints,
+        }
+
+
+def print_report(report: Dict):
+    print(f"\n{report['target']}  mix={report['mix']}  concurrency={report['concurrency']}  "
+          f"duration={report['durationSeconds']}s")
+    header = f"{'endpoint':<32}{'reqs':>8}{'err':>6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+    print(header)
+    print("-" * len(header))
+    rows = list(report["endpoints"].items()) + [("TOTAL", report["total"])]
+    for endpoint, summary in rows:
+        latency = summary["latencyMs"]
+        print(f"{endpoint:<32}{summary['requests']:>8}{summary['errors']:>6}{summary['throughput']:>9.1f}"
+              f"{latency['p50']:>9.2f}{latency['p95']:>9.2f}{latency['p99']:>9.2f}{latency['max']:>9.2f}")
+
+
+@contextlib.asynccontextmanager
+async def open_client(url: Optional[str], concurrency: int, timeout: float):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    if url:
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+            yield client, url
+        return
+
+    import server
+
+    # ASGITransport does not run the lifespan, so enter it here
+    async with server.app.router.lifespan_context(server.app):
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=timeout) as client:
+            yield client, f"asgi://server.app ({server.repositories.backend})"
+
+
+async def main(args) -> int:
+    mix = parse_mix(args.mix)
+    async with open_client(args.url, args.concurrency, args.timeout) as (client, target):
+        test = LoadTest(client, mix, args.concurrency, args.duration, args.warmup, args.seed)
+        elapsed = await test.run()
+    report = test.report(elapsed, target, args.mix)
+    print_report(report)
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.report}")
+    return 1 if report["total"]["requests"] == 0 else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="base URL of a running server (default: in-process ASGI)")
+    parser.add_argument("--mix", default="read", help=f"one of {', '.join(MIXES)} or 'METHOD path=weight,...'")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds of unmeasured traffic first")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--report", type=Path, help="write the JSON report here")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args)))
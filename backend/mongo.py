@@ -0,0 +1,113 @@
+"""
+Motor client construction, connection pool warm-up and pool statistics
+Pool settings come from the environment:
+
+    MONGO_MAX_POOL_SIZE                 maxPoolSize (default 100)
+    MONGO_MIN_POOL_SIZE                 minPoolSize (default 10)
+    MONGO_MAX_IDLE_TIME_MS              maxIdleTimeMS (default 300000)
+    MONGO_SERVER_SELECTION_TIMEOUT_MS   serverSelectionTimeoutMS (default 5000)
+    MONGO_CONNECT_TIMEOUT_MS            connectTimeoutMS (default 5000)
+    MONGO_WARMUP_CONNECTIONS            connections opened before serving (default minPoolSize)
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Mapping
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+POOL_SETTINGS = {
+    # env var: (client option, default)
+    "MONGO_MAX_POOL_SIZE": ("maxPoolSize", 100),
+    "MONGO_MIN_POOL_SIZE": ("minPoolSize", 10),
+    "MONGO_MAX_IDLE_TIME_MS": ("maxIdleTimeMS", 300000),
+    "MONGO_SERVER_SELECTION_TIMEOUT_MS": ("serverSelectionTimeoutMS", 5000),
+    "MONGO_CONNECT_TIMEOUT_MS": ("connectTimeoutMS", 5000),
+}
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Connection pool counters fed by PyMongo's CMAP events"""
+
+    def __init__(self):
+        self.created = 0
+        self.closed = 0
+        self.checked_out = 0
+        self.checkout_failures = 0
+        self.in_use = 0
+        self.clears = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self.clears += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.created += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.closed += 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        self.checked_out += 1
+        self.in_use += 1
+
+    def connection_checked_in(self, event):
+        self.in_use -= 1
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "open": self.created - self.closed,
+            "inUse": self.in_use,
+            "created": self.created,
+            "closed": self.closed,
+            "checkouts": self.checked_out,
+            "checkoutFailures": self.checkout_failures,
+            "clears": self.clears,
+        }
+
+
+def pool_options_from_env(environ: Mapping[str, str]) -> Dict[str, int]:
+    return {option: int(environ.get(name, default)) for name, (option, default) in POOL_SETTINGS.items()}
+
+
+def create_client(mongo_url: str, options: Dict[str, Any], event_listeners: List[Any]) -> AsyncIOMotorClient:
+    return AsyncIOMotorClient(mongo_url, event_listeners=event_listeners, **options)
+
+
+async def warm_up(client: AsyncIOMotorClient, connections: int) -> float:
+    """Ping once to select a server, then open ``connections`` sockets with concurrent pings.
+
+    Returns the elapsed seconds. Failures are logged, not raised: the app still starts
+    (contact writes spool locally) and the driver keeps retrying in the background.
+    """
+    start = time.perf_counter()
+    try:
+        await client.admin.command("ping")
+        if connections > 1:
+            await asyncio.gather(*(client.admin.command("ping") for _ in range(connections)))
+    except Exception as e:
+        logger.warning(f"MongoDB warm-up failed: {e}")
+    elapsed = time.perf_counter() - start
+    logger.info(f"MongoDB warm-up finished in {elapsed * 1000:.1f}ms ({connections} connections)")
+    return elapsed
@@ -0,0 +1,101 @@
+"""
+Keyset (cursor) pagination over (createdAt, id), newest first
+Cursors are opaque to clients: urlsafe base64 of the last row's sort key
+"""
+
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+# Sort order shared by queries and the compound indexes that back them
+CONTACT_SORT = [("createdAt", -1), ("id", -1)]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, entry_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), entry_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, entry_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(entry_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+class ContactQuery(NamedTuple):
+    """Backend-neutral description of one page of contacts"""
+    status: Optional[str] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    after: Optional[Tuple[datetime, str]] = None
+    ids: Optional[Tuple[str, ...]] = None
+
+
+def contact_query(
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+) -> ContactQuery:
+    after = decode_cursor(cursor) if cursor is not None else None
+    if after is not None:
+        after = (naive_utc(after[0]), after[1])
+    return ContactQuery(status, naive_utc(created_after), naive_utc(created_before), after)
+
+
+def naive_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    """Stored timestamps are naive UTC (as Mongo returns them); align client-supplied ones"""
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def contact_filter(query: ContactQuery) -> Dict[str, Any]:
+    """Mongo filter for a page of contacts, positioned after ``query.after`` if given"""
+    clauses = []
+    if query.ids is not None:
+        clauses.append({"id": {"$in": list(query.ids)}})
+    if query.status is not None:
+        clauses.append({"status": query.status})
+    created = {}
+    if query.created_after is not None:
+        created["$gte"] = query.created_after
+    if query.created_before is not None:
+        created["$lt"] = query.created_before
+    if created:
+        clauses.append({"createdAt": created})
+    if query.after is not None:
+        created_at, entry_id = query.after
+        clauses.append({"$or": [
+            {"createdAt": {"$lt": created_at}},
+            {"createdAt": created_at, "id": {"$lt": entry_id}},
+        ]})
+    if not clauses:
+        return {}
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def sort_key(document: Dict[str, Any]) -> Tuple[datetime, str]:
+    return document["createdAt"], document["id"]
+
+
+def contact_matches(query: ContactQuery, document: Dict[str, Any]) -> bool:
+    """contact_filter evaluated in Python, for backends without a query language"""
+    if query.ids is not None and document["id"] not in query.ids:
+        return False
+    if query.status is not None and document.get("status") != query.status:
+        return False
+    created_at = document["createdAt"]
+    if query.created_after is not None and created_at < query.created_after:
+        return False
+    if query.created_before is not None and created_at >= query.created_before:
+        return False
+    return query.after is None or sort_key(document) < query.after
@@ -0,0 +1,275 @@
+"""
+On-demand profiling of individual requests
+While at least one request is being profiled, a sampler thread wakes every
+``interval`` seconds, reads the event-loop thread's current frame with
+sys._current_frames() and charges it to the session whose task is running.
+Requests that are not profiled pay nothing: no hook runs on the event loop.
+Child tasks a profiled request creates (asyncio.gather, ...) are attributed to
+it through the loop's task factory, which copies the request's context
+variable. Time spent suspended (awaiting MongoDB, a worker thread, other
+requests, ...) is charged to the stack that was last seen, with an ``[await]``
+frame on top.
+
+Profiles are written in the collapsed-stack format ("a;b;c <microseconds>")
+that flamegraph.pl, inferno and speedscope read.
+"""
+
+import asyncio
+import hmac
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+import weakref
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+_current_session: ContextVar[Optional["ProfileSession"]] = ContextVar("profile_session", default=None)
+
+
+class ProfileSession:
+    """Time-weighted stacks for one request"""
+
+    def __init__(self, root_frame, task: Optional[asyncio.Task]):
+        self.root = root_frame  # the middleware frame; it and its callers are not recorded
+        self.task = task
+        self.tasks: "weakref.WeakSet[asyncio.Task]" = weakref.WeakSet()  # child tasks
+        self.thread_id = threading.get_ident()
+        self.loop = asyncio.get_running_loop()
+        self.stacks: Counter = Counter()
+        self.started = self.last_time = time.perf_counter()
+        self.last_stack = "[start]"
+
+    def stack(self, frame, task: Optional[asyncio.Task]) -> Optional[str]:
+        """Stack below the middleware, or None when ``frame`` is not running one of the request's tasks"""
+        if task is None:
+            return None
+        if task is self.task:
+            stop = self.root
+        elif task in self.tasks:
+            # A child task starts at its outermost coroutine
+            stop = getattr(task.get_coro(), "cr_frame", None)
+        else:
+            return None
+        names: List[str] = []
+        while frame is not None and frame is not stop:
+            code = frame.f_code
+            names.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+            frame = frame.f_back
+        if frame is None:
+            return None  # the loop switched tasks between reading the frame and the task
+        if task is not self.task:
+            names += [f"{Path(stop.f_code.co_filename).stem}:{stop.f_code.co_name}", "[task]"]
+        return ";".join(reversed(names))
+
+    def charge(self, stack: str, now: float) -> None:
+        self.stacks[stack] += now - self.last_time
+        self.last_time = now
+        self.last_stack = stack
+
+    def sample(self, frame, now: float) -> None:
+        stack = self.stack(frame, asyncio.current_task(self.loop)) if frame is not None else None
+        if stack is None:
+            self.wait(now)
+        else:
+            self.charge(stack, now)
+
+    def wait(self, now: float) -> None:
+        """Charge the time since the last sample to waiting at the last seen stack"""
+        waited = self.last_stack if self.last_stack.endswith("[await]") else f"{self.last_stack};[await]"
+        self.stacks[waited] += now - self.last_time
+        self.last_time = now
+
+    def finish(self) -> float:
+        now = time.perf_counter()
+        self.stacks[self.last_stack] += now - self.last_time
+        return now - self.started
+
+    def collapsed(self) -> str:
+        lines = [f"{stack} {round(seconds * 1_000_000)}" for stack, seconds in self.stacks.most_common()]
+        return "\n".join(line for line in lines if not line.endswith(" 0")) + "\n"
+
+
+def _task_factory(previous):
+    """Loop task factory that attributes tasks created inside a profiled request to its session"""
+
+    def create_task(loop, coro, **kwargs):
+        task = previous(loop, coro, **kwargs) if previous is not None else asyncio.Task(coro, loop=loop, **kwargs)
+        session = _current_session.get()
+        if session is not None:
+            session.tasks.add(task)
+        return task
+
+    create_task.profiling = True
+    return create_task
+
+
+class StackSampler:
+    """Samples the stacks of active sessions from a side thread, every ``interval`` seconds.
+
+    The thread only runs while at least one session is active.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._sessions: List[ProfileSession] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def active(self) -> int:
+        return len(self._sessions)
+
+    def start(self, root_frame) -> ProfileSession:
+        """Start profiling the calling task; call from the request's own coroutine"""
+        loop = asyncio.get_running_loop()
+        factory = loop.get_task_factory()
+        if not getattr(factory, "profiling", False):
+            loop.set_task_factory(_task_factory(factory))
+        session = ProfileSession(root_frame, asyncio.current_task())
+        _current_session.set(session)
+        with self._lock:
+            self._sessions.append(session)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+                self._thread.start()
+        return session
+
+    def stop(self, session: ProfileSession) -> None:
+        with self._lock:
+            self._sessions.remove(session)
+        _current_session.set(None)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._sessions:
+                    self._thread = None
+                    return
+                frames = sys._current_frames()
+                now = time.perf_counter()
+                for session in self._sessions:
+                    session.sample(frames.get(session.thread_id), now)
+
+
+class ProfileStore:
+    """Rolling directory of profiles: <id>.folded plus <id>.json metadata, newest ``max_profiles`` kept.
+
+    The retained ids are kept in memory (oldest first), so a save never lists the directory.
+    """
+
+    def __init__(self, directory: Path, max_profiles: int = 200):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()  # saves and listings run in worker threads
+        # Ids start with a UTC timestamp, so name order is age order
+        existing = sorted(path.stem for path in self.directory.glob("*.json")) if self.directory.exists() else []
+        self._ids = deque(existing)
+        self._prune()
+
+    def save(self, profile_id: str, metadata: Dict[str, Any], collapsed: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / f"{profile_id}.folded").write_text(collapsed)
+        (self.directory / f"{profile_id}.json").write_text(json.dumps(metadata))
+        with self._lock:
+            self._ids.append(profile_id)
+        self._prune()
+
+    def _prune(self) -> None:
+        while True:
+            with self._lock:
+                if len(self._ids) <= self.max_profiles:
+                    return
+                stale = self._ids.popleft()
+            (self.directory / f"{stale}.json").unlink(missing_ok=True)
+            (self.directory / f"{stale}.folded").unlink(missing_ok=True)
+
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            newest = list(self._ids)[::-1][:limit]
+        profiles = []
+        for profile_id in newest:
+            path = self.directory / f"{profile_id}.json"
+            if path.exists():
+                profiles.append(json.loads(path.read_text()))
+        return profiles
+
+    def load(self, profile_id: str) -> Optional[str]:
+        path = self.directory / f"{Path(profile_id).name}.folded"
+        return path.read_text() if path.exists() else None
+
+
+def new_profile_id() -> str:
+    return f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+
+
+class ProfilingMiddleware:
+    """Profile a request when it carries the profiling token in X-Profile-Token or is picked by
+    ``sample_rate``; the id of the stored profile is returned in X-Profile-Id.
+
+    The token is never read from the query string, where access and proxy logs would record it.
+    """
+
+    def __init__(self, app, profiler: StackSampler, store: ProfileStore, token: Optional[str],
+                 sample_rate: float = 0.0, captured=None):
+        self.app = app
+        self.profiler = profiler
+        self.store = store
+        self.token = token
+        self.sample_rate = sample_rate
+        self.captured = captured  # optional metrics Counter labelled by trigger
+
+    def authorized(self, presented: Optional[str]) -> bool:
+        return bool(self.token and presented and hmac.compare_digest(presented.encode(), self.token.encode()))
+
+    def trigger(self, scope) -> Optional[str]:
+        presented = dict(scope["headers"]).get(b"x-profile-token")
+        if self.authorized(presented.decode() if presented is not None else None):
+            return "on_demand"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        trigger = self.trigger(scope) if scope["type"] == "http" else None
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = new_profile_id()
+        status = 500
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]}
+            await send(message)
+
+        session = self.profiler.start(sys._getframe())
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            self.profiler.stop(session)
+            elapsed = session.finish()
+            route = getattr(scope.get("route"), "path", None) or scope["path"]
+            metadata = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route,
+                "status": status,
+                "trigger": trigger,
+                "durationMs": round(elapsed * 1000, 3),
+                "capturedAt": datetime.utcnow().isoformat(),
+            }
+            # The response has been sent; writing the files only delays this task
+            await asyncio.to_thread(self.store.save, profile_id, metadata, session.collapsed())
+            if self.captured is not None:
+                self.captured.inc(trigger)
@@ -0,0 +1,49 @@
+"""
+Field selection (?fields=) for read endpoints
+Selected fields become a matching partial response model. Contact reads also
+push them down as a Mongo projection; content sections are projected in memory
+from the cached full section.
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Type
+
+from pydantic import BaseModel, create_model
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+def parse_fields(model: Type[BaseModel], fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Validate a comma separated list of top-level field names against ``model``.
+
+    Returns the names in model order (usable as a cache key) or None when every field is wanted.
+    """
+    if not fields:
+        return None
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(names - set(model.model_fields))
+    if unknown:
+        raise InvalidFields(f"Unknown fields for {model.__name__}: {', '.join(unknown)}")
+    return tuple(name for name in model.model_fields if name in names) or None
+
+
+def mongo_projection(fields: Optional[Tuple[str, ...]], always: Tuple[str, ...] = ()) -> Optional[Dict[str, int]]:
+    """Projection reading only ``fields`` (plus ``always``); ``id`` may live in ``_id``"""
+    if fields is None:
+        return None
+    projection = {name: 1 for name in fields + always}
+    projection["_id"] = 1 if "id" in fields else 0
+    return projection
+
+
+@lru_cache(maxsize=256)
+def partial_model(model: Type[BaseModel], fields: Optional[Tuple[str, ...]]) -> Type[BaseModel]:
+    """``model`` restricted to ``fields``, keeping each field's type and default"""
+    if fields is None:
+        return model
+    return create_model(
+        f"{model.__name__}Partial",
+        **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields},
+    )
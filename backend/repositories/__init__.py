@@ -0,0 +1,192 @@
+"""
+Storage backends for the portfolio collections
+STORAGE_BACKEND selects one of:
+
+    mongo   Motor/MongoDB (default)
+    memory  process-local dicts, content loaded from seed_data.PORTFOLIO_DATA
+    sqlite  single file database at SQLITE_PATH, for single-node deployments and tests
+
+Every backend returns plain documents with a string ``id`` and passes
+tests/test_repositories.py.
+"""
+
+import copy
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from pagination import ContactQuery, sort_key
+from seed_data import SEED_COLLECTIONS, seed_documents, stable_id
+
+# Content collection -> sort applied when listing it
+CONTENT_COLLECTIONS: Dict[str, Optional[List[Tuple[str, int]]]] = {
+    "profiles": None,
+    "experiences": [("order", 1)],
+    "skills": None,
+    "achievements": None,
+    "education": None,
+}
+
+Fields = Optional[Tuple[str, ...]]
+
+
+class DuplicateContact(Exception):
+    """Raised after a write for the documents skipped because their ``id`` or ``dedupKey`` was taken"""
+
+    def __init__(self, documents: List[Dict[str, Any]]):
+        self.documents = documents
+        super().__init__(f"Duplicate contacts skipped: {', '.join(str(d.get('id')) for d in documents)}")
+
+
+class ContentRepository:
+    """Read-mostly content collection (profiles, experiences, skills, ...).
+
+    Reads return whole documents; ``?fields=`` is applied to the cached section (see server.project_section).
+    """
+
+    async def find_one(self) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def find_all(self, limit: int = 100) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def replace_all(self, documents: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+
+class ContactRepository:
+    """Contact submissions, keyed by ``id`` and paged newest first.
+
+    ``dedupKey``, when present, is unique as well. Writes store every other
+    document and then raise DuplicateContact for the ones that collided.
+    """
+
+    async def insert_many(self, documents: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    async def upsert_many(self, documents: List[Dict[str, Any]]) -> None:
+        """Insert-only upsert by ``id``: contacts already stored are left as they are.
+
+        Safe to repeat, and never reverts changes made since (e.g. a status update).
+        """
+        raise NotImplementedError
+
+    async def dedup_owner(self, dedup_key: str) -> Optional[str]:
+        """Id of the stored contact holding ``dedup_key``"""
+        raise NotImplementedError
+
+    async def find_page(self, query: ContactQuery, limit: int, fields: Fields = None) -> List[Dict[str, Any]]:
+        """Up to ``limit`` matching contacts ordered by (createdAt, id) descending.
+
+        With ``fields`` only those fields are returned, plus the sort keys.
+        """
+        raise NotImplementedError
+
+    async def update_status(self, query: ContactQuery, from_statuses: Sequence[str], status: str, updated_at: datetime, update_id: str) -> int:
+        """Move every matching contact currently in ``from_statuses`` to ``status`` in one write.
+
+        Sets ``statusUpdatedAt`` and ``statusUpdateId`` as well, so a caller can tell its
+        own changes from concurrent ones on re-read; returns the number of contacts changed.
+        """
+        raise NotImplementedError
+
+    async def count(self, query: ContactQuery) -> int:
+        raise NotImplementedError
+
+    async def oldest(self, query: ContactQuery) -> Optional[datetime]:
+        """createdAt of the oldest matching contact"""
+        raise NotImplementedError
+
+    async def summarize(self, created_after: Optional[datetime], created_before: Optional[datetime]) -> Dict[str, Dict[str, int]]:
+        """Counts of contacts created in [created_after, created_before), computed by the backend:
+        ``{"days": {"YYYY-MM-DD": n}, "domains": {"example.com": n}}`` (UTC days, lower-cased domains)
+        """
+        raise NotImplementedError
+
+    async def stream(self, query: ContactQuery, batch_size: int, fields: Fields = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Every matching contact in find_page order, ``batch_size`` at a time.
+
+        Only one batch is held at once. The default walks keyset pages; backends
+        with server-side cursors override it.
+        """
+        while True:
+            batch = await self.find_page(query, batch_size, fields)
+            if batch:
+                yield batch
+            if len(batch) < batch_size:
+                return
+            query = query._replace(after=sort_key(batch[-1]))
+
+
+class Repositories:
+    """The repositories of one backend plus its connection lifecycle"""
+
+    backend = "abstract"
+
+    def __init__(self, content: Dict[str, ContentRepository], contacts: ContactRepository):
+        self.content = content
+        self.contacts = contacts
+
+    async def connect(self) -> None:
+        pass
+
+    async def ensure_indexes(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+def email_domain(email: str) -> str:
+    return email.rpartition("@")[2].lower()
+
+
+def normalize_id(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert MongoDB ObjectId to string id if the document has no id of its own"""
+    if "_id" in document:
+        document.setdefault("id", str(document["_id"]))
+        del document["_id"]
+    return document
+
+
+def project(document: Dict[str, Any], fields: Fields, always: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    if fields is None:
+        return document
+    return {name: document[name] for name in fields + always if name in document}
+
+
+# Timestamps for built-in seed content; a fixed value keeps bodies, ETags and
+# Last-Modified identical across restarts
+SEED_TIMESTAMP = datetime(2024, 1, 1)
+
+
+def default_content() -> Dict[str, List[Dict[str, Any]]]:
+    """Seed content keyed by collection, with stable ids and timestamps so ETags survive restarts"""
+    content = {}
+    for collection in SEED_COLLECTIONS:
+        content[collection] = []
+        for item in seed_documents(collection):
+            document = copy.deepcopy(item)
+            document.pop("_id", None)
+            document.setdefault("id", stable_id(collection, item))
+            document.setdefault("createdAt", SEED_TIMESTAMP)
+            if collection == "profiles":
+                document.setdefault("updatedAt", SEED_TIMESTAMP)
+            content[collection].append(document)
+    return content
+
+
+def create_repositories(environ: Mapping[str, str], event_listeners: Sequence[Any] = ()) -> Repositories:
+    """Build the backend named by STORAGE_BACKEND; ``event_listeners`` are PyMongo monitors (mongo only)"""
+    backend = environ.get("STORAGE_BACKEND", "mongo").lower()
+    if backend == "mongo":
+        from repositories.motor_backend import MotorRepositories
+        return MotorRepositories(environ["MONGO_URL"], environ["DB_NAME"], environ, event_listeners)
+    if backend == "memory":
+        from repositories.memory_backend import MemoryRepositories
+        return MemoryRepositories(default_content())
+    if backend == "sqlite":
+        from repositories.sqlite_backend import SQLiteRepositories
+        path = environ.get("SQLITE_PATH", str(Path(__file__).parent.parent / "portfolio.db"))
+        return SQLiteRepositories(path, default_content)
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
@@ -0,0 +1,138 @@
+"""
+In-memory backend: content served straight from dicts, contacts kept sorted by (createdAt, id)
+State lives in the process and is lost on restart.
+"""
+
+import bisect
+import copy
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pagination import ContactQuery, contact_matches, sort_key
+from repositories import (
+    CONTENT_COLLECTIONS, ContactRepository, ContentRepository, DuplicateContact, Fields, Repositories, email_domain, project,
+)
+
+
+class MemoryContentRepository(ContentRepository):
+    def __init__(self, sort: Optional[List[Tuple[str, int]]] = None):
+        self.sort = sort
+        self._documents: List[Dict[str, Any]] = []
+
+    async def find_one(self) -> Optional[Dict[str, Any]]:
+        return copy.deepcopy(self._documents[0]) if self._documents else None
+
+    async def find_all(self, limit: int = 100) -> List[Dict[str, Any]]:
+        return [copy.deepcopy(document) for document in self._documents[:limit]]
+
+    async def replace_all(self, documents: List[Dict[str, Any]]) -> None:
+        documents = copy.deepcopy(documents)
+        for field, direction in reversed(self.sort or []):
+            documents.sort(key=lambda document: document[field], reverse=direction < 0)
+        self._documents = documents
+
+
+class MemoryContactRepository(ContactRepository):
+    def __init__(self):
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._keys: List[Tuple[Any, str]] = []  # ascending (createdAt, id)
+        self._dedup: Dict[str, str] = {}  # dedupKey -> id
+
+    def _dedup_taken(self, document: Dict[str, Any]) -> bool:
+        owner = self._dedup.get(document.get("dedupKey"))
+        return owner is not None and owner != document["id"]
+
+    async def insert_many(self, documents: List[Dict[str, Any]]) -> None:
+        duplicates = [document for document in documents if document["id"] in self._by_id]
+        fresh = [document for document in documents if document["id"] not in self._by_id]
+        try:
+            await self.upsert_many(fresh)
+        except DuplicateContact as e:
+            duplicates.extend(e.documents)
+        if duplicates:
+            raise DuplicateContact(duplicates)
+
+    async def upsert_many(self, documents: List[Dict[str, Any]]) -> None:
+        duplicates = []
+        for document in documents:
+            if document["id"] in self._by_id:
+                continue
+            if self._dedup_taken(document):
+                duplicates.append(document)
+                continue
+            self._by_id[document["id"]] = copy.deepcopy(document)
+            bisect.insort(self._keys, sort_key(document))
+            if document.get("dedupKey") is not None:
+                self._dedup[document["dedupKey"]] = document["id"]
+        if duplicates:
+            raise DuplicateContact(duplicates)
+
+    async def dedup_owner(self, dedup_key: str) -> Optional[str]:
+        return self._dedup.get(dedup_key)
+
+    def _between(self, created_after, created_before) -> List[Dict[str, Any]]:
+        start = bisect.bisect_left(self._keys, (created_after, "")) if created_after is not None else 0
+        end = bisect.bisect_left(self._keys, (created_before, "")) if created_before is not None else len(self._keys)
+        return [self._by_id[entry_id] for _, entry_id in self._keys[start:end]]
+
+    async def update_status(self, query: ContactQuery, from_statuses: Sequence[str], status: str, updated_at: datetime, update_id: str) -> int:
+        if query.ids is not None:
+            candidates = [self._by_id[i] for i in dict.fromkeys(query.ids) if i in self._by_id]
+        else:
+            candidates = self._between(query.created_after, query.created_before)
+        changed = 0
+        for document in candidates:
+            if document["status"] in from_statuses and contact_matches(query, document):
+                document["status"] = status
+                document["statusUpdatedAt"] = updated_at
+                document["statusUpdateId"] = update_id
+                changed += 1
+        return changed
+
+    async def count(self, query: ContactQuery) -> int:
+        return sum(1 for document in self._between(query.created_after, query.created_before) if contact_matches(query, document))
+
+    async def oldest(self, query: ContactQuery) -> Optional[datetime]:
+        for document in self._between(query.created_after, query.created_before):
+            if contact_matches(query, document):
+                return document["createdAt"]
+        return None
+
+    async def summarize(self, created_after: Optional[datetime], created_before: Optional[datetime]) -> Dict[str, Dict[str, int]]:
+        days: Dict[str, int] = {}
+        domains: Dict[str, int] = {}
+        for document in self._between(created_after, created_before):
+            day = document["createdAt"].strftime("%Y-%m-%d")
+            days[day] = days.get(day, 0) + 1
+            domain = email_domain(document["email"])
+            domains[domain] = domains.get(domain, 0) + 1
+        return {"days": days, "domains": domains}
+
+    async def find_page(self, query: ContactQuery, limit: int, fields: Fields = None) -> List[Dict[str, Any]]:
+        # Walk newest first, starting just below the cursor
+        end = bisect.bisect_left(self._keys, query.after) if query.after is not None else len(self._keys)
+        page = []
+        for position in range(end - 1, -1, -1):
+            document = self._by_id[self._keys[position][1]]
+            if query.created_after is not None and document["createdAt"] < query.created_after:
+                break
+            if contact_matches(query, document):
+                page.append(project(copy.deepcopy(document), fields, always=("createdAt", "id")))
+                if len(page) >= limit:
+                    break
+        return page
+
+
+class MemoryRepositories(Repositories):
+    backend = "memory"
+
+    def __init__(self, content: Dict[str, List[Dict[str, Any]]]):
+        self._initial_content = content
+        super().__init__(
+            {name: MemoryContentRepository(sort) for name, sort in CONTENT_COLLECTIONS.items()},
+            MemoryContactRepository(),
+        )
+
+    async def connect(self) -> None:
+        for name, documents in self._initial_content.items():
+            await self.content[name].replace_all(documents)
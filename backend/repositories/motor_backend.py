@@ -0,0 +1,175 @@
+"""
+MongoDB backend (Motor) - the default
+"""
+
+import asyncio
+import os
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from indexes import reconcile_indexes
+from mongo import PoolStats, create_client, pool_options_from_env, warm_up
+from pagination import CONTACT_SORT, ContactQuery, contact_filter
+from projection import mongo_projection
+from repositories import (
+    CONTENT_COLLECTIONS, ContactRepository, ContentRepository, DuplicateContact, Fields, Repositories, normalize_id,
+)
+
+DUPLICATE_KEY = 11000
+
+
+def raise_duplicates(error: BulkWriteError, documents: List[Dict[str, Any]]) -> None:
+    """Turn an unordered bulk write's duplicate-key errors into DuplicateContact; re-raise anything else"""
+    write_errors = error.details.get("writeErrors", [])
+    if error.details.get("writeConcernErrors") or any(e["code"] != DUPLICATE_KEY for e in write_errors):
+        raise error
+    raise DuplicateContact([documents[e["index"]] for e in write_errors])
+
+
+class MotorContentRepository(ContentRepository):
+    def __init__(self, collection, sort: Optional[List[Tuple[str, int]]] = None):
+        self.collection = collection
+        self.sort = sort
+
+    async def find_one(self) -> Optional[Dict[str, Any]]:
+        document = await self.collection.find_one({})
+        return normalize_id(document) if document else None
+
+    async def find_all(self, limit: int = 100) -> List[Dict[str, Any]]:
+        cursor = self.collection.find({}).limit(limit)
+        if self.sort:
+            cursor = cursor.sort(self.sort)
+        return [normalize_id(document) for document in await cursor.to_list(limit)]
+
+    async def replace_all(self, documents: List[Dict[str, Any]]) -> None:
+        await self.collection.delete_many({})
+        if documents:
+            await self.collection.insert_many([dict(document) for document in documents])
+
+
+class MotorContactRepository(ContactRepository):
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def insert_many(self, documents: List[Dict[str, Any]]) -> None:
+        try:
+            await self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            raise_duplicates(e, documents)
+        finally:
+            # insert_many adds ObjectIds in place; keep callers' documents clean for retries
+            for document in documents:
+                document.pop("_id", None)
+
+    async def upsert_many(self, documents: List[Dict[str, Any]]) -> None:
+        if documents:
+            try:
+                await self.collection.bulk_write(
+                    [UpdateOne({"id": document["id"]}, {"$setOnInsert": document}, upsert=True) for document in documents],
+                    ordered=False,
+                )
+            except BulkWriteError as e:
+                raise_duplicates(e, documents)
+
+    async def dedup_owner(self, dedup_key: str) -> Optional[str]:
+        document = await self.collection.find_one({"dedupKey": dedup_key}, {"id": 1})
+        return normalize_id(document)["id"] if document else None
+
+    async def find_page(self, query: ContactQuery, limit: int, fields: Fields = None) -> List[Dict[str, Any]]:
+        projection = mongo_projection(fields, always=("createdAt", "id"))
+        cursor = self.collection.find(contact_filter(query), projection).sort(CONTACT_SORT).limit(limit)
+        return [normalize_id(document) for document in await cursor.to_list(limit)]
+
+    async def update_status(self, query: ContactQuery, from_statuses: Sequence[str], status: str, updated_at: datetime, update_id: str) -> int:
+        # The status guard makes the write safe against concurrent transitions
+        result = await self.collection.update_many(
+            {"$and": [contact_filter(query), {"status": {"$in": list(from_statuses)}}]},
+            {"$set": {"status": status, "statusUpdatedAt": updated_at, "statusUpdateId": update_id}},
+        )
+        return result.modified_count
+
+    async def count(self, query: ContactQuery) -> int:
+        return await self.collection.count_documents(contact_filter(query))
+
+    async def oldest(self, query: ContactQuery) -> Optional[datetime]:
+        document = await self.collection.find_one(
+            contact_filter(query), {"createdAt": 1, "_id": 0}, sort=[("createdAt", 1), ("id", 1)]
+        )
+        return document["createdAt"] if document else None
+
+    async def summarize(self, created_after: Optional[datetime], created_before: Optional[datetime]) -> Dict[str, Dict[str, int]]:
+        # Both pipelines match on the createdAt index and only read the fields they group by
+        match = {"$match": contact_filter(ContactQuery(created_after=created_after, created_before=created_before))}
+        by_day = [
+            match,
+            {"$group": {"_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$createdAt"}}, "count": {"$sum": 1}}},
+        ]
+        by_domain = [
+            match,
+            {"$group": {
+                "_id": {"$toLower": {"$arrayElemAt": [{"$split": ["$email", "@"]}, -1]}},
+                "count": {"$sum": 1},
+            }},
+        ]
+        days, domains = await asyncio.gather(
+            self.collection.aggregate(by_day).to_list(None), self.collection.aggregate(by_domain).to_list(None)
+        )
+        return {
+            "days": {row["_id"]: row["count"] for row in days},
+            "domains": {row["_id"]: row["count"] for row in domains},
+        }
+
+    async def stream(self, query: ContactQuery, batch_size: int, fields: Fields = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        # One cursor for the whole export: each batch is a single getMore of ``batch_size`` documents
+        projection = mongo_projection(fields, always=("createdAt", "id"))
+        cursor = self.collection.find(contact_filter(query), projection).sort(CONTACT_SORT).batch_size(batch_size)
+        try:
+            while True:
+                batch = await cursor.to_list(batch_size)
+                if not batch:
+                    return
+                yield [normalize_id(document) for document in batch]
+        finally:
+            # Release the server-side cursor when the client goes away mid-export
+            await cursor.close()
+
+
+class MotorRepositories(Repositories):
+    backend = "mongo"
+
+    def __init__(self, mongo_url: str, db_name: str, environ: Mapping[str, str] = os.environ,
+                 event_listeners: Sequence[Any] = ()):
+        self.mongo_url = mongo_url
+        self.db_name = db_name
+        self.environ = environ
+        self.options = pool_options_from_env(environ)
+        self.pool_stats = PoolStats()
+        self.event_listeners = [self.pool_stats, *event_listeners]
+        self.client = None
+        self.db = None
+        super().__init__({}, None)
+
+    def bind(self, db) -> None:
+        """Point every repository at ``db`` (also used to inject a database in tools)"""
+        self.db = db
+        self.content = {
+            name: MotorContentRepository(db[name], sort) for name, sort in CONTENT_COLLECTIONS.items()
+        }
+        self.contacts = MotorContactRepository(db.contacts)
+
+    async def connect(self) -> None:
+        """Create the client and warm the pool before serving"""
+        self.client = create_client(self.mongo_url, self.options, self.event_listeners)
+        self.bind(self.client[self.db_name])
+        connections = int(self.environ.get('MONGO_WARMUP_CONNECTIONS', self.options['minPoolSize']))
+        await warm_up(self.client, connections)
+
+    async def ensure_indexes(self) -> None:
+        await reconcile_indexes(self.db)
+
+    async def close(self) -> None:
+        if self.client is not None:
+            self.client.close()
@@ -0,0 +1,243 @@
+"""
+SQLite backend for single-node deployments and tests
+Documents are stored as extended JSON (bson.json_util) next to the columns that
+are filtered or sorted on. Calls run in a worker thread to keep the event loop free.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from bson import json_util
+
+from pagination import ContactQuery
+from repositories import (
+    CONTENT_COLLECTIONS, ContactRepository, ContentRepository, DuplicateContact, Fields, Repositories, project,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS content (
+    collection TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    doc TEXT NOT NULL,
+    PRIMARY KEY (collection, position)
+);
+CREATE TABLE IF NOT EXISTS contacts (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contacts_created_at_id ON contacts (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS contacts_status_created_at_id ON contacts (status, created_at DESC, id DESC);
+"""
+
+# Columns added after the first release, created on databases that predate them
+MIGRATIONS = {
+    "dedup_key": "ALTER TABLE contacts ADD COLUMN dedup_key TEXT",
+}
+# NULLs are distinct in a SQLite unique index, so submissions without a dedupKey never collide
+POST_MIGRATION = "CREATE UNIQUE INDEX IF NOT EXISTS contacts_dedup_key ON contacts (dedup_key)"
+
+
+def timestamp(moment: datetime) -> str:
+    """Fixed-width ISO text (millisecond precision, like BSON) so lexical order is chronological"""
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
+
+
+class SQLiteDatabase:
+    def __init__(self, path: str):
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(contacts)")}
+        for column, statement in MIGRATIONS.items():
+            if column not in columns:
+                self.connection.execute(statement)
+        self.connection.execute(POST_MIGRATION)
+        self._lock = threading.Lock()
+
+    def _call(self, work: Callable[[sqlite3.Connection], Any]) -> Any:
+        with self._lock, self.connection:
+            return work(self.connection)
+
+    async def run(self, work: Callable[[sqlite3.Connection], Any]) -> Any:
+        return await asyncio.to_thread(self._call, work)
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class SQLiteContentRepository(ContentRepository):
+    def __init__(self, database: SQLiteDatabase, collection: str, sort=None):
+        self.database = database
+        self.collection = collection
+        self.sort = sort
+
+    async def find_one(self) -> Optional[Dict[str, Any]]:
+        documents = await self.find_all(limit=1)
+        return documents[0] if documents else None
+
+    async def find_all(self, limit: int = 100) -> List[Dict[str, Any]]:
+        rows = await self.database.run(lambda connection: connection.execute(
+            "SELECT doc FROM content WHERE collection = ? ORDER BY position LIMIT ?",
+            (self.collection, limit),
+        ).fetchall())
+        return [json_util.loads(doc) for (doc,) in rows]
+
+    async def replace_all(self, documents: List[Dict[str, Any]]) -> None:
+        documents = list(documents)
+        # Positions follow the collection's sort so reads are a plain ORDER BY position
+        for field, direction in reversed(self.sort or []):
+            documents.sort(key=lambda document: document[field], reverse=direction < 0)
+        rows = [(self.collection, position, json_util.dumps(document)) for position, document in enumerate(documents)]
+
+        def replace(connection: sqlite3.Connection) -> None:
+            connection.execute("DELETE FROM content WHERE collection = ?", (self.collection,))
+            connection.executemany("INSERT INTO content (collection, position, doc) VALUES (?, ?, ?)", rows)
+
+        await self.database.run(replace)
+
+
+class SQLiteContactRepository(ContactRepository):
+    def __init__(self, database: SQLiteDatabase):
+        self.database = database
+
+    @staticmethod
+    def _row(document: Dict[str, Any]):
+        return (
+            document["id"], document["status"], timestamp(document["createdAt"]),
+            document.get("dedupKey"), json_util.dumps(document),
+        )
+
+    async def _write(self, sql: str, documents: List[Dict[str, Any]], existing_is_duplicate: bool = True) -> None:
+        rows = [self._row(document) for document in documents]
+
+        def write(connection: sqlite3.Connection) -> List[int]:
+            skipped = []
+            for position, row in enumerate(rows):
+                try:
+                    # Nothing written: the id is already stored (a dedup_key clash raises instead)
+                    if connection.execute(sql, row).rowcount == 0 and existing_is_duplicate:
+                        skipped.append(position)
+                except sqlite3.IntegrityError:
+                    skipped.append(position)
+            return skipped
+
+        skipped = await self.database.run(write)
+        if skipped:
+            raise DuplicateContact([documents[position] for position in skipped])
+
+    async def insert_many(self, documents: List[Dict[str, Any]]) -> None:
+        await self._write(
+            "INSERT OR IGNORE INTO contacts (id, status, created_at, dedup_key, doc) VALUES (?, ?, ?, ?, ?)",
+            documents,
+        )
+
+    async def upsert_many(self, documents: List[Dict[str, Any]]) -> None:
+        # Not INSERT OR IGNORE: only an existing id is ignored, a taken dedup_key still raises
+        await self._write(
+            "INSERT INTO contacts (id, status, created_at, dedup_key, doc) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (id) DO NOTHING",
+            documents,
+            existing_is_duplicate=False,
+        )
+
+    async def dedup_owner(self, dedup_key: str) -> Optional[str]:
+        row = await self.database.run(lambda connection: connection.execute(
+            "SELECT id FROM contacts WHERE dedup_key = ?", (dedup_key,)
+        ).fetchone())
+        return row[0] if row else None
+
+    @staticmethod
+    def _where(query: ContactQuery):
+        clauses, params = [], []
+        if query.ids is not None:
+            # One parameter however many ids (SQLite caps the number of bound parameters)
+            clauses.append("id IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(list(query.ids)))
+        if query.status is not None:
+            clauses.append("status = ?")
+            params.append(query.status)
+        if query.created_after is not None:
+            clauses.append("created_at >= ?")
+            params.append(timestamp(query.created_after))
+        if query.created_before is not None:
+            clauses.append("created_at < ?")
+            params.append(timestamp(query.created_before))
+        if query.after is not None:
+            created_at, entry_id = query.after
+            clauses.append("(created_at < ? OR (created_at = ? AND id < ?))")
+            params.extend([timestamp(created_at), timestamp(created_at), entry_id])
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    async def update_status(self, query: ContactQuery, from_statuses: Sequence[str], status: str, updated_at: datetime, update_id: str) -> int:
+        where, params = self._where(query)
+        guard = f"status IN ({', '.join('?' for _ in from_statuses)})"
+        where = f"{where} AND {guard}" if where else f"WHERE {guard}"
+        # The status lives in its column and in the stored document
+        sql = (
+            "UPDATE contacts SET status = ?, "
+            "doc = json_set(doc, '$.status', ?, '$.statusUpdatedAt', json(?), '$.statusUpdateId', ?) "
+            f"{where}"
+        )
+        values = (status, status, json_util.dumps(updated_at), update_id, *params, *from_statuses)
+        return await self.database.run(lambda connection: connection.execute(sql, values).rowcount)
+
+    async def count(self, query: ContactQuery) -> int:
+        where, params = self._where(query)
+        return await self.database.run(
+            lambda connection: connection.execute(f"SELECT count(*) FROM contacts {where}", params).fetchone()[0]
+        )
+
+    async def oldest(self, query: ContactQuery) -> Optional[datetime]:
+        where, params = self._where(query)
+        row = await self.database.run(lambda connection: connection.execute(
+            f"SELECT min(created_at) FROM contacts {where}", params
+        ).fetchone())
+        return datetime.fromisoformat(row[0]) if row[0] is not None else None
+
+    async def summarize(self, created_after: Optional[datetime], created_before: Optional[datetime]) -> Dict[str, Dict[str, int]]:
+        where, params = self._where(ContactQuery(created_after=created_after, created_before=created_before))
+        domain = "lower(substr(json_extract(doc, '$.email'), instr(json_extract(doc, '$.email'), '@') + 1))"
+
+        def summarize(connection: sqlite3.Connection) -> Dict[str, Dict[str, int]]:
+            days = connection.execute(f"SELECT substr(created_at, 1, 10), count(*) FROM contacts {where} GROUP BY 1", params)
+            domains = connection.execute(f"SELECT {domain}, count(*) FROM contacts {where} GROUP BY 1", params)
+            return {"days": dict(days.fetchall()), "domains": dict(domains.fetchall())}
+
+        return await self.database.run(summarize)
+
+    async def find_page(self, query: ContactQuery, limit: int, fields: Fields = None) -> List[Dict[str, Any]]:
+        where, params = self._where(query)
+        sql = f"SELECT doc FROM contacts {where} ORDER BY created_at DESC, id DESC LIMIT ?"
+        rows = await self.database.run(lambda connection: connection.execute(sql, (*params, limit)).fetchall())
+        return [project(json_util.loads(doc), fields, always=("createdAt", "id")) for (doc,) in rows]
+
+
+class SQLiteRepositories(Repositories):
+    backend = "sqlite"
+
+    def __init__(self, path: str, initial_content: Optional[Callable[[], Dict[str, List[Dict[str, Any]]]]] = None):
+        self.path = path
+        self.initial_content = initial_content
+        self.database: Optional[SQLiteDatabase] = None
+        super().__init__({}, None)
+
+    async def connect(self) -> None:
+        self.database = await asyncio.to_thread(SQLiteDatabase, self.path)
+        self.content = {
+            name: SQLiteContentRepository(self.database, name, sort) for name, sort in CONTENT_COLLECTIONS.items()
+        }
+        self.contacts = SQLiteContactRepository(self.database)
+        # A fresh database starts out with the seed content
+        if self.initial_content is not None and not await self.content["profiles"].find_one():
+            for name, documents in self.initial_content().items():
+                await self.content[name].replace_all(documents)
+
+    async def close(self) -> None:
+        if self.database is not None:
+            self.database.close()
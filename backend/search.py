@@ -0,0 +1,171 @@
+"""
+In-memory full-text search over portfolio content
+An inverted index with BM25 ranking (field-weighted term frequencies), prefix
+matching through a sorted term list and highlighted snippets. The index is
+immutable: server.py builds a new one whenever the content's ETags change.
+"""
+
+import bisect
+import html
+import math
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+TOKEN = re.compile(r"\w[\w+#]*(?:\.\w+)*")
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# Share of an exact match's weight given to a term only matched by prefix
+PREFIX_WEIGHT = 0.6
+# Term frequency multipliers per field
+FIELD_WEIGHTS = {
+    "title": 2.0,
+    "technologies": 1.5,
+    "subjects": 1.2,
+}
+SNIPPET_CONTEXT = 60  # characters either side of the first match
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN.findall(text.lower())
+
+
+class Field(NamedTuple):
+    name: str
+    text: str
+    spans: List[Tuple[int, int, str]]  # (start, end, term) of every token in ``text``
+
+
+class SearchDocument(NamedTuple):
+    id: str
+    type: str  # experience, about, achievement, education
+    title: str
+    fields: List[Field]
+    length: float
+
+
+def make_document(doc_id: str, doc_type: str, title: str, fields: Dict[str, str]) -> SearchDocument:
+    indexed = [Field("title", title, [])] + [Field(name, text, []) for name, text in fields.items() if text]
+    with_spans = []
+    for field in indexed:
+        spans = [(m.start(), m.end(), m.group().lower()) for m in TOKEN.finditer(field.text)]
+        with_spans.append(field._replace(spans=spans))
+    length = sum(FIELD_WEIGHTS.get(field.name, 1.0) * len(field.spans) for field in with_spans)
+    return SearchDocument(doc_id, doc_type, title, with_spans, length)
+
+
+def portfolio_documents(profile, experiences, achievements, education) -> List[SearchDocument]:
+    """Searchable documents from the section models (or model_construct'ed documents)"""
+    documents = []
+    for experience in experiences or []:
+        documents.append(make_document(experience.id, "experience", f"{experience.role} at {experience.company}", {
+            "description": experience.description,
+            "achievements": "\n".join(experience.achievements),
+            "technologies": ", ".join(experience.technologies),
+        }))
+    if profile is not None:
+        about = profile.about
+        documents.append(make_document(profile.id, "about", about.headline, {
+            "description": about.description,
+            "highlights": "\n".join(about.highlights),
+            "philosophy": about.philosophy,
+        }))
+    for achievement in achievements or []:
+        documents.append(make_document(achievement.id, "achievement", achievement.title, {
+            "description": achievement.description,
+        }))
+    if education is not None:
+        documents.append(make_document(education.id, "education", education.degree, {
+            "subjects": ", ".join(education.subjects),
+        }))
+    return documents
+
+
+class SearchIndex:
+    def __init__(self, documents: Iterable[SearchDocument]):
+        self.documents = list(documents)
+        # term -> {document position: field-weighted term frequency}
+        postings: Dict[str, Dict[int, float]] = defaultdict(lambda: defaultdict(float))
+        for position, document in enumerate(self.documents):
+            for field in document.fields:
+                weight = FIELD_WEIGHTS.get(field.name, 1.0)
+                for _, _, term in field.spans:
+                    postings[term][position] += weight
+        self.postings = {term: dict(frequencies) for term, frequencies in postings.items()}
+        self.terms = sorted(self.postings)
+        count = len(self.documents)
+        self.average_length = sum(d.length for d in self.documents) / count if count else 0.0
+        self.idf = {
+            term: math.log(1 + (count - len(frequencies) + 0.5) / (len(frequencies) + 0.5))
+            for term, frequencies in self.postings.items()
+        }
+
+    def expand(self, token: str) -> List[Tuple[str, float]]:
+        """The token itself (if indexed) plus every indexed term it is a prefix of"""
+        start = bisect.bisect_left(self.terms, token)
+        matches = []
+        for term in self.terms[start:]:
+            if not term.startswith(token):
+                break
+            matches.append((term, 1.0 if term == token else PREFIX_WEIGHT))
+        return matches
+
+    def search(self, query: str, limit: int = 10) -> Dict[str, Any]:
+        scores: Dict[int, float] = defaultdict(float)
+        matched_terms: Dict[int, set] = defaultdict(set)
+        for token in dict.fromkeys(tokenize(query)):
+            for term, weight in self.expand(token):
+                idf = self.idf[term]
+                for position, frequency in self.postings[term].items():
+                    norm = K1 * (1 - B + B * self.documents[position].length / self.average_length)
+                    scores[position] += weight * idf * frequency * (K1 + 1) / (frequency + norm)
+                    matched_terms[position].add(term)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        results = []
+        for position, score in ranked[:limit]:
+            document = self.documents[position]
+            field, snippet = highlight(document, matched_terms[position])
+            results.append({
+                "id": document.id,
+                "type": document.type,
+                "title": document.title,
+                "score": round(score, 4),
+                "field": field,
+                "snippet": snippet,
+            })
+        return {"query": query, "total": len(ranked), "results": results}
+
+
+def highlight(document: SearchDocument, terms: set) -> Tuple[Optional[str], str]:
+    """Snippet of the field with the most matches, matches wrapped in <mark> and the rest HTML-escaped"""
+    best: Optional[Field] = None
+    best_hits: List[Tuple[int, int, str]] = []
+    for field in document.fields:
+        hits = [span for span in field.spans if span[2] in terms]
+        # Prefer body fields over the title when they match as well
+        if len(hits) > len(best_hits) or (hits and best is not None and best.name == "title" and len(hits) == len(best_hits)):
+            best, best_hits = field, hits
+    if best is None:
+        return None, html.escape(document.title)
+
+    start = max(0, best_hits[0][0] - SNIPPET_CONTEXT)
+    end = min(len(best.text), best_hits[0][1] + SNIPPET_CONTEXT)
+    # Do not cut words in half at the edges
+    if start > 0:
+        start = best.text.find(" ", start, best_hits[0][0]) + 1 or start
+    if end < len(best.text):
+        end = best.text.rfind(" ", best_hits[0][1], end) if best.text.rfind(" ", best_hits[0][1], end) > 0 else end
+
+    parts = ["…" if start > 0 else ""]
+    cursor = start
+    for hit_start, hit_end, _ in best_hits:
+        if hit_start < cursor or hit_end > end:
+            continue
+        parts.append(html.escape(best.text[cursor:hit_start]))
+        parts.append(f"<mark>{html.escape(best.text[hit_start:hit_end])}</mark>")
+        cursor = hit_end
+    parts.append(html.escape(best.text[cursor:end]))
+    parts.append("…" if end < len(best.text) else "")
+    return best.name, "".join(parts)
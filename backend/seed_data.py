@@ -4,20 +4,24 @@ Data seeding script for portfolio database
 This script populates the MongoDB database with initial portfolio data
 """
 
+import argparse
 import asyncio
 import os
+import uuid
 from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Tuple
+from pymongo import DeleteOne, UpdateOne
 
 # Load environment variables
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+# MongoDB connection (opened by seed_database, so PORTFOLIO_DATA can be imported without one)
+client = None
+db = None
 
 # Portfolio data for Darshan Fulfagar
 PORTFOLIO_DATA = {
@@ -218,57 +222,160 @@ PORTFOLIO_DATA = {
     }
 }
 
-async def seed_database():
-    """Seed the database with portfolio data"""
+# collection -> (PORTFOLIO_DATA key, natural key fields); an empty key marks a singleton
+SEED_COLLECTIONS = {
+    "profiles": ("profile", ("email",)),
+    "experiences": ("experiences", ("company", "role")),
+    "skills": ("skills", ()),
+    "achievements": ("achievements", ("title",)),
+    "education": ("education", ("degree", "university")),
+}
+
+# Fields owned by the database rather than PORTFOLIO_DATA
+MANAGED_FIELDS = {"_id", "id", "createdAt", "updatedAt"}
+
+
+class CollectionPlan(NamedTuple):
+    inserts: List[Dict[str, Any]]
+    updates: List[Tuple[Dict[str, Any], Dict[str, Any], List[str]]]  # (current, $set, $unset)
+    deletes: List[Dict[str, Any]]
+    unchanged: int
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.inserts or self.updates or self.deletes)
+
+
+def seed_documents(collection: str) -> List[Dict[str, Any]]:
+    data = PORTFOLIO_DATA[SEED_COLLECTIONS[collection][0]]
+    return data if isinstance(data, list) else [data]
+
+
+def natural_key(collection: str, document: Dict[str, Any]) -> Tuple:
+    return tuple(document.get(field) for field in SEED_COLLECTIONS[collection][1])
+
+
+def stable_id(collection: str, document: Dict[str, Any]) -> str:
+    """Id derived from the natural key, so every seeded environment agrees on it"""
+    key = "/".join(str(value) for value in natural_key(collection, document))
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"portfolio/{collection}/{key}"))
+
+
+def diff_document(collection: str, current: Dict[str, Any], desired: Dict[str, Any], now: datetime):
+    changes = {
+        field: value for field, value in desired.items()
+        if field not in MANAGED_FIELDS and current.get(field) != value
+    }
+    removed = [field for field in current if field not in MANAGED_FIELDS and field not in desired]
+    # Documents from older seeds may predate the id / createdAt fields
+    if "id" not in current:
+        changes["id"] = stable_id(collection, desired)
+    if "createdAt" not in current:
+        changes["createdAt"] = now
+    return changes, removed
+
+
+async def plan_collection(collection: str, now: datetime) -> CollectionPlan:
+    """Compare PORTFOLIO_DATA with what is stored, matching documents on their natural key"""
+    existing = {}
+    deletes = []
+    for document in await db[collection].find({}).to_list(None):
+        key = natural_key(collection, document)
+        if key in existing:
+            deletes.append(document)
+        else:
+            existing[key] = document
+
+    inserts, updates, unchanged = [], [], 0
+    for desired in seed_documents(collection):
+        current = existing.pop(natural_key(collection, desired), None)
+        if current is None:
+            inserts.append(desired)
+            continue
+        changes, removed = diff_document(collection, current, desired, now)
+        if changes or removed:
+            updates.append((current, changes, removed))
+        else:
+            unchanged += 1
+    deletes.extend(existing.values())
+    return CollectionPlan(inserts, updates, deletes, unchanged)
+
+
+async def apply_plan(collection: str, plan: CollectionPlan, now: datetime) -> None:
+    upserts = []
+    for document in plan.inserts:
+        key_filter = dict(zip(SEED_COLLECTIONS[collection][1], natural_key(collection, document)))
+        upserts.append(UpdateOne(
+            key_filter,
+            {
+                "$set": {field: value for field, value in document.items() if field not in MANAGED_FIELDS},
+                "$setOnInsert": {"id": stable_id(collection, document), "createdAt": now},
+            },
+            upsert=True,
+        ))
+    for current, changes, removed in plan.updates:
+        update = {"$set": changes}
+        if removed:
+            update["$unset"] = {field: "" for field in removed}
+        upserts.append(UpdateOne({"_id": current["_id"]}, update))
+    if upserts:
+        await db[collection].bulk_write(upserts, ordered=False)
+    # Deletes run after the upserts so readers never see an empty collection
+    if plan.deletes:
+        await db[collection].bulk_write([DeleteOne({"_id": document["_id"]}) for document in plan.deletes], ordered=False)
+
+
+def print_plan(collection: str, plan: CollectionPlan, verbose: bool) -> None:
+    print(
+        f"{collection:<13} +{len(plan.inserts)} inserted  ~{len(plan.updates)} updated  "
+        f"-{len(plan.deletes)} deleted  ={plan.unchanged} unchanged"
+    )
+    if not verbose:
+        return
+
+    def label(document):
+        return " / ".join(str(value) for value in natural_key(collection, document)) or collection
+
+    for document in plan.inserts:
+        print(f"    + {label(document)}")
+    for current, changes, removed in plan.updates:
+        print(f"    ~ {label(current)}: {', '.join(sorted(changes) + [f'-{field}' for field in removed])}")
+    for document in plan.deletes:
+        print(f"    - {label(document)}")
+
+
+async def seed_database(dry_run: bool = False):
+    global client, db
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
     try:
-        print("Starting database seeding...")
-        
-        # Clear existing collections
-        collections = ['profiles', 'experiences', 'skills', 'achievements', 'education']
-        for collection_name in collections:
-            await db[collection_name].delete_many({})
-            print(f"Cleared {collection_name} collection")
-        
-        # Insert profile data
-        await db.profiles.insert_one(PORTFOLIO_DATA["profile"])
-        print("✅ Profile data seeded")
-        
-        # Insert experience data
-        await db.experiences.insert_many(PORTFOLIO_DATA["experiences"])
-        print("✅ Experience data seeded")
-        
-        # Insert skills data
-        await db.skills.insert_one(PORTFOLIO_DATA["skills"])
-        print("✅ Skills data seeded")
-        
-        # Insert achievements data
-        await db.achievements.insert_many(PORTFOLIO_DATA["achievements"])
-        print("✅ Achievements data seeded")
-        
-        # Insert education data
-        await db.education.insert_one(PORTFOLIO_DATA["education"])
-        print("✅ Education data seeded")
-        
+        print("Planning database seeding (dry run)..." if dry_run else "Starting database seeding...")
+        now = datetime.utcnow()
+        collections = list(SEED_COLLECTIONS)
+        plans = await asyncio.gather(*(plan_collection(name, now) for name in collections))
+
+        for collection, plan in zip(collections, plans):
+            print_plan(collection, plan, verbose=dry_run)
+        if dry_run:
+            return
+        if not any(plan.changed for plan in plans):
+            print("\n✅ Database already matches the seed data")
+            return
+
+        await asyncio.gather(*(
+            apply_plan(collection, plan, now) for collection, plan in zip(collections, plans) if plan.changed
+        ))
+        # Profile.updatedAt is the Last-Modified of all content
+        await db.profiles.update_many({}, {"$set": {"updatedAt": now}})
         print("\n🎉 Database seeding completed successfully!")
-        
-        # Verify data
-        profile_count = await db.profiles.count_documents({})
-        experience_count = await db.experiences.count_documents({})
-        skills_count = await db.skills.count_documents({})
-        achievements_count = await db.achievements.count_documents({})
-        education_count = await db.education.count_documents({})
-        
-        print(f"\nData verification:")
-        print(f"Profiles: {profile_count}")
-        print(f"Experiences: {experience_count}")
-        print(f"Skills: {skills_count}")
-        print(f"Achievements: {achievements_count}")
-        print(f"Education: {education_count}")
-        
+
     except Exception as e:
         print(f"❌ Error seeding database: {e}")
     finally:
         client.close()
 
 if __name__ == "__main__":
-    asyncio.run(seed_database())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Seed the portfolio content collections")
+    parser.add_argument("--dry-run", action="store_true", help="print the changes without applying them")
+    args = parser.parse_args()
+    asyncio.run(seed_database(dry_run=args.dry_run))
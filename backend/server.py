@@ -1,30 +1,158 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from fastapi.responses import FileResponse, StreamingResponse
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 import os
+import hmac
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Literal, Optional, Dict, Any, Tuple, Type, TypeVar
 import uuid
+import time
+import asyncio
 from datetime import datetime
 
+from cache import ContentCache, ttls_from_env
+from write_behind import SpoolJournal, WriteBehindQueue
+from pagination import ContactQuery, InvalidCursor, contact_query, encode_cursor, naive_utc
+from indexes import find_collection_scans, reconcile_indexes
+from projection import InvalidFields, parse_fields, partial_model
+from repositories import CONTENT_COLLECTIONS, create_repositories, normalize_id
+from snapshot import read_snapshot
+from search import SearchIndex, portfolio_documents
+from facets import TechnologyFacets
+from admission import admission_from_env
+from idempotency import (
+    IdempotencyConflict, IdempotencyStore, RecentSubmissions, content_hash, dedup_digest, dedup_key, fingerprint,
+)
+from contact_stats import ContactStats, series
+from contact_status import CONFLICT, TRANSITIONS, UPDATED, plan_transition
+from exports import ExportManager, ExportQueueFull, ExportUnavailable
+from profiling import ProfileStore, ProfilingMiddleware, StackSampler
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, CommandMetrics, MetricsMiddleware, MetricsRegistry, RequestMetrics
+from http_cache import (
+    ContentVersion, combine_etags, is_not_modified, log_version, render_json, validator_headers,
+)
+
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+# Prometheus metrics: per-route HTTP metrics from middleware, per-collection Mongo timings from the driver
+metrics_registry = MetricsRegistry()
+request_metrics = RequestMetrics(metrics_registry)
+command_metrics = CommandMetrics(metrics_registry)
+
+# Storage backend, selected by STORAGE_BACKEND (mongo, memory or sqlite); connected in the lifespan handler
+repositories = create_repositories(os.environ, event_listeners=[command_metrics])
+
+# Read-through cache for content collections (only seed_data.py changes them)
+content_cache = ContentCache(
+    max_entries=int(os.environ.get('CACHE_MAX_ENTRIES', 256)),
+    default_ttl=float(os.environ.get('CACHE_TTL_SECONDS', 300)),
+    ttls=ttls_from_env(os.environ, list(CONTENT_COLLECTIONS)),
+)
+
+# Contact submissions are acknowledged once queued and written to Mongo in batches
+contact_writer = WriteBehindQueue(
+    None,  # bound to repositories.contacts at startup
+    SpoolJournal(
+        Path(os.environ.get('CONTACT_SPOOL_PATH', ROOT_DIR / 'spool' / 'contacts.jsonl')),
+        fsync=os.environ.get('CONTACT_SPOOL_FSYNC', 'true').lower() != 'false',
+    ),
+    max_size=int(os.environ.get('CONTACT_QUEUE_SIZE', 1000)),
+    batch_size=int(os.environ.get('CONTACT_BATCH_SIZE', 100)),
+    flush_interval=float(os.environ.get('CONTACT_FLUSH_INTERVAL', 0.05)),
+)
+
+# Rate limits and a concurrency cap in front of POST /api/contact (see admission.py)
+contact_admission = admission_from_env(
+    os.environ,
+    shed=metrics_registry.counter("contact_shed_total", "Contact submissions rejected by admission control", ("reason",)),
+)
+# Duplicate protection for contact submissions (see idempotency.py)
+idempotency_store = IdempotencyStore(
+    ttl=float(os.environ.get('IDEMPOTENCY_TTL_SECONDS', 86400)),
+    max_entries=int(os.environ.get('IDEMPOTENCY_MAX_KEYS', 10000)),
+)
+recent_submissions = RecentSubmissions(
+    window=float(os.environ.get('CONTACT_DEDUP_WINDOW_SECONDS', 600)),
+    max_entries=int(os.environ.get('CONTACT_DEDUP_MAX_ENTRIES', 10000)),
+)
+
+# Only trust X-Forwarded-For when the app sits behind a proxy that sets it
+TRUST_FORWARDED_FOR = os.environ.get('TRUST_FORWARDED_FOR', 'false').lower() == 'true'
+
+# Static content snapshot (see snapshot.py): 'serve' never reads content from Mongo,
+# 'fallback' uses it only when a database read fails
+SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR')
+SNAPSHOT_MODE = os.environ.get('SNAPSHOT_MODE', 'fallback')
+snapshot_versions: Optional[Dict[str, ContentVersion]] = None
+
+# Request profiling (see profiling.py): on demand with the PROFILE_TOKEN, or a sampled fraction
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN')
+# Admin endpoints (contact exports and updates, stats, cache and database internals) need ADMIN_TOKEN
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+profile_store = ProfileStore(
+    Path(os.environ.get('PROFILE_DIR', ROOT_DIR / 'profiles')),
+    max_profiles=int(os.environ.get('PROFILE_MAX_FILES', 200)),
+)
+
+CONTACTS_MAX_PAGE_SIZE = int(os.environ.get('CONTACTS_MAX_PAGE_SIZE', 500))
+CONTACTS_MAX_BULK_IDS = int(os.environ.get('CONTACTS_MAX_BULK_IDS', 5000))
+# Documents per cursor batch (one getMore) when streaming an export
+CONTACTS_EXPORT_BATCH_SIZE = int(os.environ.get('CONTACTS_EXPORT_BATCH_SIZE', 1000))
+# Dashboard analytics over contacts (see contact_stats.py)
+contact_stats = ContactStats(
+    ttl=float(os.environ.get('CONTACT_STATS_TTL_SECONDS', 15)),
+    full_refresh=float(os.environ.get('CONTACT_STATS_FULL_REFRESH_SECONDS', 6 * 3600)),
+    top_domains=int(os.environ.get('CONTACT_STATS_TOP_DOMAINS', 10)),
+)
+# Background Parquet/CSV exports (see exports.py)
+export_manager = ExportManager(
+    Path(os.environ.get('EXPORT_DIR', ROOT_DIR / 'exports')),
+    batch_size=int(os.environ.get('EXPORT_BATCH_SIZE', 5000)),
+    chunk_rows=int(os.environ.get('EXPORT_CHUNK_ROWS', 50000)),
+    max_running=int(os.environ.get('EXPORT_MAX_RUNNING', 1)),
+    max_jobs=int(os.environ.get('EXPORT_MAX_JOBS', 50)),
+    max_queued=int(os.environ.get('EXPORT_MAX_QUEUED', 5)),
+)
+contacts_exported = metrics_registry.counter("contacts_exported_total", "Contacts written to NDJSON exports")
+
+# Documents we wrote ourselves skip Pydantic re-validation unless TRUSTED_READS=false
+TRUSTED_READS = os.environ.get('TRUSTED_READS', 'true').lower() != 'false'
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Connect (and warm up) the storage backend before serving; drain writers and close on shutdown"""
+    global snapshot_versions
+    if SNAPSHOT_DIR:
+        snapshot_versions = load_snapshot(Path(SNAPSHOT_DIR))
+    await repositories.connect()
+
+    contact_writer.repository = repositories.contacts
+    contact_writer.on_duplicate = remember_stored_original
+    contact_writer.start()
+    # Create missing registry indexes in the background so startup is not blocked
+    app.state.index_task = asyncio.create_task(reconcile_startup_indexes())
+    app.state.derived_task = asyncio.create_task(warm_derived_indexes())
+    try:
+        yield
+    finally:
+        await export_manager.stop()
+        await contact_writer.stop()
+        await repositories.close()
 
 # Create the main app without a prefix
-app = FastAPI(title="Portfolio API", version="1.0.0")
+app = FastAPI(title="Portfolio API", version="1.0.0", lifespan=lifespan)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
 
 # Define Models
 class AboutSection(BaseModel):
@@ -102,6 +230,26 @@ class ContactEntry(BaseModel):
     message: str
     status: str = "new"
     createdAt: datetime = Field(default_factory=datetime.utcnow)
+    statusUpdatedAt: Optional[datetime] = None
+
+class ContactStatusFilter(BaseModel):
+    status: Optional[str] = None
+    createdAfter: Optional[datetime] = None
+    createdBefore: Optional[datetime] = None
+
+class ContactStatusUpdate(BaseModel):
+    """Target status for either explicit ids or every contact matching a filter (``all`` for no filter)"""
+    status: Literal["new", "read", "replied"]
+    ids: Optional[List[str]] = Field(None, min_length=1, max_length=CONTACTS_MAX_BULK_IDS)
+    filter: Optional[ContactStatusFilter] = None
+    all: bool = False
+
+class PortfolioBundle(BaseModel):
+    profile: Optional[Profile] = None
+    experience: Optional[List[Experience]] = None
+    skills: Optional[Skills] = None
+    achievements: Optional[List[Achievement]] = None
+    education: Optional[Education] = None
 
 
 # API Routes
@@ -109,115 +257,647 @@ class ContactEntry(BaseModel):
 async def root():
     return {"message": "Portfolio API is running", "version": "1.0.0"}
 
-@api_router.get("/profile", response_model=Profile)
-async def get_profile():
-    try:
-        profile = await db.profiles.find_one()
-        if not profile:
-            raise HTTPException(status_code=404, detail="Profile not found")
-        
-        # Convert MongoDB ObjectId to string if needed
-        if "_id" in profile:
-            profile["id"] = str(profile["_id"])
-            del profile["_id"]
-        
-        return Profile(**profile)
+def build_model(model: Type[ModelT], document: Dict[str, Any]) -> ModelT:
+    """Build ``model`` from a stored document, without validation in trusted-read mode"""
+    document = normalize_id(document)
+    if not TRUSTED_READS:
+        return model(**document)
+    for name, field in model.model_fields.items():
+        nested = field.annotation
+        if isinstance(nested, type) and issubclass(nested, BaseModel) and isinstance(document.get(name), dict):
+            document[name] = build_model(nested, document[name])
+    return model.model_construct(**document)
+
+# Content loaders (wrapped by content_cache); ``?fields=`` projections are derived from these in memory
+async def load_profile() -> Optional[Profile]:
+    profile = await repositories.content["profiles"].find_one()
+    return build_model(Profile, profile) if profile else None
+
+async def load_experience() -> List[Experience]:
+    experiences = await repositories.content["experiences"].find_all()
+    return [build_model(Experience, exp) for exp in experiences]
+
+async def load_skills() -> Optional[Skills]:
+    skills = await repositories.content["skills"].find_one()
+    return build_model(Skills, skills) if skills else None
+
+async def load_achievements() -> List[Achievement]:
+    achievements = await repositories.content["achievements"].find_all()
+    return [build_model(Achievement, achievement) for achievement in achievements]
+
+async def load_education() -> Optional[Education]:
+    education = await repositories.content["education"].find_one()
+    return build_model(Education, education) if education else None
+
+
+# Section name -> (cache key, loader, model)
+PORTFOLIO_SECTIONS = {
+    "profile": (("profiles",), load_profile, Profile),
+    "experience": (("experiences",), load_experience, Experience),
+    "skills": (("skills",), load_skills, Skills),
+    "achievements": (("achievements",), load_achievements, Achievement),
+    "education": (("education",), load_education, Education),
+}
+
+def section_fields(name: str, fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    try:
+        return parse_fields(PORTFOLIO_SECTIONS[name][2], fields)
+    except InvalidFields as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def fetch_section(name: str, fields: Optional[Tuple[str, ...]] = None) -> ContentVersion:
+    """Current version of a content section (or a projection of it), loaded through content_cache"""
+    if snapshot_versions is not None and SNAPSHOT_MODE == 'serve':
+        return project_section(name, snapshot_versions[name], fields)
+    key, loader, _ = PORTFOLIO_SECTIONS[name]
+
+    async def load_version() -> ContentVersion:
+        value = await loader()
+        # Rendering and compression run once per version, off the event loop
+        version = await asyncio.to_thread(ContentVersion.render, value)
+        log_version(name, version)
+        return version
+
+    try:
+        version = await content_cache.get_or_load(key, load_version)
     except Exception as e:
-        logger.error(f"Error fetching profile: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+        if snapshot_versions is not None:
+            logger.warning(f"Serving {name} from snapshot, database read failed: {e}")
+            version = snapshot_versions[name]
+        else:
+            logger.error(f"Error fetching {name}: {e}")
+            raise HTTPException(status_code=500, detail="Internal server error")
+    return project_section(name, version, fields)
+
+def project_section(name: str, version: ContentVersion, fields: Optional[Tuple[str, ...]]) -> ContentVersion:
+    """Project a full section version onto ``fields`` in memory.
+
+    Projections are neither cached nor precompressed: every ``?fields=``
+    combination would otherwise be its own cache entry, and a projected body
+    is small enough to send as-is.
+    """
+    if fields is None:
+        return version
+    model = partial_model(PORTFOLIO_SECTIONS[name][2], fields)
+
+    def project(item: BaseModel) -> BaseModel:
+        return model.model_construct(**{field: getattr(item, field) for field in fields})
+
+    value = version.value
+    if value is not None:
+        value = [project(item) for item in value] if isinstance(value, list) else project(value)
+    return ContentVersion(render_json(value), value=value, encoded={})
+
+async def content_last_modified() -> Optional[datetime]:
+    """Last-Modified for all content is taken from Profile.updatedAt"""
+    profile = (await fetch_section("profile")).value
+    return profile.updatedAt if profile else None
+
+async def conditional_response(request: Request, version: ContentVersion) -> Response:
+    """Return 304 when the client's validators match, else the best pre-rendered variant"""
+    last_modified = await content_last_modified()
+    variant = version.select(request.headers.get("accept-encoding"))
+    headers = validator_headers(version.etag, last_modified, variant["encoding"])
+    if is_not_modified(request.headers, version.etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    if variant["encoding"]:
+        headers["Content-Encoding"] = variant["encoding"]
+    return Response(content=variant["content"], media_type="application/json", headers=headers)
+
+async def get_section(name: str, request: Request, fields: Optional[str], not_found: str) -> Response:
+    version = await fetch_section(name, section_fields(name, fields))
+    if version.value is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    return await conditional_response(request, version)
+
+
+@api_router.get("/profile", response_model=Profile)
+async def get_profile(request: Request, fields: Optional[str] = None):
+    return await get_section("profile", request, fields, "Profile not found")
 
 @api_router.get("/experience", response_model=List[Experience])
-async def get_experience():
-    try:
-        experiences = await db.experiences.find().sort("order", 1).to_list(100)
-        result = []
-        for exp in experiences:
-            if "_id" in exp:
-                exp["id"] = str(exp["_id"])
-                del exp["_id"]
-            result.append(Experience(**exp))
-        return result
-    except Exception as e:
-        logger.error(f"Error fetching experience: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+async def get_experience(
+    request: Request,
+    fields: Optional[str] = None,
+    technology: Optional[str] = Query(None, min_length=1, max_length=100),
+):
+    if technology is None:
+        return await get_section("experience", request, fields, "Experience not found")
+    if fields is not None:
+        raise HTTPException(status_code=400, detail="fields cannot be combined with technology")
+    version = (await technology_facets()).experiences(technology)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Technology not found")
+    return await conditional_response(request, version)
+
+@api_router.get("/technologies")
+async def get_technologies(request: Request):
+    """Every technology from skills and experiences, with the experiences that used it and years of use"""
+    return await conditional_response(request, (await technology_facets()).listing)
 
 @api_router.get("/skills", response_model=Skills)
-async def get_skills():
-    try:
-        skills = await db.skills.find_one()
-        if not skills:
-            raise HTTPException(status_code=404, detail="Skills not found")
-        
-        if "_id" in skills:
-            skills["id"] = str(skills["_id"])
-            del skills["_id"]
-        
-        return Skills(**skills)
-    except Exception as e:
-        logger.error(f"Error fetching skills: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+async def get_skills(request: Request, fields: Optional[str] = None):
+    return await get_section("skills", request, fields, "Skills not found")
 
 @api_router.get("/achievements", response_model=List[Achievement])
-async def get_achievements():
-    try:
-        achievements = await db.achievements.find().to_list(100)
-        result = []
-        for achievement in achievements:
-            if "_id" in achievement:
-                achievement["id"] = str(achievement["_id"])
-                del achievement["_id"]
-            result.append(Achievement(**achievement))
-        return result
-    except Exception as e:
-        logger.error(f"Error fetching achievements: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+async def get_achievements(request: Request, fields: Optional[str] = None):
+    return await get_section("achievements", request, fields, "Achievements not found")
 
 @api_router.get("/education", response_model=Education)
-async def get_education():
-    try:
-        education = await db.education.find_one()
-        if not education:
-            raise HTTPException(status_code=404, detail="Education not found")
-        
-        if "_id" in education:
-            education["id"] = str(education["_id"])
-            del education["_id"]
-        
-        return Education(**education)
+async def get_education(request: Request, fields: Optional[str] = None):
+    return await get_section("education", request, fields, "Education not found")
+
+def parse_include(include: Optional[str]) -> List[str]:
+    """Parse a comma separated section selector, defaulting to every section"""
+    if not include:
+        return list(PORTFOLIO_SECTIONS)
+    sections = [name.strip() for name in include.split(",") if name.strip()]
+    unknown = [name for name in sections if name not in PORTFOLIO_SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(unknown)}")
+    return list(dict.fromkeys(sections))
+
+async def fetch_bundle(sections: List[str]) -> ContentVersion:
+    versions = await asyncio.gather(*(fetch_section(name) for name in sections))
+    etag = combine_etags(version.etag for version in versions)
+
+    async def load_bundle() -> ContentVersion:
+        # Splice the already-rendered section bodies instead of re-serializing them
+        body = b"{" + b",".join(
+            b'"' + name.encode() + b'":' + version.body for name, version in zip(sections, versions)
+        ) + b"}"
+        bundle = await asyncio.to_thread(ContentVersion, body, None, etag)
+        log_version(f"portfolio[{','.join(sections)}]", bundle)
+        return bundle
+
+    # Keyed by the combined ETag, so a content change simply misses and old bundles age out
+    return await content_cache.get_or_load(("portfolio", etag), load_bundle)
+
+SEARCH_SECTIONS = ("profile", "experience", "achievements", "education")
+
+async def search_index() -> SearchIndex:
+    """Search index over the current content, rebuilt whenever a section's ETag changes"""
+    versions = [await fetch_section(name) for name in SEARCH_SECTIONS]
+    etag = combine_etags(version.etag for version in versions)
+
+    async def build_index() -> SearchIndex:
+        values = [version.value for version in versions]
+        index = await asyncio.to_thread(lambda: SearchIndex(portfolio_documents(*values)))
+        logger.info(f"Search index built: {len(index.documents)} documents, {len(index.terms)} terms")
+        return index
+
+    return await content_cache.get_or_load(("search", etag), build_index)
+
+async def technology_facets() -> TechnologyFacets:
+    """Technology facet index, rebuilt whenever skills or experience change"""
+    skills, experience = await fetch_section("skills"), await fetch_section("experience")
+    etag = combine_etags((skills.etag, experience.etag))
+
+    async def build_facets() -> TechnologyFacets:
+        facets = await asyncio.to_thread(TechnologyFacets, skills.value, experience.value)
+        logger.info(f"Technology facets built: {len(facets.technologies)} technologies")
+        return facets
+
+    return await content_cache.get_or_load(("facets", etag), build_facets)
+
+async def render_snapshot_versions() -> Dict[str, ContentVersion]:
+    """Every content GET endpoint rendered from the database, keyed by route name"""
+    names = list(PORTFOLIO_SECTIONS)
+    versions = dict(zip(names, await asyncio.gather(*(fetch_section(name) for name in names))))
+    versions["portfolio"] = await fetch_bundle(names)
+    return versions
+
+def load_snapshot(directory: Path) -> Dict[str, ContentVersion]:
+    manifest, versions = read_snapshot(directory)
+    # Rebuild the section models once so Last-Modified and ?fields= work as with the database
+    bundle = PortfolioBundle.model_validate_json(versions["portfolio"].body)
+    for name in PORTFOLIO_SECTIONS:
+        versions[name].value = getattr(bundle, name)
+    logger.info(f"Loaded snapshot {manifest['version']} built {manifest['builtAt']} ({SNAPSHOT_MODE} mode)")
+    return versions
+
+@api_router.get("/portfolio", response_model=PortfolioBundle)
+async def get_portfolio(request: Request, include: Optional[str] = None):
+    """All content sections in one response, fetched concurrently"""
+    bundle = await fetch_bundle(parse_include(include))
+    return await conditional_response(request, bundle)
+
+def client_ip(request: Request) -> str:
+    if TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+def token_matches(presented: Optional[str], expected: Optional[str]) -> bool:
+    """Constant-time check; an unset ``expected`` token disables the endpoint"""
+    return bool(expected and presented and hmac.compare_digest(presented.encode(), expected.encode()))
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    if not token_matches(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="This endpoint requires a valid X-Admin-Token")
+
+def require_profile_token(request: Request):
+    """Stored request profiles need the profiler's PROFILE_TOKEN"""
+    if not token_matches(request.headers.get("x-profile-token"), PROFILE_TOKEN):
+        raise HTTPException(status_code=403, detail="This endpoint requires a valid X-Profile-Token")
+
+async def admit_contact(request: Request):
+    """Shed submissions over the per-client or global rate, or past the in-flight cap"""
+    rejection = contact_admission.acquire(client_ip(request))
+    if rejection is not None:
+        raise HTTPException(
+            status_code=rejection.status,
+            detail=rejection.detail,
+            headers={"Retry-After": str(rejection.retry_after)},
+        )
+    try:
+        yield
+    finally:
+        contact_admission.release()
+
+def contact_response(contact_id: str) -> Dict[str, Any]:
+    return {
+        "success": True,
+        "message": "Thank you for your message! I'll get back to you within 24 hours.",
+        "id": contact_id
+    }
+
+async def store_contact(contact_data: ContactForm) -> Dict[str, Any]:
+    """Queue a new submission, or answer with the original id for a repeat within the dedup window"""
+    digest = content_hash(contact_data.email, contact_data.subject, contact_data.message)
+    original = recent_submissions.original(digest)
+    if original is not None:
+        return contact_response(original)
+
+    contact_entry = ContactEntry(**contact_data.dict())
+    document = contact_entry.dict()
+    document["dedupKey"] = dedup_key(digest, time.time(), recent_submissions.window)
+    # Remember before awaiting so a concurrent double-click already sees it
+    recent_submissions.remember(digest, contact_entry.id)
+    try:
+        # Never awaits storage: a repeat that misses in memory (e.g. after a restart) is
+        # dropped by the flusher on the unique dedupKey index instead
+        await contact_writer.submit(document)
+    except Exception:
+        recent_submissions.forget(digest)
+        raise
+    return contact_response(contact_entry.id)
+
+def remember_stored_original(document: Dict[str, Any], original_id: str) -> None:
+    """The flusher dropped ``document`` for the stored ``original_id``; answer further repeats with that id"""
+    recent_submissions.remember(dedup_digest(document["dedupKey"]), original_id)
+
+@api_router.get("/search")
+async def search_content(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """Full-text search over experiences, the about section, achievements and education subjects.
+
+    Snippets are HTML-escaped with matches wrapped in <mark>.
+    """
+    try:
+        index = await search_index()
     except Exception as e:
-        logger.error(f"Error fetching education: {e}")
+        logger.error(f"Error building search index: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+    return index.search(q, limit)
 
-@api_router.post("/contact")
-async def submit_contact(contact_data: ContactForm):
-    try:
-        contact_entry = ContactEntry(**contact_data.dict())
-        await db.contacts.insert_one(contact_entry.dict())
-        
-        return {
-            "success": True,
-            "message": "Thank you for your message! I'll get back to you within 24 hours.",
-            "id": contact_entry.id
-        }
+@api_router.post("/contact", dependencies=[Depends(admit_contact)])
+async def submit_contact(
+    contact_data: ContactForm,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+):
+    try:
+        if idempotency_key is None:
+            return await store_contact(contact_data)
+        request_fingerprint = fingerprint(
+            contact_data.name, contact_data.email, contact_data.company, contact_data.subject, contact_data.message
+        )
+        result, replayed = await idempotency_store.run(
+            idempotency_key, request_fingerprint, lambda: store_contact(contact_data)
+        )
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
+        return result
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         logger.error(f"Error submitting contact form: {e}")
         raise HTTPException(status_code=500, detail="Failed to submit contact form")
 
 @api_router.get("/contacts", response_model=List[ContactEntry])
-async def get_contacts():
-    """Admin endpoint to retrieve all contact submissions"""
-    try:
-        contacts = await db.contacts.find().sort("createdAt", -1).to_list(100)
-        result = []
-        for contact in contacts:
-            if "_id" in contact:
-                contact["id"] = str(contact["_id"])
-                del contact["_id"]
-            result.append(ContactEntry(**contact))
-        return result
+async def get_contacts(
+    limit: int = Query(100, ge=1, le=CONTACTS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    fields: Optional[str] = None,
+):
+    """Admin endpoint to page through contact submissions, newest first.
+
+    The next page's cursor is returned in the X-Next-Cursor header (absent on the last page).
+    """
+    try:
+        query = contact_query(status, created_after, created_before, cursor)
+        selected = parse_fields(ContactEntry, fields)
+    except (InvalidCursor, InvalidFields) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        # Fetch one extra row to learn whether another page exists; rows always carry
+        # the sort keys so the next cursor can be built
+        contacts = await repositories.contacts.find_page(query, limit + 1, selected)
+        has_more = len(contacts) > limit
+        contacts = contacts[:limit]
+        next_cursor = encode_cursor(contacts[-1]["createdAt"], contacts[-1]["id"]) if has_more else None
+        model = partial_model(ContactEntry, selected)
+        result = [build_model(model, contact) for contact in contacts]
     except Exception as e:
         logger.error(f"Error fetching contacts: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+    headers = {}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return Response(content=render_json(result), media_type="application/json", headers=headers)
+
+async def export_lines(query, batch_size: int, selected: Optional[Tuple[str, ...]]) -> AsyncIterator[bytes]:
+    """NDJSON chunks, one per cursor batch, so memory stays at one batch however large the export"""
+    model = partial_model(ContactEntry, selected)
+    exported = 0
+    started = time.perf_counter()
+    try:
+        async for batch in repositories.contacts.stream(query, batch_size, selected):
+            yield b"".join(render_json(build_model(model, contact)) + b"\n" for contact in batch)
+            exported += len(batch)
+            contacts_exported.inc(amount=len(batch))
+    except Exception as e:
+        # The status line has gone out already; the client sees a short export and resumes after its last row
+        logger.error(f"Contact export failed after {exported} rows: {e}")
+        raise
+    logger.info(f"Exported {exported} contacts in {time.perf_counter() - started:.2f}s")
+
+@api_router.get("/contacts/export", dependencies=[Depends(require_admin_token)])
+async def export_contacts(
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    after_created_at: Optional[datetime] = None,
+    after_id: Optional[str] = None,
+    fields: Optional[str] = None,
+    batch_size: int = Query(CONTACTS_EXPORT_BATCH_SIZE, ge=10, le=10000),
+):
+    """Admin endpoint streaming every matching contact as NDJSON, newest first.
+
+    To resume an interrupted export pass the last row received as
+    ``after_created_at`` and ``after_id`` (or a /contacts page ``cursor``).
+    """
+    if (after_created_at is None) != (after_id is None):
+        raise HTTPException(status_code=400, detail="after_created_at and after_id must be given together")
+    if cursor is not None and after_id is not None:
+        raise HTTPException(status_code=400, detail="Pass either cursor or after_created_at/after_id")
+    try:
+        query = contact_query(status, created_after, created_before, cursor)
+        selected = parse_fields(ContactEntry, fields)
+    except (InvalidCursor, InvalidFields) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if after_id is not None:
+        query = query._replace(after=(naive_utc(after_created_at), after_id))
+    return StreamingResponse(
+        export_lines(query, batch_size, selected),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="contacts.ndjson"'},
+    )
+
+@api_router.patch("/contacts", dependencies=[Depends(require_admin_token)])
+async def update_contact_statuses(update: ContactStatusUpdate):
+    """Admin endpoint moving contacts along new -> read -> replied.
+
+    With ``ids`` every id gets an outcome (updated, unchanged, invalid_transition,
+    not_found or conflict); with ``filter`` only the number updated is returned.
+    An empty filter matches every contact and is refused unless ``all`` is set.
+    Either way the change is a single update_many, after at most one read.
+    Submissions still waiting in the write-behind queue are not found yet.
+    """
+    if update.ids is not None and (update.filter is not None or update.all):
+        raise HTTPException(status_code=400, detail="Pass either ids or a filter, not both")
+    criteria = update.filter or ContactStatusFilter()
+    if update.ids is None and not update.all and all(value is None for value in criteria.model_dump().values()):
+        raise HTTPException(status_code=400, detail='An empty filter matches every contact; pass "all": true to update them all')
+    sources = TRANSITIONS[update.status]
+    now = datetime.utcnow()
+    # Mongo and SQLite keep milliseconds; the memory backend stores the same value
+    now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+    # Written with the change so a re-read can tell this request's updates from concurrent ones
+    update_id = uuid.uuid4().hex
+    contacts = repositories.contacts
+    try:
+        if update.ids is None:
+            query = contact_query(criteria.status, criteria.createdAfter, criteria.createdBefore)
+            updated = await contacts.update_status(query, sources, update.status, now, update_id) if sources else 0
+            result = {"status": update.status, "updated": updated}
+        else:
+            ids = tuple(dict.fromkeys(update.ids))
+            current = await contacts.find_page(ContactQuery(ids=ids), len(ids), ("status",))
+            plan = plan_transition(ids, {c["id"]: c["status"] for c in current}, update.status)
+            updated = 0
+            if plan.to_update:
+                updated = await contacts.update_status(ContactQuery(ids=tuple(plan.to_update)), sources, update.status, now, update_id)
+            if updated < len(plan.to_update):
+                # Someone else moved some of them in between; find out which
+                after = await contacts.find_page(ContactQuery(ids=tuple(plan.to_update)), len(plan.to_update), ("statusUpdateId",))
+                for contact in after:
+                    if contact.get("statusUpdateId") != update_id:
+                        plan.outcomes[contact["id"]]["outcome"] = CONFLICT
+            counts: Dict[str, int] = {}
+            for outcome in plan.outcomes.values():
+                counts[outcome["outcome"]] = counts.get(outcome["outcome"], 0) + 1
+            result = {
+                "status": update.status,
+                "updated": counts.get(UPDATED, 0),
+                "outcomes": counts,
+                "results": [{"id": contact_id, **outcome} for contact_id, outcome in plan.outcomes.items()],
+            }
+    except Exception as e:
+        logger.error(f"Error updating contact statuses: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    if result["updated"]:
+        contact_stats.invalidate()
+    return result
+
+@api_router.get("/contacts/stats", dependencies=[Depends(require_admin_token)])
+async def get_contact_stats(
+    days: int = Query(30, ge=1, le=3660),
+    weeks: int = Query(26, ge=1, le=520),
+    months: int = Query(24, ge=1, le=120),
+    refresh: bool = False,
+):
+    """Admin endpoint with submissions per day/week/month (latest periods only), counts by status,
+    top sender domains and the age of the unanswered backlog.
+
+    Served from a snapshot refreshed every CONTACT_STATS_TTL_SECONDS; ``refresh=true``
+    re-aggregates everything, including closed days.
+    """
+    try:
+        snapshot = await contact_stats.get(repositories.contacts, force=refresh)
+    except Exception as e:
+        logger.error(f"Error computing contact stats: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    return {
+        **snapshot,
+        "days": series(snapshot["days"], days),
+        "weeks": series(snapshot["weeks"], weeks),
+        "months": series(snapshot["months"], months),
+    }
+
+@api_router.post("/contacts/exports", status_code=202, dependencies=[Depends(require_admin_token)])
+async def start_contact_export(
+    response: Response,
+    format: str = Query("parquet", pattern="^(parquet|csv)$"),
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    fields: Optional[str] = None,
+):
+    """Admin endpoint starting a background export of the matching contacts to Parquet or gzipped CSV"""
+    try:
+        query = contact_query(status, created_after, created_before)
+        selected = parse_fields(ContactEntry, fields)
+    except InvalidFields as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    columns = selected or tuple(ContactEntry.model_fields)
+    filters = {"status": status, "createdAfter": created_after, "createdBefore": created_before}
+    try:
+        job = export_manager.start(
+            lambda batch_size: repositories.contacts.stream(query, batch_size, columns), format, columns, filters
+        )
+    except ExportUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except ExportQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    response.headers["Location"] = f"/api/contacts/exports/{job.id}"
+    return job.to_dict()
+
+@api_router.get("/contacts/exports", dependencies=[Depends(require_admin_token)])
+async def list_contact_exports():
+    """Admin endpoint listing recent export jobs, newest first"""
+    return export_manager.list()
+
+@api_router.get("/contacts/exports/{job_id}", dependencies=[Depends(require_admin_token)])
+async def get_contact_export(job_id: str):
+    """Progress and throughput of one export job"""
+    job = export_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export not found")
+    return job.to_dict()
+
+@api_router.get("/contacts/exports/{job_id}/download", dependencies=[Depends(require_admin_token)])
+async def download_contact_export(job_id: str):
+    job = export_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export not found")
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Export is {job.status}")
+    return FileResponse(job.path, filename=job.path.name, media_type="application/octet-stream")
+
+@api_router.get("/contacts/queue", dependencies=[Depends(require_admin_token)])
+async def get_contact_queue_stats():
+    """Admin endpoint exposing the contact write-behind queue, admission control and dedup counters"""
+    return {
+        **contact_writer.stats(),
+        "admission": contact_admission.stats(),
+        "idempotency": idempotency_store.stats(),
+        "dedup": recent_submissions.stats(),
+    }
+
+@api_router.get("/indexes", dependencies=[Depends(require_admin_token)])
+async def get_index_report(explain: bool = False):
+    """Admin endpoint reporting index drift against the registry (and collection scans)"""
+    if repositories.backend != "mongo":
+        raise HTTPException(status_code=400, detail="The index registry applies to the mongo backend only")
+    try:
+        report = await reconcile_indexes(repositories.db, apply=False)
+        if explain:
+            report["collscans"] = await find_collection_scans(repositories.db)
+        return report
+    except Exception as e:
+        logger.error(f"Error checking indexes: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@api_router.get("/db/pool", dependencies=[Depends(require_admin_token)])
+async def get_pool_stats():
+    """Admin endpoint exposing MongoDB connection pool counters and settings"""
+    if repositories.backend != "mongo":
+        raise HTTPException(status_code=400, detail="Connection pool stats apply to the mongo backend only")
+    return {**repositories.pool_stats.snapshot(), "options": repositories.options}
+
+@api_router.get("/cache/stats", dependencies=[Depends(require_admin_token)])
+async def get_cache_stats():
+    """Admin endpoint exposing content cache hit/miss counters"""
+    return content_cache.stats()
+
+@api_router.get("/metrics")
+async def get_metrics():
+    """Prometheus scrape endpoint"""
+    return Response(content=metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+def runtime_metrics():
+    """Scrape-time gauges for state owned by the cache, the contact queue and the pool"""
+    cache = content_cache.stats()
+    yield "content_cache_lookups_total", "counter", "Content cache lookups by result", [
+        ("content_cache_lookups_total", {"result": "hit"}, cache["hits"]),
+        ("content_cache_lookups_total", {"result": "miss"}, cache["misses"]),
+    ]
+    yield "content_cache_entries", "gauge", "Entries in the content cache", [
+        ("content_cache_entries", {}, cache["entries"]),
+    ]
+    queue = contact_writer.stats()
+    yield "contact_admission_in_flight", "gauge", "Contact submissions currently admitted", [
+        ("contact_admission_in_flight", {}, contact_admission.in_flight),
+    ]
+    yield "contact_queue_depth", "gauge", "Contact submissions waiting to be written", [
+        ("contact_queue_depth", {}, queue["depth"]),
+    ]
+    yield "contact_queue_written_total", "counter", "Contact submissions written to storage", [
+        ("contact_queue_written_total", {}, queue["written"]),
+    ]
+    yield "contact_queue_spilled_total", "counter", "Contact submissions spilled to the spool journal", [
+        ("contact_queue_spilled_total", {}, queue["spilled"]),
+    ]
+    if repositories.backend == "mongo":
+        pool = repositories.pool_stats.snapshot()
+        yield "mongodb_pool_connections", "gauge", "MongoDB pool connections by state", [
+            ("mongodb_pool_connections", {"state": "open"}, pool["open"]),
+            ("mongodb_pool_connections", {"state": "in_use"}, pool["inUse"]),
+        ]
+
+metrics_registry.add_collector(runtime_metrics)
+
+@api_router.get("/profiles")
+async def list_profiles(request: Request, limit: int = Query(50, ge=1, le=500)):
+    """Admin endpoint listing stored request profiles, newest first"""
+    require_profile_token(request)
+    return await asyncio.to_thread(profile_store.list, limit)
+
+@api_router.get("/profiles/{profile_id}")
+async def get_request_profile(profile_id: str, request: Request):
+    """Collapsed stacks for one profile (feed to flamegraph.pl or speedscope)"""
+    require_profile_token(request)
+    collapsed = await asyncio.to_thread(profile_store.load, profile_id)
+    if collapsed is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return Response(content=collapsed, media_type="text/plain")
+
+@api_router.post("/cache/invalidate", dependencies=[Depends(require_admin_token)])
+async def invalidate_cache(collection: Optional[str] = None):
+    """Admin endpoint to drop cached content after re-seeding"""
+    if collection is not None and collection not in CONTENT_COLLECTIONS:
+        raise HTTPException(status_code=400, detail=f"Unknown collection: {collection}")
+    removed = content_cache.invalidate(collection)
+    return {"success": True, "collection": collection or "all", "removed": removed}
 
 
 # Include the router in the main app
@@ -229,8 +909,21 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+app.add_middleware(
+    ProfilingMiddleware,
+    profiler=StackSampler(interval=float(os.environ.get('PROFILE_INTERVAL_MS', 5)) / 1000),
+    store=profile_store,
+    token=PROFILE_TOKEN,
+    sample_rate=float(os.environ.get('PROFILE_SAMPLE_RATE', 0)),
+    captured=metrics_registry.counter("request_profiles_total", "Profiled requests by trigger", ("trigger",)),
+)
+
+# Outermost, so CORS preflights and errors are counted too
+app.add_middleware(MetricsMiddleware, metrics=request_metrics)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -238,6 +931,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
+async def warm_derived_indexes():
+    """Build the content-derived indexes before the first request needs them"""
+    try:
+        await search_index()
+        await technology_facets()
+    except Exception as e:
+        logger.error(f"Error warming derived indexes: {e}")
+
+async def reconcile_startup_indexes():
+    try:
+        await repositories.ensure_indexes()
+    except Exception as e:
+        logger.error(f"Error reconciling indexes: {e}")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Static snapshot of the content API
+Renders every content GET endpoint into versioned JSON files with gzip/brotli
+siblings and a manifest, so the content can be served without MongoDB (by the
+app with SNAPSHOT_DIR set, or by a CDN / sendfile straight from disk).
+
+    python snapshot.py --out snapshots
+
+Layout:
+    snapshots/CURRENT                       name of the active version
+    snapshots/<version>/manifest.json
+    snapshots/<version>/profile.json{,.gz,.br}
+    ...
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+from http_cache import ContentVersion, combine_etags
+
+ENCODING_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+
+def write_snapshot(out_dir: Path, versions: Dict[str, ContentVersion], built_at: datetime) -> Path:
+    """Write ``versions`` (section name -> version) and point CURRENT at them atomically"""
+    out_dir = Path(out_dir)
+    version_id = combine_etags(versions[name].etag for name in sorted(versions)).strip('"')[:16]
+    target = out_dir / version_id
+    staging = out_dir / f".{version_id}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+
+    files: Dict[str, Any] = {}
+    for name, version in versions.items():
+        filename = f"{name}.json"
+        (staging / filename).write_bytes(version.body)
+        encodings = {}
+        for encoding, data in version.encoded.items():
+            encoded_name = filename + ENCODING_SUFFIXES[encoding]
+            (staging / encoded_name).write_bytes(data)
+            encodings[encoding] = {"file": encoded_name, "bytes": len(data)}
+        files[name] = {
+            "route": f"/api/{name}",
+            "file": filename,
+            "etag": version.etag,
+            "bytes": len(version.body),
+            "encodings": encodings,
+        }
+
+    manifest = {"version": version_id, "builtAt": built_at.isoformat(), "files": files}
+    (staging / "manifest.json").write_text(json.dumps(manifest, indent=2))
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(staging, target)
+    current = out_dir / ".CURRENT.tmp"
+    current.write_text(version_id)
+    os.replace(current, out_dir / "CURRENT")
+    return target
+
+
+def read_snapshot(out_dir: Path) -> Tuple[Dict[str, Any], Dict[str, ContentVersion]]:
+    """Load the CURRENT snapshot as (manifest, section name -> ContentVersion without values)"""
+    out_dir = Path(out_dir)
+    directory = out_dir / (out_dir / "CURRENT").read_text().strip()
+    manifest = json.loads((directory / "manifest.json").read_text())
+    versions = {}
+    for name, entry in manifest["files"].items():
+        encoded = {
+            encoding: (directory / variant["file"]).read_bytes()
+            for encoding, variant in entry["encodings"].items()
+        }
+        versions[name] = ContentVersion(
+            (directory / entry["file"]).read_bytes(), etag=entry["etag"], encoded=encoded
+        )
+    return manifest, versions
+
+
+async def main(out_dir: Path):
+    import server
+
+    await server.repositories.connect()
+    try:
+        versions = await server.render_snapshot_versions()
+    finally:
+        await server.repositories.close()
+    target = write_snapshot(out_dir, versions, datetime.utcnow())
+    for name, version in versions.items():
+        print(f"{name:<13} {len(version.body):>7} bytes  {version.etag}")
+    print(f"Snapshot written to {target}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the content API as static files")
+    parser.add_argument("--out", type=Path, default=Path(__file__).parent / "snapshots")
+    args = parser.parse_args()
+    asyncio.run(main(args.out))
@@ -0,0 +1,234 @@
+"""
+Write-behind pipeline for contact submissions
+Entries are acknowledged once they are in the bounded in-memory queue (or,
+when the queue is full or Mongo is unreachable, in the local spool journal).
+A background task flushes the queue with insert_many and replays the
+journal once the database accepts writes again.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from bson import json_util
+
+from repositories import DuplicateContact
+
+logger = logging.getLogger(__name__)
+
+
+class SpoolJournal:
+    """Append-only JSON-lines journal of documents that could not be written yet"""
+
+    def __init__(self, path: Path, fsync: bool = True):
+        self.path = Path(path)
+        self.replay_path = self.path.with_suffix(self.path.suffix + ".replaying")
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def append(self, documents: List[Dict[str, Any]]) -> None:
+        lines = "".join(json_util.dumps(document) + "\n" for document in documents)
+        with self._lock, open(self.path, "a", encoding="utf-8") as journal:
+            journal.write(lines)
+            journal.flush()
+            if self.fsync:
+                os.fsync(journal.fileno())
+
+    def pending(self) -> bool:
+        return self.replay_path.exists() or (self.path.exists() and self.path.stat().st_size > 0)
+
+    def claim(self) -> Optional[Path]:
+        """Move the journal aside for replay so new spills start a fresh file.
+
+        A ``.replaying`` file left behind by an interrupted replay is claimed first.
+        """
+        with self._lock:
+            if not self.replay_path.exists():
+                if not self.path.exists() or self.path.stat().st_size == 0:
+                    return None
+                os.replace(self.path, self.replay_path)
+            return self.replay_path
+
+    @staticmethod
+    def read_batches(path: Path, batch_size: int):
+        batch = []
+        with open(path, encoding="utf-8") as journal:
+            for line in journal:
+                if line.strip():
+                    batch.append(json_util.loads(line))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+
+class WriteBehindQueue:
+    """Bounded queue flushed to a ContactRepository in batches by a background task"""
+
+    def __init__(
+        self,
+        repository,
+        journal: SpoolJournal,
+        max_size: int = 1000,
+        batch_size: int = 100,
+        flush_interval: float = 0.05,
+        retry_interval: float = 5.0,
+        on_duplicate: Optional[Callable[[Dict[str, Any], str], None]] = None,
+    ):
+        self.repository = repository
+        # Called with a dropped document and the id of the stored contact holding its dedupKey
+        self.on_duplicate = on_duplicate
+        self.journal = journal
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+        self._queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_size)
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._idle = False
+        self.queued = 0
+        self.written = 0
+        self.spilled = 0
+        self.replayed = 0
+        self.failed_flushes = 0
+        self.duplicates = 0
+
+    async def submit(self, document: Dict[str, Any]) -> str:
+        """Queue ``document``; returns "queued" or "spooled" once it is safe to acknowledge"""
+        try:
+            self._queue.put_nowait(document)
+            self.queued += 1
+            return "queued"
+        except asyncio.QueueFull:
+            await asyncio.to_thread(self.journal.append, [document])
+            self.spilled += 1
+            return "spooled"
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="contact-write-behind")
+
+    async def stop(self) -> None:
+        """Stop the flusher, then write (or spool) whatever is still queued"""
+        self._stopping = True
+        if self._task is not None:
+            # Only interrupt the flusher while it waits; an in-flight batch is allowed to finish
+            if self._idle:
+                self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while not self._queue.empty():
+            await self._flush(self._drain(self.batch_size))
+
+    def _drain(self, limit: int) -> List[Dict[str, Any]]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        if self.journal.pending():
+            await self._replay()
+        while not self._stopping:
+            self._idle = True
+            try:
+                batch = [await asyncio.wait_for(self._queue.get(), timeout=self.retry_interval)]
+            except asyncio.TimeoutError:
+                self._idle = False
+                # Idle: retry a journal left behind by an earlier outage
+                if self.journal.pending():
+                    await self._replay()
+                continue
+            self._idle = False
+            # Linger briefly so bursts are written as one insert_many
+            await asyncio.sleep(self.flush_interval)
+            batch.extend(self._drain(self.batch_size - 1))
+            if await self._flush(batch) and self.journal.pending():
+                await self._replay()
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> bool:
+        if not batch:
+            return True
+        try:
+            await self.repository.insert_many(batch)
+            self.written += len(batch)
+            return True
+        except DuplicateContact as e:
+            # Already stored (same id or same content within the dedup window): nothing to retry
+            self.written += len(batch) - len(e.documents)
+            await self._dropped(e)
+            return True
+        except Exception as e:
+            self.failed_flushes += 1
+            logger.warning(f"Contact flush failed, spooling {len(batch)} entries: {e}")
+            await asyncio.to_thread(self.journal.append, batch)
+            self.spilled += len(batch)
+            return False
+
+    async def _replay(self) -> None:
+        """Insert spooled entries whose id is not stored yet, so a replay interrupted midway is safe to repeat.
+
+        Entries already stored are left alone: a status changed since must not be reverted.
+        """
+        path = await asyncio.to_thread(self.journal.claim)
+        if path is None:
+            return
+        batches = SpoolJournal.read_batches(path, self.batch_size)
+        try:
+            while True:
+                # Parse the journal off the event loop; after a long outage it can be large
+                batch = await asyncio.to_thread(next, batches, None)
+                if batch is None:
+                    break
+                try:
+                    await self.repository.upsert_many(batch)
+                    self.replayed += len(batch)
+                except DuplicateContact as e:
+                    self.replayed += len(batch) - len(e.documents)
+                    await self._dropped(e)
+        except Exception as e:
+            logger.warning(f"Contact journal replay failed, retrying in {self.retry_interval}s: {e}")
+            await asyncio.sleep(self.retry_interval)
+            return
+        finally:
+            batches.close()
+        path.unlink()
+        logger.info(f"Replayed contact journal ({self.replayed} entries so far)")
+
+    async def _dropped(self, error: DuplicateContact) -> None:
+        self.duplicates += len(error.documents)
+        logger.info(f"Dropped {len(error.documents)} duplicate contact submissions")
+        if self.on_duplicate is None:
+            return
+        # Look up who holds each dedupKey here rather than on the submit path, which must not wait on storage
+        for document in error.documents:
+            if document.get("dedupKey") is None:
+                continue
+            try:
+                original = await self.repository.dedup_owner(document["dedupKey"])
+            except Exception as e:
+                logger.warning(f"Dedup owner lookup failed: {e}")
+                return
+            if original is not None and original != document["id"]:
+                self.on_duplicate(document, original)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self._queue.qsize(),
+            "maxSize": self._queue.maxsize,
+            "queued": self.queued,
+            "written": self.written,
+            "spilled": self.spilled,
+            "replayed": self.replayed,
+            "failedFlushes": self.failed_flushes,
+            "duplicates": self.duplicates,
+            "journalPending": self.journal.pending(),
+        }
@@ -12,6 +12,19 @@ const api = axios.create({
   },
 });
 
+// crypto.randomUUID only exists in secure contexts (HTTPS, localhost);
+// getRandomValues is available everywhere, so build a v4 UUID from it there
+const newIdempotencyKey = () => {
+  if (typeof crypto.randomUUID === 'function') {
+    return crypto.randomUUID();
+  }
+  const bytes = crypto.getRandomValues(new Uint8Array(16));
+  bytes[6] = (bytes[6] & 0x0f) | 0x40; // version 4
+  bytes[8] = (bytes[8] & 0x3f) | 0x80; // RFC 4122 variant
+  const hex = Array.from(bytes, (byte) => byte.toString(16).padStart(2, '0')).join('');
+  return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+};
+
 // Add request interceptor for logging
 api.interceptors.request.use(
   (config) => {
@@ -38,6 +51,18 @@ api.interceptors.response.use(
 
 // API service functions
 export const portfolioApi = {
+  // Get several content sections in a single request, e.g. ['profile', 'skills']
+  getPortfolio: async (sections) => {
+    try {
+      const params = sections?.length ? { include: sections.join(',') } : undefined;
+      const response = await api.get('/portfolio', { params });
+      return response.data;
+    } catch (error) {
+      console.error('Error fetching portfolio:', error);
+      throw new Error('Failed to fetch portfolio data');
+    }
+  },
+
   // Get complete profile information
   getProfile: async () => {
     try {
@@ -94,9 +119,12 @@ export const portfolioApi = {
   },
 
   // Submit contact form
-  submitContact: async (contactData) => {
+  // Reuse the same idempotencyKey when retrying one submission so it is stored only once
+  submitContact: async (contactData, idempotencyKey = newIdempotencyKey()) => {
     try {
-      const response = await api.post('/contact', contactData);
+      const response = await api.post('/contact', contactData, {
+        headers: { 'Idempotency-Key': idempotencyKey },
+      });
       return response.data;
     } catch (error) {
       console.error('Error submitting contact form:', error);
@@ -104,10 +132,11 @@ export const portfolioApi = {
     }
   },
 
-  // Get all contact submissions (admin endpoint)
-  getContacts: async () => {
+  // Get a page of contact submissions (admin endpoint)
+  // params: { limit, cursor, status, created_after, created_before }
+  getContacts: async (params) => {
     try {
-      const response = await api.get('/contacts');
+      const response = await api.get('/contacts', { params });
       return response.data;
     } catch (error) {
       console.error('Error fetching contacts:', error);
@@ -115,6 +144,17 @@ export const portfolioApi = {
     }
   },
 
+  // Get a page of contacts plus the cursor for the next page (null on the last page)
+  getContactsPage: async (params) => {
+    try {
+      const response = await api.get('/contacts', { params });
+      return { items: response.data, nextCursor: response.headers['x-next-cursor'] || null };
+    } catch (error) {
+      console.error('Error fetching contacts:', error);
+      throw new Error('Failed to fetch contacts');
+    }
+  },
+
   // Health check endpoint
   healthCheck: async () => {
     try {
@@ -0,0 +1,74 @@
+import pytest
+
+from admission import AdmissionController, TokenBucket
+
+
+def controller(clock, **overrides):
+    settings = dict(ip_rate=1, ip_burst=2, global_rate=10, global_burst=10, max_in_flight=10, clock=clock)
+    settings.update(overrides)
+    return AdmissionController(**settings)
+
+
+def test_bucket_starts_full_and_drains():
+    bucket = TokenBucket(rate=1, burst=3, now=0)
+    assert [bucket.take(0) for _ in range(4)] == [True, True, True, False]
+
+
+def test_bucket_refills_at_rate_up_to_burst():
+    bucket = TokenBucket(rate=2, burst=3, now=0)
+    for _ in range(3):
+        bucket.take(0)
+    assert bucket.take(0.5)  # one token back after half a second
+    assert not bucket.take(0.5)
+    bucket.refill(100)
+    assert bucket.tokens == 3
+
+
+def test_bucket_retry_after_and_full_at():
+    bucket = TokenBucket(rate=0.5, burst=2, now=0)
+    bucket.take(0)
+    bucket.take(0)
+    assert bucket.retry_after() == 2
+    assert bucket.full_at() == pytest.approx(4)
+    bucket.refill(1.5)
+    assert bucket.retry_after() == 1  # never below one second
+
+
+def test_client_rate_limit_is_per_client(clock):
+    admission = controller(clock)
+    for _ in range(2):
+        assert admission.acquire("a") is None
+    rejection = admission.acquire("a")
+    assert (rejection.status, rejection.reason, rejection.retry_after) == (429, "client_rate", 1)
+    assert admission.acquire("b") is None
+    clock.now += 1
+    assert admission.acquire("a") is None
+
+
+def test_global_rate_limit_returns_the_client_token(clock):
+    admission = controller(clock, ip_burst=5, global_rate=1, global_burst=1)
+    assert admission.acquire("a") is None
+    rejection = admission.acquire("b")
+    assert (rejection.status, rejection.reason) == (503, "global_rate")
+    assert admission._clients["b"].tokens == 5
+
+
+def test_concurrency_cap_until_release(clock):
+    admission = controller(clock, ip_burst=10, max_in_flight=2)
+    assert admission.acquire("a") is None
+    assert admission.acquire("a") is None
+    assert admission.acquire("a").reason == "concurrency"
+    admission.release()
+    assert admission.acquire("a") is None
+    assert admission.stats()["rejected"] == {"concurrency": 1}
+
+
+def test_refilled_and_excess_clients_are_forgotten(clock):
+    admission = controller(clock, max_clients=2)
+    for client in ("a", "b", "c"):
+        admission.acquire(client)
+        admission.release()
+    assert list(admission._clients) == ["b", "c"]
+    clock.now += 10  # every bucket is full again
+    admission.acquire("d")
+    assert list(admission._clients) == ["d"]
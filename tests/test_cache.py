@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from cache import ContentCache, ttls_from_env
+
+
+def test_entries_expire_per_namespace_ttl(clock):
+    cache = ContentCache(default_ttl=60, ttls={"profiles": 10}, clock=clock)
+    cache.set(("profiles",), "profile")
+    cache.set(("skills",), "skills")
+    clock.now += 10
+    assert cache.get(("profiles",)) == (False, None)
+    assert cache.get(("skills",)) == (True, "skills")
+    clock.now += 50
+    assert cache.get(("skills",)) == (False, None)
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ContentCache(max_entries=2, clock=clock)
+    cache.set(("a",), 1)
+    cache.set(("b",), 2)
+    cache.get(("a",))
+    cache.set(("c",), 3)
+    assert cache.get(("b",)) == (False, None)
+    assert cache.get(("a",)) == (True, 1)
+    assert cache.evictions == 1
+
+
+def test_invalidate_one_namespace_or_all(clock):
+    cache = ContentCache(clock=clock)
+    for key in (("portfolio", "e1"), ("portfolio", "e2"), ("skills",)):
+        cache.set(key, key)
+    assert cache.invalidate("portfolio") == 2
+    assert cache.get(("skills",))[0]
+    assert cache.invalidate() == 1
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_ttls_from_env():
+    environ = {"CACHE_TTL_PROFILES": "600", "CACHE_TTL_SKILLS": ""}
+    assert ttls_from_env(environ, ["profiles", "skills"]) == {"profiles": 600.0}
+
+
+@pytest.mark.anyio
+async def test_concurrent_misses_share_one_load(clock):
+    cache = ContentCache(clock=clock)
+    release = asyncio.Event()
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        await release.wait()
+        return "value"
+
+    tasks = [asyncio.create_task(cache.get_or_load(("profiles",), loader)) for _ in range(10)]
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*tasks) == ["value"] * 10
+    assert len(loads) == 1
+    assert (cache.misses, cache.hits) == (1, 9)
+    assert cache._locks == {} and cache._loading == {}
+    assert await cache.get_or_load(("profiles",), loader) == "value"
+    assert len(loads) == 1
+
+
+@pytest.mark.anyio
+async def test_failed_load_is_retried_and_leaves_no_lock(clock):
+    cache = ContentCache(clock=clock)
+    attempts = []
+
+    async def loader():
+        attempts.append(1)
+        await asyncio.sleep(0)
+        if len(attempts) == 1:
+            raise RuntimeError("database down")
+        return "value"
+
+    results = await asyncio.gather(
+        cache.get_or_load(("skills",), loader), cache.get_or_load(("skills",), loader), return_exceptions=True,
+    )
+    # The waiter re-checks the cache after the failure and loads itself
+    assert isinstance(results[0], RuntimeError) and results[1] == "value"
+    assert len(attempts) == 2
+    assert cache._locks == {} and cache._loading == {}
+
+
+@pytest.mark.anyio
+async def test_cancelled_loads_leave_no_lock(clock):
+    cache = ContentCache(clock=clock)
+    started = asyncio.Event()
+
+    async def loader():
+        started.set()
+        await asyncio.Event().wait()
+
+    holder = asyncio.create_task(cache.get_or_load(("education",), loader))
+    await started.wait()
+    waiter = asyncio.create_task(cache.get_or_load(("education",), loader))
+    await asyncio.sleep(0)
+    assert cache._loading == {("education",): 2}
+    waiter.cancel()
+    holder.cancel()
+    await asyncio.gather(holder, waiter, return_exceptions=True)
+    assert cache._locks == {} and cache._loading == {}
+    assert cache.get(("education",)) == (False, None)
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from contact_stats import ContactStats, series, week_of
+from repositories.memory_backend import MemoryContactRepository
+
+pytestmark = pytest.mark.anyio
+
+DAY_ONE = datetime(2026, 3, 9, 9, 0)  # a Monday
+
+
+class RecordingRepository(MemoryContactRepository):
+    """Memory backend that records the ranges summarize() was asked for"""
+
+    def __init__(self):
+        super().__init__()
+        self.summarized = []
+
+    async def summarize(self, created_after, created_before):
+        self.summarized.append((created_after, created_before))
+        return await super().summarize(created_after, created_before)
+
+
+def contact(index: int, created_at: datetime, status: str = "new", domain: str = "example.com"):
+    return {
+        "id": f"c{index:03d}", "name": "Visitor", "email": f"v{index}@{domain}", "company": None,
+        "subject": "Hello", "message": "Hi", "status": status, "createdAt": created_at,
+    }
+
+
+@pytest.fixture
+def clock(clock):
+    clock.now = DAY_ONE
+    return clock
+
+
+@pytest.fixture
+def repository():
+    return RecordingRepository()
+
+
+async def test_today_is_reaggregated_and_closed_days_are_kept(repository, clock):
+    await repository.insert_many([
+        contact(1, DAY_ONE - timedelta(days=1), status="read"),
+        contact(2, DAY_ONE - timedelta(hours=1), domain="Acme.io"),
+    ])
+    stats = ContactStats(ttl=0, clock=clock)
+    first = await stats.get(repository)
+    assert first["days"] == {"2026-03-08": 1, "2026-03-09": 1}
+    assert first["total"] == 2
+    assert first["byStatus"] == {"new": 1, "read": 1, "replied": 0}
+    assert {d["domain"] for d in first["topDomains"]} == {"example.com", "acme.io"}
+    today = datetime(2026, 3, 9)
+    assert repository.summarized == [(None, today), (today, None)]
+
+    repository.summarized.clear()
+    await repository.insert_many([contact(3, DAY_ONE + timedelta(hours=1))])
+    second = await stats.get(repository)
+    assert second["days"]["2026-03-09"] == 2 and second["total"] == 3
+    assert repository.summarized == [(today, None)]  # closed days were not read again
+
+
+async def test_rollover_closes_the_previous_day(repository, clock):
+    await repository.insert_many([contact(1, DAY_ONE), contact(2, DAY_ONE + timedelta(hours=2))])
+    stats = ContactStats(ttl=0, clock=clock)
+    await stats.get(repository)
+
+    clock.now = DAY_ONE + timedelta(days=2)
+    await repository.insert_many([contact(3, clock.now)])
+    repository.summarized.clear()
+    snapshot = await stats.get(repository)
+    assert repository.summarized == [(datetime(2026, 3, 9), datetime(2026, 3, 11)), (datetime(2026, 3, 11), None)]
+    assert snapshot["days"] == {"2026-03-09": 2, "2026-03-11": 1}
+    assert snapshot["total"] == 3
+    assert stats.stats()["closedDays"] == 1
+    assert stats.stats()["watermark"] == datetime(2026, 3, 11)
+
+
+async def test_backlog_ages(repository, clock):
+    await repository.insert_many([
+        contact(1, DAY_ONE - timedelta(hours=2)),
+        contact(2, DAY_ONE - timedelta(days=3)),
+        contact(3, DAY_ONE - timedelta(days=40)),
+        contact(4, DAY_ONE - timedelta(days=50), status="replied"),
+    ])
+    snapshot = await ContactStats(ttl=0, clock=clock).get(repository)
+    backlog = snapshot["backlog"]
+    assert backlog["open"] == 3
+    assert backlog["ages"] == {"<1d": 1, "1-7d": 1, "7-30d": 0, ">30d": 1}
+    assert backlog["oldestCreatedAt"] == DAY_ONE - timedelta(days=40)
+    assert backlog["oldestAgeSeconds"] == 40 * 86400
+
+
+async def test_snapshot_is_reused_within_the_ttl(repository, clock):
+    stats = ContactStats(ttl=60, clock=clock)
+    first = await stats.get(repository)
+    assert await stats.get(repository) is first
+    stats.invalidate()
+    assert await stats.get(repository) is not first
+    assert stats.refreshes == 2
+
+
+def test_weeks_and_series():
+    assert week_of("2026-03-09") == "2026-W11"
+    assert week_of("2027-01-01") == "2026-W53"
+    assert series({"2026-01": 3, "2026-03": 1, "2026-02": 2}, 2) == [
+        {"period": "2026-02", "count": 2}, {"period": "2026-03", "count": 1},
+    ]
@@ -0,0 +1,37 @@
+import pytest
+
+from contact_status import INVALID, NOT_FOUND, STATUSES, TRANSITIONS, UNCHANGED, UPDATED, plan_transition
+
+
+@pytest.mark.parametrize("current, target, outcome", [
+    ("new", "read", UPDATED),
+    ("new", "replied", UPDATED),
+    ("read", "replied", UPDATED),
+    ("read", "read", UNCHANGED),
+    ("replied", "replied", UNCHANGED),
+    ("read", "new", INVALID),
+    ("replied", "read", INVALID),
+    ("replied", "new", INVALID),
+    ("archived", "read", INVALID),  # a status outside the workflow never moves
+])
+def test_single_transitions(current, target, outcome):
+    plan = plan_transition(["a"], {"a": current}, target)
+    assert plan.outcomes == {"a": {"outcome": outcome, "previousStatus": current}}
+    assert plan.to_update == (["a"] if outcome == UPDATED else [])
+
+
+def test_statuses_only_move_forward():
+    for target, sources in TRANSITIONS.items():
+        assert all(STATUSES.index(source) < STATUSES.index(target) for source in sources)
+
+
+def test_batch_plan_keeps_request_order_and_drops_repeats():
+    plan = plan_transition(["c", "a", "missing", "b", "a"], {"a": "new", "b": "replied", "c": "read"}, "replied")
+    assert plan.to_update == ["c", "a"]
+    assert list(plan.outcomes) == ["c", "a", "missing", "b"]
+    assert plan.outcomes["missing"] == {"outcome": NOT_FOUND}
+    assert plan.outcomes["b"] == {"outcome": UNCHANGED, "previousStatus": "replied"}
+
+
+def test_empty_batch():
+    assert plan_transition([], {}, "read") == ([], {})
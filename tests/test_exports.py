@@ -0,0 +1,108 @@
+import asyncio
+import csv
+import gzip
+from datetime import datetime, timedelta
+
+import pytest
+
+from exports import ExportManager, ExportQueueFull, available_formats
+
+pytestmark = [
+    pytest.mark.anyio,
+    pytest.mark.skipif("csv" not in available_formats(), reason="exports need pandas"),
+]
+
+COLUMNS = ("id", "email", "status", "createdAt")
+BASE_TIME = datetime(2026, 3, 9, 9, 0, 0, 250000)
+
+
+def contact(index: int):
+    return {"id": f"c{index:03d}", "email": f"v{index}@example.com", "status": "new", "createdAt": BASE_TIME + timedelta(seconds=index)}
+
+
+def rows_source(rows, batch_size=2):
+    async def source(_):
+        for start in range(0, len(rows), batch_size):
+            yield rows[start:start + batch_size]
+    return source
+
+
+class BlockingSource:
+    """Yields ``first`` rows, then waits until ``release`` is set"""
+
+    def __init__(self, first):
+        self.first = first
+        self.yielded = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def __call__(self, _):
+        yield self.first
+        self.yielded.set()
+        await self.release.wait()
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return ExportManager(tmp_path, batch_size=2, chunk_rows=2, max_running=1, max_jobs=2, max_queued=1)
+
+
+async def finish(job):
+    await asyncio.wait_for(asyncio.gather(job.task, return_exceptions=True), 5)
+
+
+async def test_csv_round_trip(manager):
+    rows = [contact(i) for i in range(5)]
+    rows[3]["email"] = 'quote "and", comma'
+    job = manager.start(rows_source(rows), "csv", COLUMNS, {})
+    await finish(job)
+    assert job.status == "completed" and (job.rows, job.chunks) == (5, 3)
+    assert job.to_dict()["file"] == job.path.name and not job.part_path.exists()
+    with gzip.open(job.path, "rt", newline="") as exported:
+        read = list(csv.DictReader(exported))
+    assert [r["id"] for r in read] == [r["id"] for r in rows]
+    assert read[3]["email"] == 'quote "and", comma'
+    assert read[0]["createdAt"] == "2026-03-09T09:00:00.250000"
+
+
+async def test_queue_cap(manager):
+    running = BlockingSource([contact(0)])
+    first = manager.start(running, "csv", COLUMNS, {})
+    await running.yielded.wait()
+    queued = manager.start(rows_source([contact(1)]), "csv", COLUMNS, {})
+    with pytest.raises(ExportQueueFull):
+        manager.start(rows_source([contact(2)]), "csv", COLUMNS, {})
+    assert (first.status, queued.status) == ("running", "queued")
+
+    running.release.set()
+    await finish(first)
+    await finish(queued)
+    assert queued.status == "completed"
+    manager.start(rows_source([contact(2)]), "csv", COLUMNS, {})
+    await manager.stop()
+
+
+async def test_cancelling_removes_partial_files(manager):
+    running = BlockingSource([contact(0), contact(1), contact(2)])
+    first = manager.start(running, "csv", COLUMNS, {})
+    await running.yielded.wait()
+    queued = manager.start(rows_source([contact(3)]), "csv", COLUMNS, {})
+    assert first.part_path.exists()
+
+    queued.task.cancel()
+    await finish(queued)
+    assert queued.status == "cancelled" and not queued.part_path.exists()
+
+    await manager.stop()
+    assert first.status == "cancelled"
+    assert list(manager.directory.iterdir()) == []
+
+
+async def test_forgotten_jobs_lose_their_files(manager):
+    jobs = []
+    for i in range(3):
+        jobs.append(manager.start(rows_source([contact(i)]), "csv", COLUMNS, {}))
+        await finish(jobs[-1])
+    assert [job["id"] for job in manager.list()] == [jobs[2].id, jobs[1].id]
+    assert manager.get(jobs[0].id) is None
+    assert not jobs[0].path.exists()
+    assert jobs[1].path.exists() and jobs[2].path.exists()
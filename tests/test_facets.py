@@ -0,0 +1,92 @@
+import json
+from datetime import date
+from typing import Dict, List
+
+import pytest
+from pydantic import BaseModel
+
+from facets import TechnologyFacets, merged_months, period_months, technology_key
+
+TODAY = date(2026, 3, 15)
+
+
+class Skills(BaseModel):
+    technical: Dict[str, List[str]]
+
+
+class Experience(BaseModel):
+    id: str
+    period: str
+    technologies: List[str]
+
+
+@pytest.mark.parametrize("name, key", [
+    ("Python", "python"),
+    ("  Power   BI ", "power bi"),
+    ("C#", "c#"),
+])
+def test_technology_key(name, key):
+    assert technology_key(name) == key
+
+
+@pytest.mark.parametrize("period, months", [
+    ("Jan 2018 - May 2019", (2018 * 12, 2019 * 12 + 4)),
+    ("May 2019 - Present", (2019 * 12 + 4, 2026 * 12 + 2)),
+    ("September 2020 – current", (2020 * 12 + 8, 2026 * 12 + 2)),
+    ("2015 - 2018", (2015 * 12, 2018 * 12)),
+    ("Sept. 2021 — Now", (2021 * 12 + 8, 2026 * 12 + 2)),
+])
+def test_period_months(period, months):
+    assert period_months(period, TODAY) == months
+
+
+@pytest.mark.parametrize("period", ["", "Recently", "2019", "May 2020 - Jan 2019", None])
+def test_unreadable_periods(period):
+    assert period_months(period, TODAY) is None
+
+
+def test_merged_months_counts_overlaps_once():
+    assert merged_months([]) == 0
+    assert merged_months([(0, 12), (24, 30)]) == 18
+    assert merged_months([(0, 12), (6, 18), (18, 20)]) == 20
+
+
+@pytest.fixture
+def facets():
+    skills = Skills(technical={"Programming": ["Python", "Java"], "Data": ["python", "Power BI"]})
+    experiences = [
+        Experience(id="e1", period="Jan 2020 - Present", technologies=["Python", "Kafka", "Python"]),
+        Experience(id="e2", period="Jan 2018 - Jan 2021", technologies=["python", "Java"]),
+        Experience(id="e3", period="sometime", technologies=["Kafka"]),
+    ]
+    return TechnologyFacets(skills, experiences, today=TODAY)
+
+
+def test_skills_spell_names_and_experiences_add_the_rest(facets):
+    python = facets.technologies["python"]
+    assert python.name == "Python"
+    assert python.categories == ["Programming", "Data"]
+    assert [e.id for e in python.experiences] == ["e1", "e2"]
+    assert facets.technologies["kafka"].categories == []
+    assert facets.technologies["power bi"].experiences == []
+
+
+def test_years_and_first_last_use(facets):
+    python = facets.technologies["python"]
+    assert python.years == round((2026 * 12 + 2 - 2018 * 12) / 12, 1)
+    assert (python.first_used, python.last_used) == (2018, 2026)
+    kafka = facets.technologies["kafka"]  # one period cannot be read
+    assert (kafka.first_used, kafka.last_used) == (2020, 2026)
+    assert facets.technologies["power bi"].years == 0
+
+
+def test_listing_is_ranked_by_usage(facets):
+    listing = json.loads(facets.listing.body)
+    assert listing["total"] == 4
+    assert [t["key"] for t in listing["technologies"]] == ["python", "kafka", "java", "power bi"]
+    assert listing["categories"] == {"Programming": 2, "Data": 2}
+
+
+def test_experiences_lookup_is_case_and_space_insensitive(facets):
+    assert [e["id"] for e in json.loads(facets.experiences("  PYTHON ").body)] == ["e1", "e2"]
+    assert facets.experiences("cobol") is None
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+import pytest
+
+from http_cache import (
+    ContentVersion, coded_etag, compute_etag, is_not_modified, negotiate_encodings, validator_headers,
+)
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, []),
+    ("", []),
+    ("identity", []),
+    ("gzip", ["gzip"]),
+    ("gzip, br", ["br", "gzip"]),
+    ("br;q=0.5, gzip", ["gzip", "br"]),
+    ("GZIP;q=0.8, Br;q=0.8", ["br", "gzip"]),
+    ("gzip;q=0, br", ["br"]),
+    ("*", ["br", "gzip"]),
+    ("*;q=0.1, gzip", ["gzip", "br"]),
+    ("gzip;q=0, *", ["br"]),
+    ("gzip;q=abc, br", ["br"]),
+    ("deflate, compress", []),
+])
+def test_negotiate_encodings(header, expected):
+    assert negotiate_encodings(header) == expected
+
+
+def test_select_prefers_an_available_variant():
+    version = ContentVersion(b"x" * 2048)
+    assert version.select("br, gzip")["encoding"] in version.encoded
+    assert version.select("identity") == {"content": version.body, "encoding": None}
+
+
+def test_small_bodies_are_not_compressed():
+    version = ContentVersion(b"{}")
+    assert version.encoded == {}
+    assert version.select("gzip") == {"content": b"{}", "encoding": None}
+
+
+def test_each_coding_has_its_own_etag():
+    etag = compute_etag(b"body")
+    tags = {validator_headers(etag, None, encoding)["ETag"] for encoding in (None, "gzip", "br")}
+    assert tags == {etag, coded_etag(etag, "gzip"), coded_etag(etag, "br")}
+    assert coded_etag(etag, "br") == etag[:-1] + '-br"'
+
+
+@pytest.mark.parametrize("encoding", [None, "gzip", "br"])
+def test_any_coding_revalidates_the_version(encoding):
+    etag = compute_etag(b"body")
+    assert is_not_modified({"if-none-match": coded_etag(etag, encoding)}, etag)
+    assert is_not_modified({"if-none-match": "W/" + coded_etag(etag, encoding)}, etag)
+    assert not is_not_modified({"if-none-match": coded_etag(compute_etag(b"other"), encoding)}, etag)
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    etag = compute_etag(b"body")
+    modified = datetime(2026, 1, 1, 12, 0, 0)
+    headers = {"if-none-match": '"stale"', "if-modified-since": "Thu, 01 Jan 2026 12:00:00 GMT"}
+    assert not is_not_modified(headers, etag, modified)
+    assert is_not_modified({"if-modified-since": "Thu, 01 Jan 2026 12:00:00 GMT"}, etag, modified)
+    assert not is_not_modified({"if-modified-since": "not a date"}, etag, modified)
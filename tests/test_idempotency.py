@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from idempotency import ExpiringMap, IdempotencyConflict, IdempotencyStore, content_hash, dedup_key
+
+
+def test_entries_expire_after_ttl(clock):
+    entries = ExpiringMap(ttl=10, max_entries=10, clock=clock)
+    entries.set("a", 1)
+    clock.now += 9.9
+    assert entries.get("a") == 1
+    clock.now += 0.1
+    assert entries.get("a") is None
+    assert len(entries) == 0
+
+
+def test_set_restarts_the_ttl_and_the_order(clock):
+    entries = ExpiringMap(ttl=10, max_entries=10, clock=clock)
+    entries.set("a", 1)
+    clock.now += 5
+    entries.set("b", 2)
+    entries.set("a", 3)
+    clock.now += 6
+    assert entries.get("a") == 3
+    assert entries.get("b") == 2
+
+
+def test_oldest_entries_are_evicted_beyond_max_entries(clock):
+    entries = ExpiringMap(ttl=10, max_entries=2, clock=clock)
+    for key in "abc":
+        entries.set(key, key)
+    assert len(entries) == 2
+    assert entries.get("a") is None
+    assert entries.get("c") == "c"
+
+
+def test_pop_ignores_missing_keys(clock):
+    entries = ExpiringMap(ttl=10, max_entries=2, clock=clock)
+    entries.set("a", 1)
+    entries.pop("a")
+    entries.pop("a")
+    assert entries.get("a") is None
+
+
+def test_content_hash_ignores_email_case_and_outer_whitespace():
+    assert content_hash(" A@B.com", "Hi ", "Hello\n") == content_hash("a@b.com", "Hi", "Hello")
+    assert content_hash("a@b.com", "Hi", "Hello") != content_hash("a@b.com", "Hi", "Hello!")
+
+
+def test_dedup_key_buckets_by_window():
+    assert dedup_key("h", 1199.9, 600) == dedup_key("h", 600, 600) == "h:1"
+    assert dedup_key("h", 1200, 600) == "h:2"
+
+
+@pytest.mark.anyio
+async def test_idempotency_store_replays_and_rejects_other_bodies(clock):
+    store = IdempotencyStore(clock=clock)
+    calls = []
+
+    async def handler():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return {"id": "first"}
+
+    first, second = await asyncio.gather(store.run("k", "fp", handler), store.run("k", "fp", handler))
+    assert first == ({"id": "first"}, False)
+    assert second == ({"id": "first"}, True)
+    assert len(calls) == 1
+    with pytest.raises(IdempotencyConflict):
+        await store.run("k", "other", handler)
+
+
+@pytest.mark.anyio
+async def test_failed_attempts_are_not_remembered(clock):
+    store = IdempotencyStore(clock=clock)
+
+    async def failing():
+        raise RuntimeError("database down")
+
+    async def succeeding():
+        return {"id": "retry"}
+
+    with pytest.raises(RuntimeError):
+        await store.run("k", "fp", failing)
+    assert await store.run("k", "fp", succeeding) == ({"id": "retry"}, False)
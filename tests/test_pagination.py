@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pagination import ContactQuery, InvalidCursor, contact_matches, contact_query, decode_cursor, encode_cursor
+
+
+@pytest.mark.parametrize("created_at", [
+    datetime(2026, 1, 1, 12, 0, 0),
+    datetime(2026, 1, 1, 12, 0, 0, 123000),
+    datetime(2026, 1, 1, 12, 0, 0, 123456),
+])
+def test_cursor_round_trip(created_at):
+    cursor = encode_cursor(created_at, "entry-1")
+    assert decode_cursor(cursor) == (created_at, "entry-1")
+
+
+def test_cursor_is_urlsafe_without_padding():
+    cursor = encode_cursor(datetime(2026, 1, 1), "a/b+c?")
+    assert "=" not in cursor
+    assert set(cursor) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+    assert decode_cursor(cursor)[1] == "a/b+c?"
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "W10", "WyJ4IiwiYSJd", "eyJhIjogMX0"])
+def test_invalid_cursors(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def test_contact_query_normalizes_aware_times_to_naive_utc():
+    aware = datetime(2026, 1, 1, 14, 0, tzinfo=timezone(timedelta(hours=2)))
+    query = contact_query("new", created_after=aware, cursor=encode_cursor(aware, "id-1"))
+    assert query.created_after == datetime(2026, 1, 1, 12, 0)
+    assert query.after == (datetime(2026, 1, 1, 12, 0), "id-1")
+
+
+def test_contact_matches_positions_after_the_cursor():
+    created_at = datetime(2026, 1, 1, 12, 0)
+    query = ContactQuery(after=(created_at, "b"))
+    assert contact_matches(query, {"id": "a", "status": "new", "createdAt": created_at})
+    assert not contact_matches(query, {"id": "c", "status": "new", "createdAt": created_at})
+    assert contact_matches(query, {"id": "z", "status": "new", "createdAt": created_at - timedelta(seconds=1)})
@@ -0,0 +1,227 @@
+"""
+Repository conformance suite
+Runs the same behavioural checks against every storage backend: memory and
+sqlite always, mongo when TEST_MONGO_URL is set (a scratch
+<TEST_DB_NAME>_conformance database is dropped before each test).
+"""
+
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import pytest
+
+from pagination import ContactQuery
+from repositories import DuplicateContact, Repositories
+
+pytestmark = pytest.mark.anyio
+
+BASE_TIME = datetime(2026, 1, 1, 12, 0, 0, 123000)
+
+
+def make_contacts(count: int) -> List[Dict[str, Any]]:
+    # Pairs share a createdAt so the id tie-breaker is exercised
+    return [
+        {
+            "id": str(uuid.UUID(int=i + 1)),
+            "name": f"Visitor {i}",
+            "email": f"visitor{i}@example.com",
+            "company": None,
+            "subject": "Hello",
+            "message": f"Message {i}",
+            "status": "read" if i % 3 == 0 else "new",
+            "createdAt": BASE_TIME + timedelta(seconds=i // 2),
+        }
+        for i in range(count)
+    ]
+
+
+def expected_order(contacts: List[Dict[str, Any]]) -> List[str]:
+    return [c["id"] for c in sorted(contacts, key=lambda c: (c["createdAt"], c["id"]), reverse=True)]
+
+
+def build(backend: str, workdir) -> Repositories:
+    if backend == "memory":
+        from repositories.memory_backend import MemoryRepositories
+        return MemoryRepositories({})
+    if backend == "sqlite":
+        from repositories.sqlite_backend import SQLiteRepositories
+        return SQLiteRepositories(str(workdir / "conformance.db"))
+    from repositories.motor_backend import MotorRepositories
+    repositories = MotorRepositories(os.environ["TEST_MONGO_URL"], f"{os.environ.get('TEST_DB_NAME', 'test')}_conformance")
+    connect = repositories.connect
+
+    async def connect_clean():
+        await connect()
+        await repositories.client.drop_database(repositories.db_name)
+    repositories.connect = connect_clean
+    return repositories
+
+
+@pytest.fixture(params=[
+    "memory",
+    "sqlite",
+    pytest.param("mongo", marks=pytest.mark.skipif("TEST_MONGO_URL" not in os.environ, reason="TEST_MONGO_URL not set")),
+])
+async def repositories(request, tmp_path):
+    repositories = build(request.param, tmp_path)
+    await repositories.connect()
+    await repositories.ensure_indexes()
+    yield repositories
+    await repositories.close()
+
+
+@pytest.fixture
+async def contacts(repositories):
+    contacts = make_contacts(23)
+    await repositories.contacts.insert_many([dict(c) for c in contacts])
+    return contacts
+
+
+async def page_through(repositories: Repositories, query: ContactQuery, limit: int) -> List[str]:
+    seen = []
+    while True:
+        page = await repositories.contacts.find_page(query, limit)
+        seen.extend(c["id"] for c in page)
+        if len(page) < limit:
+            return seen
+        query = query._replace(after=(page[-1]["createdAt"], page[-1]["id"]))
+
+
+async def skipped_ids(write, documents) -> List[str]:
+    try:
+        await write(documents)
+    except DuplicateContact as e:
+        return [document["id"] for document in e.documents]
+    return []
+
+
+WINDOW = ContactQuery(created_after=BASE_TIME + timedelta(seconds=3), created_before=BASE_TIME + timedelta(seconds=6))
+
+
+def in_window(contacts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [c for c in contacts if WINDOW.created_after <= c["createdAt"] < WINDOW.created_before]
+
+
+async def test_content(repositories):
+    content = repositories.content
+    await content["experiences"].replace_all([
+        {"id": "b", "company": "Second", "order": 2, "createdAt": BASE_TIME},
+        {"id": "a", "company": "First", "order": 1, "createdAt": BASE_TIME},
+    ])
+    experiences = await content["experiences"].find_all()
+    assert [e["id"] for e in experiences] == ["a", "b"]
+    assert experiences[0]["createdAt"] == BASE_TIME
+    assert [e["id"] for e in await content["experiences"].find_all(limit=1)] == ["a"]
+
+    await content["profiles"].replace_all([{"id": "p1", "name": "Name", "title": "Title"}])
+    assert await content["profiles"].find_one() == {"id": "p1", "name": "Name", "title": "Title"}
+
+    await content["skills"].replace_all([])
+    assert await content["skills"].find_one() is None
+
+
+async def test_contacts_newest_first(repositories, contacts):
+    first = await repositories.contacts.find_page(ContactQuery(), 100)
+    assert [c["id"] for c in first] == expected_order(contacts)
+    assert first[-1]["createdAt"] == BASE_TIME  # millisecond timestamps survive storage
+
+
+async def test_keyset_pages(repositories, contacts):
+    assert await page_through(repositories, ContactQuery(), 4) == expected_order(contacts)
+    read = [c for c in contacts if c["status"] == "read"]
+    assert await page_through(repositories, ContactQuery(status="read"), 3) == expected_order(read)
+    assert await page_through(repositories, WINDOW, 2) == expected_order(in_window(contacts))
+
+
+async def test_stream(repositories, contacts):
+    streamed = [[c["id"] for c in batch] async for batch in repositories.contacts.stream(ContactQuery(), 5)]
+    assert sum(streamed, []) == expected_order(contacts)
+    assert all(len(batch) <= 5 for batch in streamed)
+
+    by_id = {c["id"]: c for c in contacts}
+    resume_from = by_id[expected_order(contacts)[10]]
+    query = ContactQuery(after=(resume_from["createdAt"], resume_from["id"]))
+    resumed = [c["id"] async for batch in repositories.contacts.stream(query, 4) for c in batch]
+    assert resumed == expected_order(contacts)[11:]
+
+
+async def test_counts_and_summaries(repositories, contacts):
+    contacts_repo = repositories.contacts
+    assert await contacts_repo.count(ContactQuery(status="read")) == sum(c["status"] == "read" for c in contacts)
+    assert await contacts_repo.count(WINDOW) == len(in_window(contacts))
+    assert await contacts_repo.oldest(ContactQuery(status="new")) == min(c["createdAt"] for c in contacts if c["status"] == "new")
+    assert await contacts_repo.summarize(None, None) == {"days": {"2026-01-01": 23}, "domains": {"example.com": 23}}
+    ranged = await contacts_repo.summarize(WINDOW.created_after, WINDOW.created_before)
+    assert ranged["days"] == {"2026-01-01": len(in_window(contacts))}
+
+
+async def test_contact_projection_keeps_sort_keys(repositories, contacts):
+    projected = await repositories.contacts.find_page(ContactQuery(), 1, fields=("email",))
+    assert set(projected[0]) == {"email", "createdAt", "id"}
+
+
+async def test_upsert_only_inserts(repositories, contacts):
+    contacts_repo = repositories.contacts
+    replayed = dict(contacts[0], status="replied")
+    fresh = dict(make_contacts(24)[-1])
+    await contacts_repo.upsert_many([replayed, dict(contacts[1]), fresh])
+    await contacts_repo.upsert_many([fresh])
+    stored = {c["id"]: c for c in await contacts_repo.find_page(ContactQuery(), 100)}
+    assert len(stored) == len(contacts) + 1
+    # A stored contact is never replaced, so later status changes survive a replay
+    assert stored[replayed["id"]]["status"] == contacts[0]["status"]
+
+
+async def test_insert_skips_duplicate_ids(repositories, contacts):
+    assert await skipped_ids(repositories.contacts.insert_many, [dict(contacts[2])]) == [contacts[2]["id"]]
+
+
+async def test_dedup_keys(repositories):
+    contacts_repo = repositories.contacts
+    first, repeat, other, legacy_a, legacy_b = make_contacts(5)
+    for document, key in ((first, "hash:1"), (repeat, "hash:1"), (other, "hash:2")):
+        document["id"] = f"dedup-{document['id']}"
+        document["dedupKey"] = key
+    for document in (legacy_a, legacy_b):
+        document["id"] = f"legacy-{document['id']}"
+
+    # A taken dedupKey is skipped and the rest of the batch is written
+    assert await skipped_ids(contacts_repo.insert_many, [dict(first), dict(repeat), dict(other)]) == [repeat["id"]]
+    # Contacts without a dedupKey never collide
+    assert await skipped_ids(contacts_repo.insert_many, [dict(legacy_a), dict(legacy_b)]) == []
+    assert await skipped_ids(contacts_repo.upsert_many, [dict(repeat)]) == [repeat["id"]]
+    assert await skipped_ids(contacts_repo.upsert_many, [dict(first, status="replied")]) == []
+
+    stored = {c["id"]: c for c in await contacts_repo.find_page(ContactQuery(), 1000)}
+    assert repeat["id"] not in stored and other["id"] in stored
+    assert stored[first["id"]]["status"] == first["status"]
+
+    assert await contacts_repo.dedup_owner("hash:1") == first["id"]
+    assert await contacts_repo.dedup_owner("hash:3") is None
+
+
+async def test_status_updates(repositories):
+    contacts_repo = repositories.contacts
+    contacts = make_contacts(6)
+    for document in contacts:
+        document["id"] = f"status-{document['id']}"
+    await contacts_repo.insert_many([dict(c) for c in contacts])
+    ids = tuple(c["id"] for c in contacts)
+    updated_at = BASE_TIME + timedelta(days=1)
+
+    changed = await contacts_repo.update_status(ContactQuery(ids=ids[:4]), ("new",), "read", updated_at, "first")
+    expected = [c["id"] for c in contacts[:4] if c["status"] == "new"]
+    assert changed == len(expected)
+    stored = {c["id"]: c for c in await contacts_repo.find_page(ContactQuery(ids=ids), 100)}
+    assert set(stored) == set(ids)
+    assert all(stored[i]["status"] == "read" and stored[i]["statusUpdatedAt"] == updated_at for i in expected)
+    assert all(stored[i]["statusUpdateId"] == "first" for i in expected)
+    untouched = contacts[4]["id"] if contacts[4]["status"] == "new" else contacts[5]["id"]
+    assert stored[untouched]["status"] == "new"
+    read_now = 4 + sum(1 for c in contacts[4:] if c["status"] == "read")
+    assert await contacts_repo.count(ContactQuery(ids=ids, status="read")) == read_now
+
+    changed = await contacts_repo.update_status(ContactQuery(ids=ids), ("new", "read"), "replied", updated_at, "second")
+    assert changed == len(ids)
@@ -0,0 +1,77 @@
+import pytest
+
+from search import SearchIndex, highlight, make_document, tokenize
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Hello, World", ["hello", "world"]),
+    ("C# and C++ with .NET", ["c#", "and", "c++", "with", "net"]),
+    ("Node.js / Vue.js 3.2", ["node.js", "vue.js", "3.2"]),
+    ("", []),
+])
+def test_tokenize(text, expected):
+    assert tokenize(text) == expected
+
+
+@pytest.fixture
+def index():
+    return SearchIndex([
+        make_document("e1", "experience", "Engineer at Acme", {
+            "description": "Built payment services in Python.",
+            "technologies": "Python, PostgreSQL",
+        }),
+        make_document("e2", "experience", "Lead at Globex", {
+            "description": "Led the <platform> team; moved reporting to Power BI.",
+            "technologies": "Salesforce, Power BI",
+        }),
+        make_document("a1", "achievement", "Python community award", {"description": "Talks and workshops."}),
+    ])
+
+
+def test_exact_matches_rank_by_bm25(index):
+    result = index.search("python")
+    assert result["total"] == 2
+    assert [r["id"] for r in result["results"]] == ["a1", "e1"]  # title matches weigh more, shorter document
+
+
+def test_prefix_matches_score_less_than_exact_matches(index):
+    assert index.expand("post") == [("postgresql", 0.6)]
+    assert index.expand("python") == [("python", 1.0)]
+    assert index.search("sales")["results"][0]["id"] == "e2"
+    exact = index.search("python")["results"][0]["score"]
+    prefix = index.search("pyth")["results"][0]["score"]
+    assert 0 < prefix < exact
+
+
+def test_unknown_terms_and_empty_queries(index):
+    assert index.search("kubernetes") == {"query": "kubernetes", "total": 0, "results": []}
+    assert index.search("!!!")["total"] == 0
+
+
+def test_limit(index):
+    result = index.search("python", limit=1)
+    assert result["total"] == 2 and len(result["results"]) == 1
+
+
+def test_empty_index():
+    assert SearchIndex([]).search("anything")["total"] == 0
+
+
+def test_snippet_marks_matches_and_escapes_html(index):
+    result = index.search("platform")["results"][0]
+    assert result["field"] == "description"
+    assert result["snippet"] == "Led the &lt;<mark>platform</mark>&gt; team; moved reporting to Power BI."
+
+
+def test_highlight_prefers_body_fields_over_the_title():
+    document = make_document("x", "achievement", "Python award", {"description": "A Python talk."})
+    assert highlight(document, {"python"}) == ("description", "A <mark>Python</mark> talk.")
+
+
+def test_long_fields_are_cut_at_word_boundaries():
+    text = " ".join(["filler"] * 30) + " needle " + " ".join(["padding"] * 30)
+    document = make_document("x", "about", "Title", {"description": text})
+    field, snippet = highlight(document, {"needle"})
+    assert field == "description"
+    assert snippet.startswith("…filler") and snippet.endswith("padding…")
+    assert "<mark>needle</mark>" in snippet
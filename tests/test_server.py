@@ -0,0 +1,180 @@
+"""
+HTTP-level tests of the server.py wiring, run in-process through httpx.ASGITransport
+against the memory backend. Per-test state (storage, caches, queues, limits) is
+replaced on the module before the lifespan handler starts.
+"""
+
+import asyncio
+import importlib
+import sys
+from datetime import datetime
+
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+ADMIN = {"X-Admin-Token": "test-admin-token"}
+
+CONTACT = {"name": "Visitor", "email": "visitor@example.com", "subject": "Hello", "message": "Hi there"}
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("server")
+    with pytest.MonkeyPatch.context() as environment:
+        for name, value in {
+            "STORAGE_BACKEND": "memory",
+            "ADMIN_TOKEN": ADMIN["X-Admin-Token"],
+            "CONTACT_SPOOL_PATH": str(directory / "spool" / "contacts.jsonl"),
+            "CONTACT_SPOOL_FSYNC": "false",
+            "EXPORT_DIR": str(directory / "exports"),
+            "PROFILE_DIR": str(directory / "profiles"),
+        }.items():
+            environment.setenv(name, value)
+        sys.modules.pop("server", None)
+        yield importlib.import_module("server")
+    sys.modules.pop("server", None)
+
+
+@pytest.fixture
+def state(server, monkeypatch, tmp_path):
+    """Fresh module state for one test; tests may adjust it before requesting ``client``"""
+    from admission import AdmissionController
+    from cache import ContentCache
+    from idempotency import IdempotencyStore, RecentSubmissions
+    from repositories import default_content
+    from repositories.memory_backend import MemoryRepositories
+    from write_behind import SpoolJournal, WriteBehindQueue
+
+    monkeypatch.setattr(server, "repositories", MemoryRepositories(default_content()))
+    monkeypatch.setattr(server, "content_cache", ContentCache())
+    monkeypatch.setattr(server, "contact_writer", WriteBehindQueue(
+        None, SpoolJournal(tmp_path / "contacts.jsonl", fsync=False), flush_interval=0, retry_interval=0.05,
+    ))
+    monkeypatch.setattr(server, "contact_admission", AdmissionController(
+        ip_rate=0.1, ip_burst=5, global_rate=50, global_burst=100, max_in_flight=64,
+    ))
+    monkeypatch.setattr(server, "idempotency_store", IdempotencyStore())
+    monkeypatch.setattr(server, "recent_submissions", RecentSubmissions())
+    return server
+
+
+@pytest.fixture
+async def client(state):
+    async with state.lifespan(state.app):
+        transport = httpx.ASGITransport(app=state.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+
+
+class HangingContacts:
+    """A contact repository whose every call waits forever, like a database that stopped answering"""
+
+    def __getattr__(self, name):
+        async def hang(*args, **kwargs):
+            await asyncio.Event().wait()
+        return hang
+
+
+async def test_submission_is_acknowledged_while_storage_hangs(state, client):
+    state.contact_writer.repository = HangingContacts()
+    state.repositories.contacts = HangingContacts()
+    response = await asyncio.wait_for(client.post("/api/contact", json=CONTACT), timeout=1)
+    assert response.status_code == 200 and response.json()["success"]
+    repeat = await asyncio.wait_for(client.post("/api/contact", json=CONTACT), timeout=1)
+    assert repeat.json()["id"] == response.json()["id"]
+    # The flusher is stuck inside insert_many; stop() must not wait on it
+    state.contact_writer._task.cancel()
+
+
+async def test_conditional_get_answers_304(client):
+    first = await client.get("/api/profile")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    again = await client.get("/api/profile", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.headers["etag"] == etag and again.content == b""
+
+    gzipped = await client.get("/api/profile", headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers["content-encoding"] == "gzip" and gzipped.headers["etag"] != etag
+    # Any coding's ETag validates the same content
+    revalidated = await client.get("/api/profile", headers={"If-None-Match": gzipped.headers["etag"]})
+    assert revalidated.status_code == 304
+
+
+async def test_idempotency_key_replays_and_rejects_a_changed_body(client):
+    headers = {"Idempotency-Key": "retry-1"}
+    first = await client.post("/api/contact", json=CONTACT, headers=headers)
+    assert first.status_code == 200 and "idempotent-replayed" not in first.headers
+    retry = await client.post("/api/contact", json=CONTACT, headers=headers)
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json()["id"] == first.json()["id"]
+
+    changed = await client.post("/api/contact", json={**CONTACT, "message": "Something else"}, headers=headers)
+    assert changed.status_code == 422
+
+
+@pytest.fixture
+def strict_admission(state, monkeypatch):
+    from admission import AdmissionController
+    monkeypatch.setattr(state, "contact_admission", AdmissionController(
+        ip_rate=0.1, ip_burst=2, global_rate=50, global_burst=100, max_in_flight=64,
+    ))
+
+
+async def test_rate_limited_submissions_get_retry_after(strict_admission, client):
+    statuses = []
+    for i in range(3):
+        response = await client.post("/api/contact", json={**CONTACT, "message": f"Message {i}"})
+        statuses.append(response.status_code)
+    assert statuses == [200, 200, 429]
+    assert int(response.headers["retry-after"]) >= 1
+
+
+async def store_contacts(state, statuses):
+    await state.repositories.contacts.insert_many([
+        {**CONTACT, "id": contact_id, "company": None, "status": status, "createdAt": datetime(2026, 3, 9, 9, i)}
+        for i, (contact_id, status) in enumerate(statuses.items())
+    ])
+
+
+async def test_patch_reports_an_outcome_per_id(state, client):
+    await store_contacts(state, {"a": "new", "b": "replied", "c": "read"})
+    body = {"status": "read", "ids": ["a", "b", "c", "missing"]}
+    assert (await client.patch("/api/contacts", json=body)).status_code == 403
+
+    response = await client.patch("/api/contacts", json=body, headers=ADMIN)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["updated"] == 1
+    assert {r["id"]: r["outcome"] for r in result["results"]} == {
+        "a": "updated", "b": "invalid_transition", "c": "unchanged", "missing": "not_found",
+    }
+    empty = await client.patch("/api/contacts", json={"status": "replied", "filter": {}}, headers=ADMIN)
+    assert empty.status_code == 400
+    everything = await client.patch("/api/contacts", json={"status": "replied", "all": True}, headers=ADMIN)
+    assert everything.json() == {"status": "replied", "updated": 2}
+
+
+async def test_patch_attributes_concurrent_changes_by_update_id(state, client, monkeypatch):
+    await store_contacts(state, {"a": "new", "b": "new"})
+    contacts = state.repositories.contacts
+    update_status = contacts.update_status
+
+    async def racing_update_status(query, from_statuses, status, updated_at, update_id):
+        # Another request moves "a" in the same millisecond, just before this write
+        await update_status(state.ContactQuery(ids=("a",)), ("new",), "replied", updated_at, "other-request")
+        return await update_status(query, from_statuses, status, updated_at, update_id)
+
+    monkeypatch.setattr(contacts, "update_status", racing_update_status)
+    response = await client.patch("/api/contacts", json={"status": "read", "ids": ["a", "b"]}, headers=ADMIN)
+    assert {r["id"]: r["outcome"] for r in response.json()["results"]} == {"a": "conflict", "b": "updated"}
+
+
+async def test_admin_endpoints_need_the_admin_token(client):
+    for method, path in (("GET", "/api/contacts/stats"), ("GET", "/api/contacts/export"), ("GET", "/api/cache/stats"),
+                         ("POST", "/api/cache/invalidate"), ("GET", "/api/contacts/exports")):
+        assert (await client.request(method, path)).status_code == 403, path
+        assert (await client.request(method, path, headers={"X-Admin-Token": "wrong"})).status_code == 403, path
+    stats = await client.get("/api/contacts/stats", headers=ADMIN)
+    assert stats.status_code == 200 and stats.json()["total"] == 0
@@ -0,0 +1,168 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from bson import json_util
+
+from pagination import ContactQuery
+from repositories.memory_backend import MemoryContactRepository
+from write_behind import SpoolJournal, WriteBehindQueue
+
+pytestmark = pytest.mark.anyio
+
+BASE_TIME = datetime(2026, 3, 9, 9, 0)
+
+
+class FlakyRepository(MemoryContactRepository):
+    """Memory backend whose writes fail while ``down`` is set"""
+
+    def __init__(self):
+        super().__init__()
+        self.down = False
+        self.writes = []
+
+    async def insert_many(self, documents):
+        self.writes.append(("insert", len(documents)))
+        if self.down:
+            raise ConnectionError("database unreachable")
+        await super().insert_many(documents)
+
+    async def upsert_many(self, documents):
+        self.writes.append(("upsert", len(documents)))
+        if self.down:
+            raise ConnectionError("database unreachable")
+        await super().upsert_many(documents)
+
+    async def stored(self):
+        return {c["id"]: c for c in await self.find_page(ContactQuery(), 1000)}
+
+
+def contact(index: int, status: str = "new"):
+    return {
+        "id": f"c{index:03d}", "name": "Visitor", "email": f"v{index}@example.com", "company": None,
+        "subject": "Hello", "message": "Hi", "status": status, "createdAt": BASE_TIME + timedelta(seconds=index),
+    }
+
+
+@pytest.fixture
+def repository():
+    return FlakyRepository()
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return SpoolJournal(tmp_path / "contacts.jsonl", fsync=False)
+
+
+def writer(repository, journal, **overrides):
+    settings = dict(max_size=10, batch_size=3, flush_interval=0, retry_interval=0.01)
+    settings.update(overrides)
+    return WriteBehindQueue(repository, journal, **settings)
+
+
+async def wait_for(condition, timeout: float = 2.0):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.005)
+    await asyncio.wait_for(poll(), timeout)
+
+
+def journal_ids(path):
+    return [json_util.loads(line)["id"] for line in path.read_text().splitlines()]
+
+
+async def test_full_queue_spills_to_the_journal(repository, journal):
+    queue = writer(repository, journal, max_size=2)
+    assert [await queue.submit(contact(i)) for i in range(3)] == ["queued", "queued", "spooled"]
+    assert journal_ids(journal.path) == ["c002"]
+    assert queue.stats()["depth"] == 2 and queue.spilled == 1
+
+
+async def test_failed_flush_is_spooled_and_replayed(repository, journal):
+    repository.down = True
+    queue = writer(repository, journal)
+    queue.start()
+    try:
+        for i in range(2):
+            await queue.submit(contact(i))
+        await wait_for(lambda: queue.failed_flushes)
+        assert journal.pending() and await repository.stored() == {}
+
+        repository.down = False
+        await wait_for(lambda: not journal.pending())
+        assert set(await repository.stored()) == {"c000", "c001"}
+        assert queue.replayed == 2
+        assert ("upsert", 2) in repository.writes
+    finally:
+        await queue.stop()
+
+
+async def test_interrupted_replay_is_resumed_without_reverting_statuses(repository, journal):
+    # A replay stopped after storing c000, whose status was changed since; c002 was spooled afterwards
+    await repository.insert_many([contact(0, status="replied")])
+    journal.replay_path.write_text("".join(json_util.dumps(contact(i)) + "\n" for i in range(2)))
+    journal.append([contact(2)])
+
+    queue = writer(repository, journal)
+    queue.start()
+    try:
+        await wait_for(lambda: not journal.pending())
+    finally:
+        await queue.stop()
+    stored = await repository.stored()
+    assert set(stored) == {"c000", "c001", "c002"}
+    assert stored["c000"]["status"] == "replied"
+    assert not journal.replay_path.exists() and not journal.path.exists()
+
+
+async def test_replay_failure_keeps_the_journal(repository, journal):
+    journal.append([contact(i) for i in range(4)])
+    repository.down = True
+    queue = writer(repository, journal)
+    await queue._replay()
+    assert journal.replay_path.exists() and journal_ids(journal.replay_path) == ["c000", "c001", "c002", "c003"]
+
+    repository.down = False
+    await queue._replay()
+    assert not journal.pending()
+    assert len(await repository.stored()) == 4
+    assert [write for write in repository.writes if write[0] == "upsert"][-2:] == [("upsert", 3), ("upsert", 1)]
+
+
+async def test_stop_drains_the_queue(repository, journal):
+    queue = writer(repository, journal, flush_interval=10)
+    queue.start()
+    for i in range(7):
+        await queue.submit(contact(i))
+    await queue.stop()
+    assert len(await repository.stored()) == 7
+    assert queue.stats()["depth"] == 0 and not journal.pending()
+
+
+async def test_stop_spools_what_cannot_be_written(repository, journal):
+    repository.down = True
+    queue = writer(repository, journal)
+    for i in range(4):
+        await queue.submit(contact(i))
+    await queue.stop()
+    assert journal_ids(journal.path) == ["c000", "c001", "c002", "c003"]
+
+
+async def test_duplicates_are_dropped_not_retried(repository, journal):
+    await repository.insert_many([contact(0)])
+    queue = writer(repository, journal)
+    for i in range(2):
+        await queue.submit(contact(i))
+    await queue.stop()
+    assert (queue.written, queue.duplicates) == (1, 1)
+    assert not journal.pending()
+
+
+async def test_dropped_duplicates_report_the_stored_original(repository, journal):
+    await repository.insert_many([dict(contact(0), dedupKey="hash:1")])
+    resolved = []
+    queue = writer(repository, journal, on_duplicate=lambda document, original: resolved.append((document["id"], original)))
+    await queue.submit(dict(contact(1), dedupKey="hash:1"))
+    await queue.submit(dict(contact(0), dedupKey="hash:1"))  # the stored contact itself, replayed
+    await queue.stop()
+    assert resolved == [("c001", "c000")]